@@ -0,0 +1,273 @@
+"""
+Façade asyncio de la couche d'accès aux données.
+
+Les fonctions de database et file_handler sont bloquantes ; celles de ce
+module les exécutent dans un exécuteur dédié de max_workers threads, pour
+ne jamais bloquer la boucle d'événements. Chaque thread emprunte sa propre
+connexion au pool (database.connection()) : jusqu'à max_workers requêtes
+s'exécutent en parallèle, les suivantes attendent une place libre.
+
+Les résultats volumineux sont exposés en itérateurs asynchrones lus par
+pages (pagination par clé) : aucune connexion ni transaction n'est gardée
+ouverte entre deux pages.
+
+Exemple :
+
+    from app import aio
+
+    async def main():
+        contact_id = await aio.create_contact("Alice", "alice@example.com")
+        async for contact in aio.iter_contacts():
+            print(contact["name"])
+        aio.shutdown()
+"""
+
+import asyncio
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, List, Mapping, Optional, TypeVar, Union
+
+from app import database, file_handler
+from app.database import DEFAULT_BATCH_SIZE, DEFAULT_CHUNK_SIZE, DEFAULT_POOL_SIZE, SEARCH_MODE_LIKE, ContactInput
+
+# Autant de threads que de connexions conservées par le pool : chaque
+# thread retrouve sa connexion d'un appel à l'autre.
+DEFAULT_MAX_WORKERS = DEFAULT_POOL_SIZE
+
+T = TypeVar("T")
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=DEFAULT_MAX_WORKERS, thread_name_prefix="contacts-db")
+        return _executor
+
+
+def configure(max_workers: int = DEFAULT_MAX_WORKERS) -> None:
+    """
+    Remplace l'exécuteur par un nouvel exécuteur de max_workers threads.
+
+    Les appels en cours sur l'ancien exécuteur se terminent normalement.
+    """
+    global _executor
+    if max_workers < 1:
+        raise ValueError("max_workers doit être strictement positif")
+    with _executor_lock:
+        old, _executor = _executor, ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="contacts-db")
+    if old is not None:
+        old.shutdown(wait=False)
+
+
+def shutdown(wait: bool = True) -> None:
+    """Arrête l'exécuteur ; il sera recréé au prochain appel."""
+    global _executor
+    with _executor_lock:
+        old, _executor = _executor, None
+    if old is not None:
+        old.shutdown(wait=wait)
+
+
+async def run(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Exécute func(*args, **kwargs) dans l'exécuteur et attend son résultat."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_get_executor(), functools.partial(func, *args, **kwargs))
+
+
+def _with_connection(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Appelle func(conn, *args, **kwargs) sur la connexion du thread courant."""
+    with database.connection() as conn:
+        return func(conn, *args, **kwargs)
+
+
+async def _run_db(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    return await run(_with_connection, func, *args, **kwargs)
+
+
+async def create_contact(name: str, email: str, phone: str = "", notes: str = "") -> int:
+    """Version asynchrone de database.create_contact."""
+    return await _run_db(database.create_contact, name, email, phone, notes)
+
+
+async def create_contacts(contacts: Iterable[ContactInput], batch_size: int = DEFAULT_BATCH_SIZE) -> int:
+    """Version asynchrone de database.create_contacts."""
+    return await _run_db(database.create_contacts, contacts, batch_size=batch_size)
+
+
+async def get_contact(contact_id: int) -> Optional[Dict[str, Any]]:
+    """Version asynchrone de database.get_contact."""
+    return await _run_db(database.get_contact, contact_id)
+
+
+async def list_contacts(after_id: Optional[int] = None, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+    """Version asynchrone de database.list_contacts."""
+    return await _run_db(database.list_contacts, after_id=after_id, limit=limit)
+
+
+async def update_contact(
+    contact_id: int,
+    name: Optional[str] = None,
+    email: Optional[str] = None,
+    phone: Optional[str] = None,
+    notes: Optional[str] = None,
+) -> None:
+    """Version asynchrone de database.update_contact."""
+    await _run_db(database.update_contact, contact_id, name=name, email=email, phone=phone, notes=notes)
+
+
+async def delete_contact(contact_id: int) -> None:
+    """Version asynchrone de database.delete_contact."""
+    await _run_db(database.delete_contact, contact_id)
+
+
+async def update_contacts(changes: Iterable[Mapping[str, Any]], batch_size: int = DEFAULT_BATCH_SIZE) -> int:
+    """Version asynchrone de database.update_contacts."""
+    return await _run_db(database.update_contacts, changes, batch_size=batch_size)
+
+
+async def delete_contacts(
+    ids_or_predicate: Union[Iterable[int], Callable[[database.Contact], bool]],
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> int:
+    """Version asynchrone de database.delete_contacts."""
+    return await _run_db(database.delete_contacts, ids_or_predicate, batch_size=batch_size)
+
+
+async def search_contacts(
+    query_string: str,
+    mode: str = SEARCH_MODE_LIKE,
+    after_id: Optional[int] = None,
+    limit: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    """Version asynchrone de database.search_contacts."""
+    return await _run_db(database.search_contacts, query_string, mode=mode, after_id=after_id, limit=limit)
+
+
+async def _iter_pages(
+    fetch_page: Callable[[Optional[int]], List[Dict[str, Any]]],
+    chunk_size: int,
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Produit les contacts de pages successives ; fetch_page(after_id)
+    s'exécute dans l'exécuteur, la page suivante repart du dernier id reçu.
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size doit être strictement positif")
+    after_id = None
+    while True:
+        page = await run(fetch_page, after_id)
+        for contact in page:
+            yield contact
+        if len(page) < chunk_size:
+            return
+        after_id = page[-1]["id"]
+
+
+def iter_contacts(chunk_size: int = DEFAULT_CHUNK_SIZE) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Itérateur asynchrone sur tous les contacts par ordre d'id, lus par
+    pages de chunk_size.
+    """
+    def fetch_page(after_id: Optional[int]) -> List[Dict[str, Any]]:
+        return _with_connection(database.list_contacts, after_id=after_id, limit=chunk_size)
+
+    return _iter_pages(fetch_page, chunk_size)
+
+
+def iter_search_contacts(
+    query_string: str,
+    mode: str = SEARCH_MODE_LIKE,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Itérateur asynchrone sur les résultats de search_contacts, par ordre
+    d'id et par pages de chunk_size.
+    """
+    def fetch_page(after_id: Optional[int]) -> List[Dict[str, Any]]:
+        return _with_connection(
+            database.search_contacts, query_string, mode=mode, after_id=after_id, limit=chunk_size
+        )
+
+    return _iter_pages(fetch_page, chunk_size)
+
+
+async def export_contacts_json(output_path: str, **options: Any) -> str:
+    """Version asynchrone de file_handler.export_contacts_json."""
+    return await run(file_handler.export_contacts_json, output_path, **options)
+
+
+async def export_contacts_csv(output_path: str, **options: Any) -> str:
+    """Version asynchrone de file_handler.export_contacts_csv."""
+    return await run(file_handler.export_contacts_csv, output_path, **options)
+
+
+async def export_contacts_jsonl(output_path: str, **options: Any) -> str:
+    """Version asynchrone de file_handler.export_contacts_jsonl."""
+    return await run(file_handler.export_contacts_jsonl, output_path, **options)
+
+
+async def import_contacts_json(input_path: str, **options: Any) -> int:
+    """Version asynchrone de file_handler.import_contacts_json."""
+    return await run(file_handler.import_contacts_json, input_path, **options)
+
+
+async def import_contacts_csv(input_path: str, **options: Any) -> int:
+    """Version asynchrone de file_handler.import_contacts_csv."""
+    return await run(file_handler.import_contacts_csv, input_path, **options)
+
+
+async def import_contacts_jsonl(input_path: str, **options: Any) -> int:
+    """Version asynchrone de file_handler.import_contacts_jsonl."""
+    return await run(file_handler.import_contacts_jsonl, input_path, **options)
+
+
+async def save_backup(backup_path: str, **options: Any) -> str:
+    """
+    Version asynchrone de file_handler.save_backup.
+
+    Un callback progress éventuel est appelé depuis le thread de
+    l'exécuteur, pas depuis la boucle d'événements.
+    """
+    return await run(file_handler.save_backup, backup_path, **options)
+
+
+async def restore_backup(backup_path: str, **options: Any) -> int:
+    """Version asynchrone de file_handler.restore_backup."""
+    return await run(file_handler.restore_backup, backup_path, **options)
+
+
+async def restore_backup_chain(base_path: str, delta_paths: List[str], **options: Any) -> int:
+    """Version asynchrone de file_handler.restore_backup_chain."""
+    return await run(file_handler.restore_backup_chain, base_path, delta_paths, **options)
+
+
+__all__ = [
+    "configure",
+    "shutdown",
+    "run",
+    "create_contact",
+    "create_contacts",
+    "get_contact",
+    "list_contacts",
+    "update_contact",
+    "delete_contact",
+    "update_contacts",
+    "delete_contacts",
+    "search_contacts",
+    "iter_contacts",
+    "iter_search_contacts",
+    "export_contacts_json",
+    "export_contacts_csv",
+    "export_contacts_jsonl",
+    "import_contacts_json",
+    "import_contacts_csv",
+    "import_contacts_jsonl",
+    "save_backup",
+    "restore_backup",
+    "restore_backup_chain",
+]
@@ -0,0 +1,133 @@
+"""
+Cache LRU en mémoire, borné en taille et en durée de vie, invalidé par
+un compteur de génération.
+
+Chaque écriture incrémente la génération et vide le cache. Un résultat
+n'est mémorisé que s'il a été lu sous la génération encore courante : une
+lecture commencée avant une écriture ne peut pas réintroduire une valeur
+périmée.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+DEFAULT_CACHE_SIZE = 1024
+DEFAULT_CACHE_TTL = 30.0
+
+MISSING = object()
+
+
+class ResultCache:
+    """
+    Cache LRU thread-safe de max_size entrées valables ttl secondes.
+
+    max_size=0 désactive le cache ; ttl=0 supprime la limite de durée.
+    """
+
+    def __init__(
+        self,
+        max_size: int = DEFAULT_CACHE_SIZE,
+        ttl: float = DEFAULT_CACHE_TTL,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if max_size < 0 or ttl < 0:
+            raise ValueError("max_size et ttl doivent être positifs ou nuls")
+        self.max_size = max_size
+        self.ttl = ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._generation = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+        self._invalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 0
+
+    @property
+    def generation(self) -> int:
+        """Génération courante, à relever avant de calculer une valeur."""
+        return self._generation
+
+    def get(self, key: Hashable) -> Any:
+        """Valeur associée à key, ou MISSING si absente ou expirée."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if not self.ttl or self._clock() < expires_at:
+                    self._entries.move_to_end(key)
+                    self._hits += 1
+                    return value
+                del self._entries[key]
+                self._expirations += 1
+            self._misses += 1
+            return MISSING
+
+    def put(self, key: Hashable, value: Any, generation: int) -> None:
+        """
+        Mémorise value pour key, sauf si une invalidation a eu lieu depuis
+        que generation a été relevée.
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            if generation != self._generation:
+                return
+            self._entries[key] = (self._clock() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def invalidate(self) -> None:
+        """Passe à la génération suivante et oublie toutes les entrées."""
+        with self._lock:
+            self._generation += 1
+            self._invalidations += 1
+            self._entries.clear()
+
+    def configure(self, max_size: int, ttl: float) -> None:
+        """Change les bornes du cache, le vide et remet ses compteurs à zéro."""
+        if max_size < 0 or ttl < 0:
+            raise ValueError("max_size et ttl doivent être positifs ou nuls")
+        with self._lock:
+            self.max_size = max_size
+            self.ttl = ttl
+            self._generation += 1
+            self._entries.clear()
+        self.reset_stats()
+
+    def stats(self) -> Dict[str, Any]:
+        """Compteurs du cache : hits, misses, evictions, expirations..."""
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl": self.ttl,
+                "generation": self._generation,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": self._hits / lookups if lookups else 0.0,
+                "evictions": self._evictions,
+                "expirations": self._expirations,
+                "invalidations": self._invalidations,
+            }
+
+    def reset_stats(self) -> None:
+        """Remet les compteurs à zéro."""
+        with self._lock:
+            self._hits = self._misses = self._evictions = self._expirations = self._invalidations = 0
+
+
+__all__ = [
+    "ResultCache",
+    "MISSING",
+]
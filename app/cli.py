@@ -5,8 +5,29 @@ Ce module utilise la base de données et la gestion de fichiers.
 Il contient aussi un export HTML volontairement vulnérable à la XSS.
 """
 
+import argparse
+import cProfile
+import json
+import os
+import shlex
+import sqlite3
+import sys
+from typing import Any, Callable, List, Optional, TextIO, Tuple
+
 from app import database
+from app import dedup
 from app import file_handler
+from app import profiling
+
+PAGE_SIZE = 20
+HTML_PAGE_SIZE = 1000
+
+# table-layout: fixed permet au navigateur d'afficher le tableau sans
+# attendre d'en avoir mesuré toutes les lignes.
+_HTML_STYLE = (
+    "table{table-layout:fixed;width:100%;border-collapse:collapse}"
+    "th,td{border:1px solid #999;padding:2px 4px;overflow:hidden;text-overflow:ellipsis}"
+)
 
 
 def main_menu() -> None:
@@ -56,43 +77,74 @@ def handle_add_contact() -> None:
     phone = input("Téléphone: ")
     notes = input("Notes: ")
 
-    conn = database.get_connection()
-    contact_id = database.create_contact(conn, name, email, phone, notes)
-    conn.close()
+    with database.connection() as conn:
+        contact_id = database.create_contact(conn, name, email, phone, notes)
 
     print(f"Contact créé avec l'id {contact_id}.")
 
 
 def handle_list_contacts() -> None:
-    """Affiche tous les contacts."""
+    """Affiche les contacts page par page."""
     print("\n=== Liste des contacts ===")
-    conn = database.get_connection()
-    contacts = database.list_contacts(conn)
-    conn.close()
-
-    if not contacts:
-        print("Aucun contact.")
-        return
-
-    for c in contacts:
-        print(f"[{c['id']}] {c['name']} - {c['email']} - {c['phone']} - {c['notes']}")
+    _browse_pages(
+        lambda conn, after_id, limit: database.list_contacts(
+            conn, after_id=after_id, limit=limit, row_format=database.ROW_FORMAT_CONTACT
+        ),
+        "Aucun contact.",
+    )
 
 
 def handle_search_contacts() -> None:
-    """Recherche des contacts par mot-clé (SQLi possible dans database.search_contacts)."""
+    """Recherche des contacts par mot-clé."""
     print("\n=== Rechercher un contact ===")
     query = input("Mot-clé: ")
 
-    conn = database.get_connection()
-    results = database.search_contacts(conn, query)
-    conn.close()
+    _browse_pages(
+        lambda conn, after_id, limit: database.search_contacts(
+            conn, query, after_id=after_id, limit=limit, row_format=database.ROW_FORMAT_CONTACT
+        ),
+        "Aucun résultat.",
+    )
 
-    if not results:
-        print("Aucun résultat.")
-        return
 
-    for c in results:
-        print(f"[{c['id']}] {c['name']} - {c['email']} - {c['phone']} - {c['notes']}")
+def _browse_pages(
+    fetch_page: Callable[[Any, Optional[int], int], List[database.Contact]],
+    empty_message: str,
+) -> None:
+    """
+    Affiche des contacts par pages de PAGE_SIZE lignes.
+
+    Chaque page est lue à la demande (pagination par id) ; les commandes
+    n / p / q passent à la page suivante, reviennent à la précédente ou
+    quittent.
+    """
+    page_starts: List[Optional[int]] = [None]
+    while True:
+        with database.connection() as conn:
+            contacts = fetch_page(conn, page_starts[-1], PAGE_SIZE + 1)
+        has_next = len(contacts) > PAGE_SIZE
+        contacts = contacts[:PAGE_SIZE]
+
+        if not contacts and len(page_starts) == 1:
+            print(empty_message)
+            return
+
+        for c in contacts:
+            _print_contact(c, as_json=False)
+
+        if not has_next and len(page_starts) == 1:
+            return
+
+        print(f"-- Page {len(page_starts)} --")
+        command = input("[n] suivante, [p] précédente, [q] quitter: ").strip().lower()
+        if command == "n" and has_next:
+            page_starts.append(contacts[-1].id)
+        elif command == "p" and len(page_starts) > 1:
+            page_starts.pop()
+        elif command in ("q", ""):
+            return
+        else:
+            print("Commande invalide.")
 
 
 def handle_update_contact() -> None:
@@ -122,9 +174,8 @@ def handle_update_contact() -> None:
         print("Rien à modifier.")
         return
 
-    conn = database.get_connection()
-    database.update_contact(conn, int(contact_id), **kwargs)
-    conn.close()
+    with database.connection() as conn:
+        database.update_contact(conn, int(contact_id), **kwargs)
 
     print("Contact mis à jour.")
 
@@ -137,9 +188,8 @@ def handle_delete_contact() -> None:
         print("ID invalide.")
         return
 
-    conn = database.get_connection()
-    database.delete_contact(conn, int(contact_id))
-    conn.close()
+    with database.connection() as conn:
+        database.delete_contact(conn, int(contact_id))
 
     print("Contact supprimé.")
 
@@ -150,6 +200,7 @@ def handle_export_menu() -> None:
     print("1. Export JSON")
     print("2. Export CSV")
     print("3. Export HTML (XSS possible)")
+    print("4. Export JSON Lines")
     choice = input("Votre choix: ").strip()
 
     path = input("Chemin de fichier de sortie: ").strip()
@@ -162,7 +213,10 @@ def handle_export_menu() -> None:
         print(f"Contacts exportés en CSV dans {result}.")
     elif choice == "3":
         result = export_contacts_html(path)
-        print(f"Contacts exportés en HTML dans {result}.")
+        print(f"Contacts exportés en HTML : index {result}, une page par {HTML_PAGE_SIZE} contacts.")
+    elif choice == "4":
+        result = file_handler.export_contacts_jsonl(path)
+        print(f"Contacts exportés en JSON Lines dans {result}.")
     else:
         print("Choix invalide.")
 
@@ -172,18 +226,25 @@ def handle_import_menu() -> None:
     print("\n=== Import des contacts ===")
     print("1. Import JSON")
     print("2. Import CSV")
+    print("3. Import JSON Lines")
     choice = input("Votre choix: ").strip()
 
     path = input("Chemin du fichier à importer: ").strip()
 
+    stats = {}
     if choice == "1":
-        count = file_handler.import_contacts_json(path)
+        count = file_handler.import_contacts_json(path, stats=stats)
         print(f"{count} contacts importés depuis le JSON.")
     elif choice == "2":
-        count = file_handler.import_contacts_csv(path)
+        count = file_handler.import_contacts_csv(path, stats=stats)
         print(f"{count} contacts importés depuis le CSV.")
+    elif choice == "3":
+        count = file_handler.import_contacts_jsonl(path, stats=stats)
+        print(f"{count} contacts importés depuis le JSON Lines.")
     else:
         print("Choix invalide.")
+        return
+    _print_throughput(stats)
 
 
 def handle_backup_menu() -> None:
@@ -191,6 +252,7 @@ def handle_backup_menu() -> None:
     print("\n=== Sauvegarde / Restauration ===")
     print("1. Sauvegarder")
     print("2. Restaurer")
+    print("3. Sauvegarde incrémentale")
     choice = input("Votre choix: ").strip()
 
     path = input("Chemin du fichier de sauvegarde: ").strip()
@@ -198,57 +260,474 @@ def handle_backup_menu() -> None:
     if choice == "1":
         result = file_handler.save_backup(path)
         print(f"Sauvegarde créée dans {result}.")
+    elif choice == "3":
+        try:
+            result = file_handler.save_backup(path, incremental=True)
+        except ValueError as exc:
+            print(exc)
+            return
+        print(f"Sauvegarde incrémentale créée dans {result}.")
     elif choice == "2":
-        count = file_handler.restore_backup(path)
+        stats = {}
+        count = file_handler.restore_backup(path, stats=stats)
         print(f"{count} contacts restaurés.")
+        _print_throughput(stats)
     else:
         print("Choix invalide.")
 
 
-def export_contacts_html(output_path: str) -> str:
+def _print_throughput(stats: dict) -> None:
+    """Affiche le débit d'un import ou d'une restauration."""
+    print(f"Durée : {stats['seconds']:.2f} s ({stats['contacts_per_second']:.0f} contacts/s).")
+
+
+def _html_page_path(index_path: str, number: int) -> str:
+    """Chemin de la page number de l'export dont index_path est l'index."""
+    root, ext = os.path.splitext(index_path)
+    return f"{root}-{number:04d}{ext or '.html'}"
+
+
+def _remove_html_pages(index_path: str) -> None:
     """
-    Exporte les contacts en HTML.
+    Supprime les pages d'un export précédent vers index_path : une base
+    plus petite en produit moins, et les pages restantes renverraient
+    vers le nouvel index.
+    """
+    number = 1
+    while True:
+        try:
+            os.remove(_html_page_path(index_path, number))
+        except FileNotFoundError:
+            return
+        number += 1
+
+
+def _html_head(title: str) -> str:
+    return (
+        "<!DOCTYPE html>\n<html><head><meta charset='utf-8'>"
+        f"<title>{title}</title><style>{_HTML_STYLE}</style></head><body>\n"
+    )
+
+
+def _html_nav(index_path: str, number: int, has_next: bool) -> str:
+    """Liens vers l'index et vers les pages précédente et suivante."""
+    links = [f"<a href='{os.path.basename(index_path)}'>Index</a>"]
+    if number > 1:
+        links.append(f"<a href='{os.path.basename(_html_page_path(index_path, number - 1))}'>&larr; Page {number - 1}</a>")
+    if has_next:
+        links.append(f"<a href='{os.path.basename(_html_page_path(index_path, number + 1))}'>Page {number + 1} &rarr;</a>")
+    return "<p>" + " | ".join(links) + "</p>\n"
+
+
+def _start_html_page(f: TextIO, index_path: str, number: int) -> None:
+    f.write(_html_head(f"Contacts - page {number}"))
+    f.write(f"<h1>Liste des contacts - page {number}</h1>\n")
+    f.write(_html_nav(index_path, number, has_next=False))
+    f.write("<table>\n")
+    f.write(
+        "<tr><th>ID</th><th>Nom</th><th>Email</th>"
+        "<th>Téléphone</th><th>Notes</th></tr>\n"
+    )
+
+
+def _end_html_page(f: TextIO, index_path: str, number: int, has_next: bool) -> None:
+    f.write("</table>\n")
+    f.write(_html_nav(index_path, number, has_next))
+    f.write("</body></html>\n")
+
+
+def export_contacts_html(output_path: str, page_size: int = HTML_PAGE_SIZE) -> str:
+    """
+    Exporte les contacts en HTML, par pages de page_size lignes.
+
+    output_path reçoit une page d'index qui liste les pages (plage d'ids de
+    chacune) ; les contacts sont dans output_path complété de -0001,
+    -0002... (contacts.html -> contacts-0001.html), chaque page ayant des
+    liens vers l'index et les pages voisines. Les lignes sont écrites au
+    fil de la lecture du curseur : seule la liste des plages d'ids est
+    gardée en mémoire, quelle que soit la taille de la base. Les pages
+    d'un export précédent vers output_path sont supprimées d'abord.
 
     VULNÉRABILITÉ XSS : les données ne sont pas échappées avant d'être
     affichées dans le fichier HTML.
     """
-    conn = database.get_connection()
-    contacts = database.list_contacts(conn)
-    conn.close()
-
-    html_parts = []
-    html_parts.append("<html><head><title>Contacts</title></head><body>")
-    html_parts.append("<h1>Liste des contacts</h1>")
-    html_parts.append("<table border='1'>")
-    html_parts.append(
-        "<tr><th>ID</th><th>Nom</th><th>Email</th>"
-        "<th>Téléphone</th><th>Notes</th></tr>"
-    )
+    if page_size < 1:
+        raise ValueError("page_size doit être strictement positif")
+    _remove_html_pages(output_path)
+
+    pages: List[Tuple[int, int]] = []
+    page: Optional[TextIO] = None
+    rows = 0
+    try:
+        with database.connection() as conn:
+            for c in database.iter_contacts(conn, row_format=database.ROW_FORMAT_CONTACT):
+                if page is not None and rows == page_size:
+                    # Page pleine : elle n'est close qu'à l'arrivée d'un
+                    # contact de plus, pour savoir si elle a une suivante.
+                    _end_html_page(page, output_path, len(pages), has_next=True)
+                    page.close()
+                    page = None
+                if page is None:
+                    pages.append((c.id, c.id))
+                    page = open(_html_page_path(output_path, len(pages)), "w", encoding="utf-8")
+                    _start_html_page(page, output_path, len(pages))
+                    rows = 0
+                # Les valeurs sont injectées directement : XSS possible.
+                page.write(
+                    f"<tr>"
+                    f"<td>{c.id}</td>"
+                    f"<td>{c.name}</td>"
+                    f"<td>{c.email}</td>"
+                    f"<td>{c.phone}</td>"
+                    f"<td>{c.notes}</td>"
+                    f"</tr>\n"
+                )
+                rows += 1
+                pages[-1] = (pages[-1][0], c.id)
+        if page is not None:
+            _end_html_page(page, output_path, len(pages), has_next=False)
+    finally:
+        if page is not None:
+            page.close()
+
+    with open(output_path, "w", encoding="utf-8") as f:
+        f.write(_html_head("Contacts"))
+        f.write("<h1>Liste des contacts</h1>\n")
+        if not pages:
+            f.write("<p>Aucun contact.</p>\n")
+        else:
+            f.write(f"<p>{len(pages)} page(s) de {page_size} contacts au plus.</p>\n<ul>\n")
+            for number, (first_id, last_id) in enumerate(pages, start=1):
+                name = os.path.basename(_html_page_path(output_path, number))
+                f.write(f"<li><a href='{name}'>Page {number}</a> : ids {first_id} à {last_id}</li>\n")
+            f.write("</ul>\n")
+        f.write("</body></html>\n")
+
+    return output_path
+
+
+class CommandError(Exception):
+    """Commande invalide en mode non interactif."""
+
+
+class _CommandParser(argparse.ArgumentParser):
+    """ArgumentParser qui lève CommandError au lieu de quitter le processus."""
+
+    def error(self, message: str) -> None:
+        raise CommandError(message)
+
+
+def _print_contact(c: database.Contact, as_json: bool) -> None:
+    if as_json:
+        print(json.dumps(c._asdict(), ensure_ascii=False))
+    else:
+        print(f"[{c.id}] {c.name} - {c.email} - {c.phone} - {c.notes}")
 
+
+def _cmd_add(conn: Any, args: argparse.Namespace) -> None:
+    contact_id = database.create_contact(conn, args.name, args.email, args.phone, args.notes)
+    print(contact_id)
+
+
+def _cmd_list(conn: Any, args: argparse.Namespace) -> None:
+    row_format = database.ROW_FORMAT_CONTACT
+    if args.after_id is None and args.limit is None:
+        contacts = database.iter_contacts(conn, row_format=row_format)
+    else:
+        contacts = database.list_contacts(conn, after_id=args.after_id, limit=args.limit, row_format=row_format)
     for c in contacts:
-        # Les valeurs sont injectées directement : XSS possible.
-        html_parts.append(
-            f"<tr>"
-            f"<td>{c['id']}</td>"
-            f"<td>{c['name']}</td>"
-            f"<td>{c['email']}</td>"
-            f"<td>{c['phone']}</td>"
-            f"<td>{c['notes']}</td>"
-            f"</tr>"
+        _print_contact(c, args.json)
+
+
+def _cmd_search(conn: Any, args: argparse.Namespace) -> None:
+    results = database.search_contacts(
+        conn, args.query, mode=args.mode, after_id=args.after_id, limit=args.limit,
+        row_format=database.ROW_FORMAT_CONTACT,
+    )
+    for c in results:
+        _print_contact(c, args.json)
+
+
+def _cmd_update(conn: Any, args: argparse.Namespace) -> None:
+    database.update_contact(
+        conn, args.id, name=args.name, email=args.email, phone=args.phone, notes=args.notes
+    )
+
+
+def _cmd_update_many(conn: Any, args: argparse.Namespace) -> None:
+    source = sys.stdin if args.path == "-" else open(args.path, "r", encoding="utf-8")
+    try:
+        changes = (json.loads(line) for line in source if line.strip())
+        print(database.update_contacts(conn, changes))
+    except json.JSONDecodeError as exc:
+        raise CommandError(f"modification JSON invalide : {exc}") from None
+    finally:
+        if source is not sys.stdin:
+            source.close()
+
+
+def _cmd_delete(conn: Any, args: argparse.Namespace) -> None:
+    print(database.delete_contacts(conn, args.ids))
+
+
+def _cmd_export(conn: Any, args: argparse.Namespace) -> None:
+    exporters = {
+        "json": file_handler.export_contacts_json,
+        "csv": file_handler.export_contacts_csv,
+        "jsonl": file_handler.export_contacts_jsonl,
+        "html": lambda path: export_contacts_html(path, args.page_size),
+    }
+    print(exporters[args.format](args.path))
+
+
+def _cmd_import(conn: Any, args: argparse.Namespace) -> None:
+    importers = {
+        "json": file_handler.import_contacts_json,
+        "csv": file_handler.import_contacts_csv,
+        "jsonl": file_handler.import_contacts_jsonl,
+    }
+    options = {}
+    if args.workers is not None:
+        if args.format == "json":
+            raise CommandError("--workers : seulement pour les formats csv et jsonl")
+        options["workers"] = args.workers
+    print(importers[args.format](args.path, upsert_key=args.upsert, **options))
+
+
+def _cmd_backup(conn: Any, args: argparse.Namespace) -> None:
+    print(file_handler.save_backup(args.path, incremental=args.incremental, backup_format=args.format))
+
+
+def _cmd_restore(conn: Any, args: argparse.Namespace) -> None:
+    if args.deltas:
+        print(file_handler.restore_backup_chain(args.path, args.deltas))
+    else:
+        print(file_handler.restore_backup(args.path, upsert_key=args.upsert))
+
+
+def _cmd_dedup(conn: Any, args: argparse.Namespace) -> None:
+    clusters = dedup.find_duplicates(conn, max_block_size=args.max_block_size)
+    for cluster in clusters:
+        print(" ".join(str(contact_id) for contact_id in cluster))
+    if args.merge:
+        print(f"{dedup.merge_duplicates(conn, clusters)} doublon(s) fusionné(s)")
+
+
+def _cmd_serve(conn: Any, args: argparse.Namespace) -> None:
+    # Flask n'est nécessaire que pour ce mode.
+    from app import server
+
+    server.serve(args.host, args.port, args.threads)
+
+
+# Commandes refusées dans un lot (batch et serve n'y sont pas définies) :
+# la copie de pages SQLite de backup et restore ne peut pas s'exécuter
+# dans la transaction ouverte du lot.
+_BATCH_EXCLUDED = ("backup", "restore")
+
+
+def _cmd_batch(conn: Any, args: argparse.Namespace) -> None:
+    """
+    Exécute une commande par ligne (fichier ou "-" pour stdin), toutes sur
+    la même connexion et dans la même transaction : une erreur annule
+    l'ensemble du lot. backup et restore y sont refusés.
+    """
+    parser = _build_parser(allow_batch=False)
+    source = sys.stdin if args.path == "-" else open(args.path, "r", encoding="utf-8")
+    try:
+        with database.transaction(conn):
+            for line_number, line in enumerate(source, start=1):
+                line = line.strip()
+                if not line or line.startswith("#"):
+                    continue
+                try:
+                    command_args = parser.parse_args(shlex.split(line))
+                except (CommandError, ValueError) as exc:
+                    raise CommandError(f"ligne {line_number} : {exc}") from None
+                except SystemExit:
+                    # --help, --version : argparse quitterait le processus.
+                    raise CommandError(f"ligne {line_number} : option sans commande à exécuter") from None
+                if command_args.command in _BATCH_EXCLUDED:
+                    raise CommandError(f"ligne {line_number} : {command_args.command} n'est pas disponible dans un lot")
+                command_args.func(conn, command_args)
+    finally:
+        if source is not sys.stdin:
+            source.close()
+
+
+def _build_parser(allow_batch: bool = True) -> argparse.ArgumentParser:
+    """Construit l'analyseur des commandes non interactives."""
+    parser = _CommandParser(
+        prog="python -m app.cli",
+        description="Gestion de contacts. Sans commande, lance le menu interactif.",
+    )
+    if allow_batch:
+        _add_profile_options(parser)
+    commands = parser.add_subparsers(dest="command", required=True, parser_class=_CommandParser)
+
+    add = commands.add_parser("add", help="ajoute un contact et affiche son id")
+    add.add_argument("--name", required=True)
+    add.add_argument("--email", required=True)
+    add.add_argument("--phone", default="")
+    add.add_argument("--notes", default="")
+    add.set_defaults(func=_cmd_add)
+
+    for name, func, helptext in (
+        ("list", _cmd_list, "liste les contacts"),
+        ("search", _cmd_search, "recherche des contacts"),
+    ):
+        sub = commands.add_parser(name, help=helptext)
+        if name == "search":
+            sub.add_argument("query")
+            sub.add_argument("--mode", choices=database.SEARCH_MODES, default=database.SEARCH_MODE_LIKE)
+        sub.add_argument("--after-id", type=int)
+        sub.add_argument("--limit", type=int)
+        sub.add_argument("--json", action="store_true", help="un contact JSON par ligne")
+        sub.set_defaults(func=func)
+
+    update = commands.add_parser("update", help="modifie un contact")
+    update.add_argument("id", type=int)
+    update.add_argument("--name")
+    update.add_argument("--email")
+    update.add_argument("--phone")
+    update.add_argument("--notes")
+    update.set_defaults(func=_cmd_update)
+
+    update_many = commands.add_parser(
+        "update-many",
+        help='modifie des contacts en une transaction (JSON Lines : {"id": 1, "notes": "..."} par ligne)',
+    )
+    update_many.add_argument("path", nargs="?", default="-", help='fichier JSON Lines, ou "-" pour stdin')
+    update_many.set_defaults(func=_cmd_update_many)
+
+    delete = commands.add_parser("delete", help="supprime un ou plusieurs contacts et affiche leur nombre")
+    delete.add_argument("ids", type=int, nargs="+")
+    delete.set_defaults(func=_cmd_delete)
+
+    export = commands.add_parser("export", help="exporte les contacts")
+    export.add_argument("format", choices=("json", "csv", "jsonl", "html"))
+    export.add_argument("path")
+    export.add_argument(
+        "--page-size", type=int, default=HTML_PAGE_SIZE, help="html : contacts par page (path reçoit l'index)"
+    )
+    export.set_defaults(func=_cmd_export)
+
+    import_ = commands.add_parser("import", help="importe des contacts")
+    import_.add_argument("format", choices=("json", "csv", "jsonl"))
+    import_.add_argument("path")
+    import_.add_argument("--upsert", choices=database.UPSERT_KEYS, help="met à jour les contacts existants (clé)")
+    import_.add_argument("--workers", type=int, help="processus d'analyse en parallèle (par défaut : 1, lecture en flux)")
+    import_.set_defaults(func=_cmd_import)
+
+    backup = commands.add_parser("backup", help="sauvegarde la base")
+    backup.add_argument("path")
+    backup.add_argument(
+        "--incremental", action="store_true", help="seulement les modifications depuis la dernière sauvegarde"
+    )
+    backup.add_argument(
+        "--format",
+        choices=(file_handler.BACKUP_FORMAT_JSON, file_handler.BACKUP_FORMAT_SQLITE),
+        help="json, ou copie de pages sqlite (par défaut : d'après l'extension)",
+    )
+    backup.set_defaults(func=_cmd_backup)
+
+    restore = commands.add_parser(
+        "restore", help="restaure une sauvegarde (base complète puis deltas : reconstruit la base)"
+    )
+    restore.add_argument("path")
+    restore.add_argument("deltas", nargs="*", help="sauvegardes incrémentales, dans l'ordre")
+    restore.add_argument("--upsert", choices=database.UPSERT_KEYS, help="met à jour les contacts existants (clé)")
+    restore.set_defaults(func=_cmd_restore)
+
+    dedup_ = commands.add_parser("dedup", help="affiche les grappes de doublons (une par ligne : ids)")
+    dedup_.add_argument("--merge", action="store_true", help="fusionne chaque grappe dans son contact le plus ancien")
+    dedup_.add_argument(
+        "--max-block-size", type=int, default=dedup.DEFAULT_MAX_BLOCK_SIZE,
+        help="au-delà, un nom trop courant ne suffit pas à rapprocher des contacts",
+    )
+    dedup_.set_defaults(func=_cmd_dedup)
+
+    if allow_batch:
+        batch = commands.add_parser(
+            "batch", help="exécute les commandes d'un fichier (ou de stdin) en une transaction"
         )
+        batch.add_argument("path", nargs="?", default="-")
+        batch.set_defaults(func=_cmd_batch)
 
-    html_parts.append("</table>")
-    html_parts.append("</body></html>")
+        serve = commands.add_parser("serve", help="lance le serveur HTTP (voir app/server.py)")
+        serve.add_argument("--host", default="127.0.0.1")
+        serve.add_argument("--port", type=int, default=5000)
+        serve.add_argument("--threads", type=int, default=database.DEFAULT_POOL_SIZE)
+        serve.set_defaults(func=_cmd_serve)
 
-    html_content = "\n".join(html_parts)
+    return parser
 
-    with open(output_path, "w", encoding="utf-8") as f:
-        f.write(html_content)
 
-    return output_path
+def _add_profile_options(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--profile", action="store_true",
+        help="affiche en sortie les durées par opération et par requête SQL (sur stderr)",
+    )
+    parser.add_argument(
+        "--cprofile", metavar="FICHIER", help="enregistre un profil cProfile (pstats) dans FICHIER",
+    )
+
+
+def _split_profile_options(argv: List[str]) -> Tuple[argparse.Namespace, List[str]]:
+    """Sépare --profile/--cprofile du reste de la ligne de commande."""
+    parser = argparse.ArgumentParser(add_help=False, allow_abbrev=False)
+    _add_profile_options(parser)
+    return parser.parse_known_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Point d'entrée : menu interactif sans argument, sinon exécute la
+    commande demandée sur une connexion du pool et retourne le code de
+    sortie.
+
+    --profile et --cprofile FICHIER (avant ou après la commande, menu
+    compris) mesurent l'exécution et en écrivent le bilan à la sortie.
+    """
+    if argv is None:
+        argv = sys.argv[1:]
+    options, argv = _split_profile_options(argv)
+
+    profiler = cProfile.Profile() if options.cprofile else None
+    if options.profile:
+        profiling.enable()
+    if profiler is not None:
+        profiler.enable()
+    try:
+        return _run(argv)
+    finally:
+        if profiler is not None:
+            profiler.disable()
+            profiler.dump_stats(options.cprofile)
+            print(f"Profil cProfile écrit dans {options.cprofile}", file=sys.stderr)
+        if options.profile:
+            print(profiling.summary(), file=sys.stderr)
+            profiling.disable()
+            profiling.reset()
+
+
+def _run(argv: List[str]) -> int:
+    if not argv:
+        main_menu()
+        return 0
+
+    try:
+        args = _build_parser().parse_args(argv)
+        with database.connection() as conn:
+            args.func(conn, args)
+    except (CommandError, OSError, ValueError, sqlite3.Error) as exc:
+        print(f"Erreur : {exc}", file=sys.stderr)
+        return 1
+    return 0
 
 
 __all__ = [
+    "main",
     "main_menu",
     "handle_add_contact",
     "handle_list_contacts",
@@ -263,6 +742,6 @@ __all__ = [
 
 
 if __name__ == "__main__":
-    main_menu()
+    sys.exit(main())
 
 
@@ -1,39 +1,601 @@
 """
 Module de gestion de la base de données SQLite pour les contacts.
 
-Module est volontairement vulnérable à l'injection SQL
-(requêtes non paramétrées, concaténation de chaînes).
+Toutes les requêtes sont des textes SQL fixes avec paramètres préparés :
+elles ne sont analysées qu'une fois par connexion grâce au cache de
+requêtes de sqlite3 (voir cached_statements).
+
+Les résultats de get_contact et search_contacts sont gardés dans un cache
+en mémoire (voir app.cache), vidé après chaque écriture validée par ce
+processus.
+
+Le schéma évolue par migrations numérotées (voir MIGRATIONS) ; la version
+atteinte est gardée dans PRAGMA user_version, lue à l'ouverture de chaque
+connexion.
 """
 
 import os
 import sqlite3
-from typing import Any, Dict, List, Optional
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Mapping, NamedTuple, Optional, Sequence, Tuple, Union
+
+from app.cache import DEFAULT_CACHE_SIZE, DEFAULT_CACHE_TTL, MISSING, ResultCache
 
 DEFAULT_DB_PATH = "contacts.db"
+DEFAULT_POOL_SIZE = 8
+DEFAULT_BATCH_SIZE = 5000
+DEFAULT_CHUNK_SIZE = 1000
+DEFAULT_CACHED_STATEMENTS = 256
+
+DEFAULT_PROFILE = "durable"
+
+# Réglages PRAGMA appliqués à l'ouverture de chaque connexion, choisis par
+# la variable d'environnement CONTACTS_DB_PROFILE.
+PROFILES: Dict[str, Dict[str, Any]] = {
+    # Comportement historique : fsync à chaque commit. Le mode de journal
+    # n'est pas imposé, il reste celui du fichier : une base déjà passée
+    # en WAL par une autre connexion (serveur en "balanced"...) reste
+    # utilisable.
+    "durable": {
+        "synchronous": "FULL",
+    },
+    # Force le journal de rollback (repasse une base WAL en DELETE) : ne
+    # convient que si aucune autre connexion n'a la base ouverte.
+    "rollback": {
+        "journal_mode": "DELETE",
+        "synchronous": "FULL",
+    },
+    # WAL : les lecteurs ne bloquent plus l'écrivain, un fsync par checkpoint.
+    "balanced": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+    },
+    # Imports et exports massifs : gros cache de pages, lecture par mmap,
+    # tables temporaires en mémoire.
+    "bulk": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "cache_size": -262144,
+        "mmap_size": 1073741824,
+        "temp_store": "MEMORY",
+    },
+}
+
+SEARCH_MODE_LIKE = "like"
+SEARCH_MODE_FTS = "fts"
+SEARCH_MODE_PREFIX = "prefix"
+UPSERT_KEY_ID = "id"
+UPSERT_KEY_EMAIL = "email"
+UPSERT_KEYS = (UPSERT_KEY_ID, UPSERT_KEY_EMAIL)
 
+SEARCH_MODES = (SEARCH_MODE_LIKE, SEARCH_MODE_FTS, SEARCH_MODE_PREFIX)
 
-def get_connection(db_path: str = None) -> sqlite3.Connection:
+ROW_FORMAT_DICT = "dict"
+ROW_FORMAT_TUPLE = "tuple"
+ROW_FORMAT_CONTACT = "contact"
+ROW_FORMATS = (ROW_FORMAT_DICT, ROW_FORMAT_TUPLE, ROW_FORMAT_CONTACT)
+
+# Position de chaque champ dans un contact au format "tuple".
+CONTACT_FIELDS = ("id", "name", "email", "phone", "notes")
+
+ContactInput = Union[Mapping[str, Any], Sequence[Any]]
+
+
+class Contact(NamedTuple):
     """
-    Retourne une connexion SQLite vers la base de données.
-    Crée la base et la table si nécessaire.
-    
-    Si db_path n'est pas fourni, utilise CONTACTS_DB_PATH de l'environnement
-    ou "contacts.db" par défaut.
+    Contact compact (row_format="contact") : un tuple sans dictionnaire
+    d'attributs par instance, dont les champs sont lus par nom (c.email)
+    via des descripteurs partagés par la classe.
+    """
+
+    id: int
+    name: str
+    email: str
+    phone: Optional[str]
+    notes: Optional[str]
+
+
+def _contact_row(cursor: sqlite3.Cursor, row: Tuple[Any, ...]) -> Contact:
+    """row_factory du format "contact" : réutilise le tuple lu par sqlite3."""
+    return _new_tuple(Contact, row)
+
+
+_new_tuple = tuple.__new__
+
+_CONTACT_COLUMNS = "id, name, email, phone, notes"
+_SQL_INSERT = "INSERT INTO contacts (name, email, phone, notes) VALUES (?, ?, ?, ?)"
+_SQL_SELECT = f"SELECT {_CONTACT_COLUMNS} FROM contacts"
+_SQL_SELECT_BY_ID = f"{_SQL_SELECT} WHERE id = ?"
+_SQL_UPDATE = (
+    "UPDATE contacts SET name = COALESCE(?, name), email = COALESCE(?, email), "
+    "phone = COALESCE(?, phone), notes = COALESCE(?, notes) WHERE id = ?"
+)
+_SQL_DELETE = "DELETE FROM contacts WHERE id = ?"
+# Table temporaire (propre à la connexion) des ids visés par
+# delete_contacts : une seule suppression ensembliste par jointure.
+_SQL_CREATE_BULK_IDS = "CREATE TEMP TABLE IF NOT EXISTS bulk_ids (id INTEGER PRIMARY KEY)"
+_SQL_INSERT_BULK_ID = "INSERT OR IGNORE INTO temp.bulk_ids (id) VALUES (?)"
+_SQL_DELETE_BULK_IDS = "DELETE FROM contacts WHERE id IN (SELECT id FROM temp.bulk_ids)"
+_SQL_UPSERT_BY_ID = (
+    "INSERT INTO contacts (id, name, email, phone, notes) VALUES (?, ?, ?, ?, ?) "
+    "ON CONFLICT(id) DO UPDATE SET name = excluded.name, email = excluded.email, "
+    "phone = excluded.phone, notes = excluded.notes "
+    "WHERE name IS NOT excluded.name OR email IS NOT excluded.email "
+    "OR phone IS NOT excluded.phone OR notes IS NOT excluded.notes"
+)
+_EMAIL_KEY = "lower(trim(email))"
+_EMAIL_KEY_WHERE = "email IS NOT NULL AND trim(email) <> ''"
+# Index non unique : des contacts peuvent partager un email (saisie,
+# imports) ; l'upsert par email met à jour le plus ancien d'entre eux.
+_SQL_CREATE_EMAIL_INDEX = (
+    f"CREATE INDEX IF NOT EXISTS idx_contacts_email_key ON contacts ({_EMAIL_KEY}) "
+    f"WHERE {_EMAIL_KEY_WHERE}"
+)
+_SQL_FIND_BY_EMAIL = (
+    f"SELECT id, name, phone, notes FROM contacts WHERE {_EMAIL_KEY} = lower(trim(?)) "
+    f"AND {_EMAIL_KEY_WHERE} ORDER BY id LIMIT 1"
+)
+_SQL_UPDATE_BY_EMAIL = "UPDATE contacts SET name = ?, phone = ?, notes = ? WHERE id = ?"
+_SQL_LIKE = "name LIKE '%' || ? || '%' OR email LIKE '%' || ? || '%' OR notes LIKE '%' || ? || '%'"
+# Le motif est passé tel quel (et non construit par ? || '%') pour que
+# SQLite transforme LIKE en parcours des index NOCASE idx_contacts_name et
+# idx_contacts_email.
+_SQL_PREFIX = "name LIKE ? ESCAPE '\\' OR email LIKE ? ESCAPE '\\'"
+_SQL_SELECT_BY_EMAIL = f"{_SQL_SELECT} WHERE email = ? COLLATE NOCASE ORDER BY id"
+
+_schema_lock = threading.Lock()
+
+
+def _resolve_db_path(db_path: Optional[str]) -> str:
+    """
+    Résout le chemin de la base : argument, puis CONTACTS_DB_PATH,
+    puis "contacts.db".
     """
     if db_path is None:
         db_path = os.environ.get("CONTACTS_DB_PATH", DEFAULT_DB_PATH)
-    conn = sqlite3.connect(db_path)
+    if db_path == ":memory:":
+        return db_path
+    return os.path.abspath(db_path)
+
+
+def _file_identity(db_path: str) -> Optional[Tuple[int, int]]:
+    """
+    Identifie le fichier physique (périphérique, inode) derrière un chemin.
+
+    Permet de détecter qu'un fichier a été supprimé ou remplacé.
+    """
+    if db_path == ":memory:":
+        return None
+    try:
+        st = os.stat(db_path)
+    except OSError:
+        return None
+    return (st.st_dev, st.st_ino)
+
+
+class ContactsConnection(sqlite3.Connection):
+    """
+    Connexion SQLite de l'application : retient le profil PRAGMA appliqué,
+    la profondeur de transaction ouverte par transaction(), la base servie
+    (clé du cache de résultats), le nombre de modifications déjà
+    signalées au cache, le dernier PRAGMA data_version relevé et s'il l'a
+    déjà été pendant l'emprunt du pool en cours.
+    """
+
+    profile: Optional[str] = None
+    transaction_depth: int = 0
+    db_key: Optional[Tuple[str, Optional[Tuple[int, int]]]] = None
+    seen_changes: int = 0
+    data_version: int = 0
+    borrowed: bool = False
+    data_version_checked: bool = False
+
+
+def _profile_name() -> str:
+    """Profil demandé par CONTACTS_DB_PROFILE, "durable" par défaut."""
+    name = os.environ.get("CONTACTS_DB_PROFILE", DEFAULT_PROFILE)
+    if name not in PROFILES:
+        raise ValueError(f"Profil SQLite inconnu : {name} (attendu : {', '.join(PROFILES)})")
+    return name
+
+
+def _apply_profile(conn: ContactsConnection, name: str) -> None:
+    """Applique les PRAGMA du profil name à la connexion."""
+    for pragma, value in PROFILES[name].items():
+        conn.execute(f"PRAGMA {pragma} = {value}")
+    conn.profile = name
+
+
+def active_profile(conn: Optional[sqlite3.Connection] = None) -> str:
+    """
+    Retourne le nom du profil PRAGMA appliqué à conn, ou à défaut celui
+    que recevront les prochaines connexions.
+    """
+    profile = getattr(conn, "profile", None)
+    return profile if profile is not None else _profile_name()
+
+
+def profile_settings(conn: sqlite3.Connection) -> Dict[str, Any]:
+    """
+    Relit sur la connexion la valeur effective de chaque PRAGMA réglé par
+    les profils (diagnostic).
+    """
+    pragmas = []
+    for settings in PROFILES.values():
+        pragmas.extend(p for p in settings if p not in pragmas)
+    return {p: conn.execute(f"PRAGMA {p}").fetchone()[0] for p in pragmas}
+
+
+def _cached_statements() -> int:
+    """
+    Taille du cache de requêtes préparées par connexion :
+    CONTACTS_DB_CACHED_STATEMENTS ou DEFAULT_CACHED_STATEMENTS.
+    """
+    return int(os.environ.get("CONTACTS_DB_CACHED_STATEMENTS", DEFAULT_CACHED_STATEMENTS))
+
+
+# Fonctions appelées sur chaque nouvelle connexion (ex. traceur SQL de
+# app.profiling).
+_connection_hooks: List[Callable[[sqlite3.Connection], None]] = []
+
+
+def add_connection_hook(hook: Callable[[sqlite3.Connection], None]) -> None:
+    """Appelle hook(conn) sur chaque connexion ouverte à partir de maintenant."""
+    _connection_hooks.append(hook)
+
+
+def remove_connection_hook(hook: Callable[[sqlite3.Connection], None]) -> None:
+    """Retire un hook ajouté par add_connection_hook."""
+    if hook in _connection_hooks:
+        _connection_hooks.remove(hook)
+
+
+_cache = ResultCache(
+    int(os.environ.get("CONTACTS_CACHE_SIZE", DEFAULT_CACHE_SIZE)),
+    float(os.environ.get("CONTACTS_CACHE_TTL", DEFAULT_CACHE_TTL)),
+)
+
+
+def configure_cache(max_size: int = DEFAULT_CACHE_SIZE, ttl: float = DEFAULT_CACHE_TTL) -> None:
+    """
+    Règle le cache de résultats (max_size=0 le désactive), le vide et
+    remet ses statistiques à zéro.
+
+    Valeurs initiales : CONTACTS_CACHE_SIZE et CONTACTS_CACHE_TTL (secondes).
+    """
+    _cache.configure(max_size, ttl)
+
+
+def cache_stats() -> Dict[str, Any]:
+    """Statistiques du cache de résultats (hits, misses, evictions...)."""
+    return _cache.stats()
+
+
+def invalidate_cache() -> None:
+    """
+    Vide le cache de résultats.
+
+    Les écritures validées, par ce module ou par une autre connexion ou
+    un autre processus, le vident d'elles-mêmes ; à appeler après une
+    modification de la base faite sans passer par SQLite (copie du
+    fichier).
+    """
+    _cache.invalidate()
+
+
+def _sync_cache(conn: sqlite3.Connection) -> None:
+    """
+    Vide le cache si conn a modifié des lignes depuis le dernier appel.
+
+    Une connexion sqlite3 ordinaire ne retient pas ce compteur : le cache
+    est vidé à chaque validation.
+    """
+    changes = conn.total_changes
+    if changes != getattr(conn, "seen_changes", None):
+        if isinstance(conn, ContactsConnection):
+            conn.seen_changes = changes
+        _cache.invalidate()
+
+
+def _data_version(conn: sqlite3.Connection) -> int:
+    return conn.execute("PRAGMA data_version").fetchone()[0]
+
+
+def _cached(conn: sqlite3.Connection, key: Tuple[Any, ...], load: Callable[[], Any]) -> Any:
+    """
+    Retourne load() en passant par le cache de résultats.
+
+    Le cache est ignoré pour les bases en mémoire, pour les connexions
+    sqlite3 ordinaires (qui ne connaissent pas la base servie) et pendant
+    une transaction, dont les écritures non validées ne doivent pas être
+    vues par les autres connexions.
+
+    total_changes ne compte que les écritures de conn : celles des autres
+    connexions et processus sont repérées à PRAGMA data_version, qui
+    change dès que l'une d'elles a validé une modification de la base.
+    Pour ne pas ajouter une requête à chaque lecture servie par le cache,
+    il n'est relu qu'une fois par emprunt du pool (connection()) ; une
+    connexion utilisée hors du pool le relit à chaque lecture.
+    """
+    if not _cache.enabled or getattr(conn, "db_key", None) is None or conn.in_transaction:
+        return load()
+    if not conn.data_version_checked:
+        version = _data_version(conn)
+        if version != conn.data_version:
+            conn.data_version = version
+            _cache.invalidate()
+        conn.data_version_checked = conn.borrowed
+    key = (conn.db_key,) + key
+    value = _cache.get(key)
+    if value is MISSING:
+        generation = _cache.generation
+        value = load()
+        _cache.put(key, value, generation)
+    return value
+
+
+def _open_connection(
+    db_path: str,
+    check_same_thread: bool = True,
+    cached_statements: Optional[int] = None,
+) -> sqlite3.Connection:
+    """
+    Ouvre une connexion, lui applique le profil PRAGMA actif et applique
+    les migrations en attente.
+    """
+    profile = _profile_name()
+    if cached_statements is None:
+        cached_statements = _cached_statements()
+    conn = sqlite3.connect(
+        db_path,
+        check_same_thread=check_same_thread,
+        cached_statements=cached_statements,
+        factory=ContactsConnection,
+    )
     conn.row_factory = sqlite3.Row
-    _init_schema(conn)
+    try:
+        _apply_profile(conn, profile)
+    except Exception:
+        conn.close()
+        raise
+    key = (db_path, _file_identity(db_path))
+    # Un fichier vide vient d'être créé : le cache peut encore contenir une
+    # base supprimée entre-temps dont l'inode a été réutilisé.
+    fresh = db_path != ":memory:" and os.path.getsize(db_path) == 0
+    migrate(conn)
+    if fresh:
+        _cache.invalidate()
+    if db_path != ":memory:":
+        conn.db_key = key
+    conn.seen_changes = conn.total_changes
+    conn.data_version = _data_version(conn)
+    for hook in _connection_hooks:
+        hook(conn)
     return conn
 
 
-def _init_schema(conn: sqlite3.Connection) -> None:
+def get_connection(db_path: str = None, cached_statements: Optional[int] = None) -> sqlite3.Connection:
     """
-    Crée la table contacts si elle n'existe pas.
+    Retourne une connexion SQLite vers la base de données.
+    Crée la base et la table si nécessaire.
+    
+    Si db_path n'est pas fourni, utilise CONTACTS_DB_PATH de l'environnement
+    ou "contacts.db" par défaut. cached_statements fixe la taille du cache
+    de requêtes préparées (par défaut CONTACTS_DB_CACHED_STATEMENTS ou 256).
+    Le profil PRAGMA est choisi par CONTACTS_DB_PROFILE (voir PROFILES).
+
+    La connexion retournée appartient à l'appelant, qui doit la fermer.
+    Préférer connection() pour réutiliser les connexions du pool.
     """
-    cursor = conn.cursor()
-    cursor.execute(
+    return _open_connection(_resolve_db_path(db_path), cached_statements=cached_statements)
+
+
+class _PooledConnection:
+    """Connexion du pool et son état de prêt."""
+
+    __slots__ = ("conn", "db_path", "identity", "depth", "closed")
+
+    def __init__(self, conn: sqlite3.Connection, db_path: str) -> None:
+        self.conn = conn
+        self.db_path = db_path
+        self.identity = _file_identity(db_path)
+        self.depth = 0
+        self.closed = False
+
+
+def _start_borrow(conn: ContactsConnection) -> None:
+    """Début d'un emprunt : data_version sera relu à la prochaine lecture en cache."""
+    conn.borrowed = True
+    conn.data_version_checked = False
+
+
+class ConnectionPool:
+    """
+    Pool de connexions SQLite réutilisables.
+
+    Chaque thread dispose de sa propre connexion par fichier de base ;
+    les emprunts imbriqués dans un même thread partagent la même connexion.
+    Au plus max_size connexions inactives sont conservées, les plus
+    anciennes sont fermées au-delà.
+    """
+
+    def __init__(self, max_size: int = DEFAULT_POOL_SIZE) -> None:
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._lru: "OrderedDict[int, _PooledConnection]" = OrderedDict()
+
+    def _thread_entries(self) -> Dict[str, _PooledConnection]:
+        entries = getattr(self._local, "entries", None)
+        if entries is None:
+            entries = self._local.entries = {}
+        return entries
+
+    def _checkout(self, db_path: Optional[str]) -> _PooledConnection:
+        path = _resolve_db_path(db_path)
+        entries = self._thread_entries()
+        entry = entries.get(path)
+        if entry is not None:
+            with self._lock:
+                reusable = entry.depth > 0 or (
+                    entry.identity == _file_identity(path) and entry.conn.profile == _profile_name()
+                )
+                if not entry.closed and reusable:
+                    entry.depth += 1
+                    self._lru.move_to_end(id(entry))
+                    if entry.depth == 1:
+                        _start_borrow(entry.conn)
+                    return entry
+                self._discard(entry)
+            del entries[path]
+
+        entry = _PooledConnection(_open_connection(path, check_same_thread=False), path)
+        entry.depth = 1
+        _start_borrow(entry.conn)
+        with self._lock:
+            self._lru[id(entry)] = entry
+            self._evict()
+        entries[path] = entry
+        return entry
+
+    def _checkin(self, entry: _PooledConnection, failed: bool) -> None:
+        if entry.depth == 1:
+            if failed:
+                entry.conn.rollback()
+            elif entry.conn.in_transaction:
+                entry.conn.commit()
+            _sync_cache(entry.conn)
+            entry.conn.borrowed = False
+        with self._lock:
+            entry.depth -= 1
+            self._evict()
+
+    def _discard(self, entry: _PooledConnection) -> None:
+        """Ferme une connexion et la retire du pool (verrou déjà pris)."""
+        self._lru.pop(id(entry), None)
+        if not entry.closed:
+            entry.closed = True
+            entry.conn.close()
+
+    def _evict(self) -> None:
+        """Ferme les connexions inactives les plus anciennes (verrou déjà pris)."""
+        excess = len(self._lru) - self.max_size
+        if excess <= 0:
+            return
+        for entry in [e for e in self._lru.values() if e.depth == 0][:excess]:
+            self._discard(entry)
+
+    @contextmanager
+    def connection(self, db_path: Optional[str] = None) -> Iterator[sqlite3.Connection]:
+        """
+        Emprunte une connexion du pool pour la durée du bloc with.
+
+        En sortie du bloc le plus externe, la transaction en cours est
+        validée, ou annulée si une exception a été levée.
+        """
+        entry = self._checkout(db_path)
+        failed = False
+        try:
+            yield entry.conn
+        except BaseException:
+            failed = True
+            raise
+        finally:
+            self._checkin(entry, failed)
+
+    def close_all(self) -> None:
+        """Ferme toutes les connexions inactives du pool."""
+        with self._lock:
+            for entry in [e for e in self._lru.values() if e.depth == 0]:
+                self._discard(entry)
+
+
+_pool = ConnectionPool()
+
+
+def connection(db_path: Optional[str] = None):
+    """
+    Emprunte une connexion au pool partagé du processus.
+
+    Exemple :
+        with database.connection() as conn:
+            database.list_contacts(conn)
+    """
+    return _pool.connection(db_path)
+
+
+def close_pool() -> None:
+    """Ferme les connexions inactives du pool partagé."""
+    _pool.close_all()
+
+
+# Profondeur de transaction des connexions sqlite3 ordinaires, qui
+# n'acceptent pas d'attribut : l'entrée disparaît à la sortie du bloc le
+# plus externe.
+_plain_transaction_depths: Dict[int, int] = {}
+
+
+def _transaction_depth(conn: sqlite3.Connection) -> int:
+    if isinstance(conn, ContactsConnection):
+        return conn.transaction_depth
+    return _plain_transaction_depths.get(id(conn), 0)
+
+
+def _set_transaction_depth(conn: sqlite3.Connection, depth: int) -> None:
+    if isinstance(conn, ContactsConnection):
+        conn.transaction_depth = depth
+    elif depth:
+        _plain_transaction_depths[id(conn)] = depth
+    else:
+        _plain_transaction_depths.pop(id(conn), None)
+
+
+@contextmanager
+def transaction(conn: sqlite3.Connection) -> Iterator[sqlite3.Connection]:
+    """
+    Regroupe toutes les écritures du bloc dans une seule transaction.
+
+    Les fonctions d'écriture du module ne valident plus individuellement
+    tant que le bloc est ouvert : un seul commit est fait à la sortie, ou
+    un rollback si une exception est levée. Les blocs imbriqués
+    rejoignent la transaction la plus externe.
+    """
+    depth = _transaction_depth(conn)
+    if depth == 0:
+        if conn.in_transaction:
+            conn.commit()
+        conn.execute("BEGIN")
+    _set_transaction_depth(conn, depth + 1)
+    try:
+        yield conn
+    except BaseException:
+        _set_transaction_depth(conn, depth)
+        if depth == 0:
+            conn.rollback()
+            _sync_cache(conn)
+        raise
+    _set_transaction_depth(conn, depth)
+    if depth == 0:
+        conn.commit()
+        _sync_cache(conn)
+
+
+def _commit(conn: sqlite3.Connection) -> None:
+    """
+    Valide, sauf à l'intérieur d'un bloc transaction(), puis vide le cache
+    de résultats si des lignes ont été modifiées.
+    """
+    if not _transaction_depth(conn):
+        conn.commit()
+        _sync_cache(conn)
+
+
+def _create_contacts_table(conn: sqlite3.Connection) -> None:
+    """Crée la table contacts (schéma d'origine)."""
+    conn.execute(
         """
         CREATE TABLE IF NOT EXISTS contacts (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -44,56 +606,352 @@ def _init_schema(conn: sqlite3.Connection) -> None:
         )
         """
     )
-    conn.commit()
 
 
-def create_contact(conn: sqlite3.Connection, name: str, email: str, phone: str = "", notes: str = "") -> int:
+def _create_lookup_indexes(conn: sqlite3.Connection) -> None:
+    """
+    Index NOCASE sur name et email : égalité insensible à la casse
+    (get_contacts_by_email) et recherche par préfixe (mode="prefix") sans
+    parcourir toute la table.
     """
-    Crée un contact.
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_contacts_name ON contacts (name COLLATE NOCASE)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_contacts_email ON contacts (email COLLATE NOCASE)")
+
 
-    VULNÉRABILITÉ : utilisation de f-strings / formatage de chaînes
-    sans paramètres préparés.
+def _create_email_key_index(conn: sqlite3.Connection) -> None:
     """
-    cursor = conn.cursor()
+    Index (non unique) sur l'email normalisé, utilisé par l'upsert par
+    email. Remplace l'index unique de même nom que créaient les versions
+    précédentes à la première utilisation : il faisait échouer toute
+    création d'un contact dont l'email existait déjà.
+    """
+    conn.execute("DROP INDEX IF EXISTS idx_contacts_email_key")
+    conn.execute(_SQL_CREATE_EMAIL_INDEX)
+
+
+def _init_change_tracking(conn: sqlite3.Connection) -> None:
+    """
+    Crée le journal des modifications utilisé par les sauvegardes
+    incrémentales.
+
+    contact_changes garde, pour chaque id créé, modifié ou supprimé, le
+    numéro de séquence de sa dernière modification ; des triggers le
+    tiennent à jour pour toutes les écritures sur contacts (sans OR REPLACE,
+    que la clause ON CONFLICT d'un upsert remplacerait). backups
+    retient le numéro de séquence couvert par chaque sauvegarde.
+
+    Les requêtes sont exécutées une à une (et non par executescript, qui
+    valide la transaction en cours) pour rester dans celle de migrate().
+    """
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS contact_changes (
+            contact_id INTEGER PRIMARY KEY,
+            seq INTEGER NOT NULL
+        )
+        """
+    )
+    conn.execute("CREATE INDEX IF NOT EXISTS contact_changes_seq ON contact_changes(seq)")
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS backups (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            seq INTEGER NOT NULL,
+            kind TEXT NOT NULL,
+            created_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+        )
+        """
+    )
+    for event, row in (("INSERT", "new"), ("UPDATE", "new"), ("DELETE", "old")):
+        conn.execute(
+            f"""
+            CREATE TRIGGER IF NOT EXISTS contacts_track_{event.lower()} AFTER {event} ON contacts BEGIN
+                UPDATE contact_changes SET seq = (SELECT MAX(seq) + 1 FROM contact_changes)
+                WHERE contact_id = {row}.id;
+                INSERT INTO contact_changes(contact_id, seq)
+                SELECT {row}.id, (SELECT COALESCE(MAX(seq), 0) + 1 FROM contact_changes)
+                WHERE NOT EXISTS (SELECT 1 FROM contact_changes WHERE contact_id = {row}.id);
+            END
+            """
+        )
 
-   
-    safe_name = name.replace("'", "''")
-    safe_email = email.replace("'", "''")
-    safe_phone = phone.replace("'", "''")
-    safe_notes = notes.replace("'", "''")
 
-    query = (
-        f"INSERT INTO contacts (name, email, phone, notes) "
-        f"VALUES ('{safe_name}', '{safe_email}', '{safe_phone}', '{safe_notes}')"
+def _init_fts(conn: sqlite3.Connection) -> None:
+    """
+    Crée la table virtuelle contacts_fts (FTS5, contenu externe) et les
+    triggers qui la synchronisent avec contacts.
+
+    Sans FTS5 dans la bibliothèque SQLite, rien n'est créé et la recherche
+    plein texte se rabat sur LIKE.
+    """
+    if _has_fts(conn):
+        return
+    cursor = conn.cursor()
+    try:
+        cursor.execute(
+            "CREATE VIRTUAL TABLE contacts_fts USING fts5("
+            "name, email, notes, content='contacts', content_rowid='id')"
+        )
+    except sqlite3.OperationalError:
+        return
+    cursor.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS contacts_fts_insert AFTER INSERT ON contacts BEGIN
+            INSERT INTO contacts_fts(rowid, name, email, notes)
+            VALUES (new.id, new.name, new.email, new.notes);
+        END
+        """
     )
-    cursor.execute(query)
-    conn.commit()
+    cursor.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS contacts_fts_delete AFTER DELETE ON contacts BEGIN
+            INSERT INTO contacts_fts(contacts_fts, rowid, name, email, notes)
+            VALUES ('delete', old.id, old.name, old.email, old.notes);
+        END
+        """
+    )
+    cursor.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS contacts_fts_update AFTER UPDATE OF name, email, notes ON contacts
+        WHEN old.name IS NOT new.name OR old.email IS NOT new.email OR old.notes IS NOT new.notes BEGIN
+            INSERT INTO contacts_fts(contacts_fts, rowid, name, email, notes)
+            VALUES ('delete', old.id, old.name, old.email, old.notes);
+            INSERT INTO contacts_fts(rowid, name, email, notes)
+            VALUES (new.id, new.name, new.email, new.notes);
+        END
+        """
+    )
+    cursor.execute("INSERT INTO contacts_fts(contacts_fts) VALUES ('rebuild')")
+
+
+def _has_fts(conn: sqlite3.Connection) -> bool:
+    """Indique si la base possède l'index plein texte contacts_fts."""
+    row = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'contacts_fts'"
+    ).fetchone()
+    return row is not None
+
+
+# Migrations du schéma, dans l'ordre : (version atteinte, description,
+# fonction). Une migration publiée ne change plus ; toute évolution du
+# schéma en ajoute une nouvelle. Les premières utilisent IF NOT EXISTS :
+# les bases créées avant le suivi des versions (user_version = 0) les
+# rejouent sans erreur.
+MIGRATIONS: List[Tuple[int, str, Callable[[sqlite3.Connection], None]]] = [
+    (1, "table contacts", _create_contacts_table),
+    (2, "journal des modifications et sauvegardes", _init_change_tracking),
+    (3, "index plein texte FTS5", _init_fts),
+    (4, "index NOCASE sur name et email", _create_lookup_indexes),
+    (5, "index non unique sur l'email normalisé", _create_email_key_index),
+]
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+
+def schema_version(conn: sqlite3.Connection) -> int:
+    """Version du schéma de la base (PRAGMA user_version)."""
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def migrate(conn: sqlite3.Connection) -> int:
+    """
+    Applique les migrations en attente et retourne leur nombre.
+
+    Une base à jour ne coûte que la lecture de user_version. Sinon les
+    migrations s'exécutent dans une seule transaction BEGIN IMMEDIATE,
+    version comprise : un autre processus qui migre la même base attend
+    le verrou puis constate qu'il n'y a plus rien à faire.
+    """
+    if schema_version(conn) >= SCHEMA_VERSION:
+        return 0
+    with _schema_lock:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            current = schema_version(conn)
+            pending = [m for m in MIGRATIONS if m[0] > current]
+            for version, _description, apply in pending:
+                apply(conn)
+                conn.execute(f"PRAGMA user_version = {version:d}")
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+    return len(pending)
+
+
+def create_contact(conn: sqlite3.Connection, name: str, email: str, phone: str = "", notes: str = "") -> int:
+    """
+    Crée un contact et retourne son id.
+    """
+    cursor = conn.cursor()
+    cursor.execute(_SQL_INSERT, (name, email, phone, notes))
+    _commit(conn)
     return cursor.lastrowid
 
 
+def _contact_params(contact: ContactInput) -> Tuple[Any, Any, Any, Any]:
+    """
+    Convertit un contact (dict ou tuple name, email, phone, notes)
+    en paramètres d'insertion.
+    """
+    if isinstance(contact, Mapping):
+        return (
+            contact.get("name", ""),
+            contact.get("email", ""),
+            contact.get("phone", ""),
+            contact.get("notes", ""),
+        )
+    name, email, phone, notes = contact
+    return (name, email, phone, notes)
+
+
+def create_contacts(
+    conn: sqlite3.Connection,
+    contacts: Iterable[ContactInput],
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> int:
+    """
+    Insère des contacts en masse et retourne le nombre de lignes insérées.
+
+    Les contacts sont insérés par lots de batch_size avec executemany,
+    chaque lot dans sa propre transaction : un seul commit par lot au
+    lieu d'un par contact (aucun dans un bloc transaction() englobant).
+    L'itérable est consommé au fur et à mesure.
+    """
+    if batch_size < 1:
+        raise ValueError("batch_size doit être strictement positif")
+
+    iterator = iter(contacts)
+    count = 0
+    while True:
+        batch = [_contact_params(c) for c in islice(iterator, batch_size)]
+        if not batch:
+            break
+        with transaction(conn):
+            conn.executemany(_SQL_INSERT, batch)
+        count += len(batch)
+    return count
+
+
 def get_contact(conn: sqlite3.Connection, contact_id: int) -> Optional[Dict[str, Any]]:
     """
-    Récupère un contact par son id.
+    Récupère un contact par son id (résultat mis en cache).
+    """
+    def load() -> Optional[Dict[str, Any]]:
+        row = conn.execute(_SQL_SELECT_BY_ID, (contact_id,)).fetchone()
+        return None if row is None else dict(row)
+
+    contact = _cached(conn, ("get", contact_id), load)
+    return None if contact is None else dict(contact)
 
-    VULNÉRABILITÉ : interpolation directe de l'id dans la requête.
+
+def get_contacts_by_email(conn: sqlite3.Connection, email: str) -> List[Dict[str, Any]]:
     """
-    cursor = conn.cursor()
-    query = f"SELECT id, name, email, phone, notes FROM contacts WHERE id = {contact_id}"
-    cursor.execute(query)
-    row = cursor.fetchone()
-    if row is None:
-        return None
-    return dict(row)
+    Contacts dont l'email vaut email, sans tenir compte de la casse
+    (index idx_contacts_email), triés par id.
+    """
+    return [dict(r) for r in conn.execute(_SQL_SELECT_BY_EMAIL, (email,))]
 
 
-def list_contacts(conn: sqlite3.Connection) -> List[Dict[str, Any]]:
+def _rows_cursor(conn: sqlite3.Connection, row_format: str) -> sqlite3.Cursor:
     """
-    Liste tous les contacts.
+    Curseur dont les lignes sont au format row_format : sqlite3.Row (à
+    convertir par _to_dicts) pour "dict", tuple brut pour "tuple", Contact
+    pour "contact".
     """
+    if row_format not in ROW_FORMATS:
+        raise ValueError(f"Format de ligne inconnu : {row_format}")
     cursor = conn.cursor()
-    cursor.execute("SELECT id, name, email, phone, notes FROM contacts ORDER BY id ASC")
-    rows = cursor.fetchall()
-    return [dict(r) for r in rows]
+    if row_format == ROW_FORMAT_TUPLE:
+        cursor.row_factory = None
+    elif row_format == ROW_FORMAT_CONTACT:
+        cursor.row_factory = _contact_row
+    return cursor
+
+
+def _fetch_contacts(
+    conn: sqlite3.Connection,
+    query: str,
+    params: Sequence[Any],
+    row_format: str,
+) -> List[Any]:
+    """Exécute query et retourne toutes ses lignes au format row_format."""
+    rows = _rows_cursor(conn, row_format).execute(query, params).fetchall()
+    if row_format == ROW_FORMAT_DICT:
+        return [dict(r) for r in rows]
+    return rows
+
+
+def list_contacts(
+    conn: sqlite3.Connection,
+    after_id: Optional[int] = None,
+    limit: Optional[int] = None,
+    row_format: str = ROW_FORMAT_DICT,
+) -> List[Any]:
+    """
+    Liste les contacts par ordre d'id.
+
+    Pagination par clé (keyset) : after_id ne retourne que les contacts
+    d'id strictement supérieur, limit borne le nombre de lignes. La page
+    suivante s'obtient avec after_id = id du dernier contact reçu, sans
+    relire les pages précédentes.
+
+    row_format choisit le type des contacts retournés : "dict" (défaut),
+    "tuple" (champs dans l'ordre de CONTACT_FIELDS) ou "contact" (Contact).
+    Les deux derniers évitent un sqlite3.Row et un dict par ligne.
+    """
+    query, params = _keyset_clause(_SQL_SELECT, "id", [], after_id, limit)
+    return _fetch_contacts(conn, query, params, row_format)
+
+
+def _keyset_clause(
+    select: str,
+    id_column: str,
+    conditions: List[str],
+    after_id: Optional[int],
+    limit: Optional[int],
+) -> Tuple[str, List[Any]]:
+    """
+    Complète une requête SELECT avec la condition de pagination, le tri
+    par id et la limite.
+    """
+    params: List[Any] = []
+    if after_id is not None:
+        conditions = conditions + [f"{id_column} > ?"]
+        params.append(after_id)
+    query = select
+    if conditions:
+        query += " WHERE " + " AND ".join(f"({c})" for c in conditions)
+    query += f" ORDER BY {id_column} ASC"
+    if limit is not None:
+        query += " LIMIT ?"
+        params.append(limit)
+    return query, params
+
+
+def iter_contacts(
+    conn: sqlite3.Connection,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    row_format: str = ROW_FORMAT_DICT,
+) -> Iterator[Any]:
+    """
+    Itère sur tous les contacts par ordre d'id, au format row_format (voir
+    list_contacts).
+
+    Les lignes sont lues par paquets de chunk_size avec fetchmany : seule
+    une page de résultats est en mémoire à la fois. La connexion doit
+    rester ouverte tant que l'itération n'est pas terminée.
+    """
+    cursor = _rows_cursor(conn, row_format)
+    cursor.execute(f"{_SQL_SELECT} ORDER BY id ASC")
+    while True:
+        rows = cursor.fetchmany(chunk_size)
+        if not rows:
+            break
+        if row_format == ROW_FORMAT_DICT:
+            for r in rows:
+                yield dict(r)
+        else:
+            yield from rows
 
 
 def update_contact(
@@ -107,70 +965,389 @@ def update_contact(
     """
     Met à jour un contact.
 
-    VULNÉRABILITÉ : construction de la requête au moyen de concaténations
-    de chaînes non sécurisées.
+    Les champs laissés à None sont conservés : une seule requête fixe
+    (COALESCE) sert pour toutes les combinaisons de champs.
     """
-    cursor = conn.cursor()
-    updates = []
-    if name is not None:
-        updates.append(f"name = '{name}'")
-    if email is not None:
-        updates.append(f"email = '{email}'")
-    if phone is not None:
-        updates.append(f"phone = '{phone}'")
-    if notes is not None:
-        updates.append(f"notes = '{notes}'")
-
-    if not updates:
+    if name is None and email is None and phone is None and notes is None:
         return
 
-    set_clause = ", ".join(updates)
-    query = f"UPDATE contacts SET {set_clause} WHERE id = {contact_id}"
-    cursor.execute(query)
-    conn.commit()
+    cursor = conn.cursor()
+    cursor.execute(_SQL_UPDATE, (name, email, phone, notes, contact_id))
+    _commit(conn)
 
 
 def delete_contact(conn: sqlite3.Connection, contact_id: int) -> None:
     """
     Supprime un contact.
-
-    VULNÉRABILITÉ : interpolation directe de l'id.
     """
     cursor = conn.cursor()
-    query = f"DELETE FROM contacts WHERE id = {contact_id}"
-    cursor.execute(query)
-    conn.commit()
+    cursor.execute(_SQL_DELETE, (contact_id,))
+    _commit(conn)
 
 
-def search_contacts(conn: sqlite3.Connection, query_string: str) -> List[Dict[str, Any]]:
+def _update_params(change: Mapping[str, Any]) -> Optional[Tuple[Any, ...]]:
+    """
+    Paramètres de _SQL_UPDATE pour un changement {"id": ..., champ: valeur},
+    ou None si aucun champ n'est à modifier.
+    """
+    if "id" not in change:
+        raise ValueError("Chaque modification doit contenir l'id du contact")
+    values = tuple(change.get(field) for field in CONTACT_FIELDS[1:])
+    if all(v is None for v in values):
+        return None
+    return values + (change["id"],)
+
+
+def update_contacts(
+    conn: sqlite3.Connection,
+    changes: Iterable[Mapping[str, Any]],
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> int:
+    """
+    Met à jour des contacts en masse et retourne le nombre de lignes
+    modifiées.
+
+    Chaque modification est un dict {"id": ..., "name": ..., ...} dont les
+    champs absents ou à None sont conservés, comme pour update_contact.
+    Les modifications sont appliquées par lots de batch_size avec
+    executemany, toutes dans une seule transaction : un seul commit, et
+    rien n'est modifié si l'une d'elles échoue. Les ids inexistants sont
+    ignorés (non comptés).
+    """
+    if batch_size < 1:
+        raise ValueError("batch_size doit être strictement positif")
+
+    iterator = iter(changes)
+    count = 0
+    with transaction(conn):
+        while True:
+            batch = [_update_params(c) for c in islice(iterator, batch_size)]
+            if not batch:
+                break
+            batch = [params for params in batch if params is not None]
+            if batch:
+                count += conn.executemany(_SQL_UPDATE, batch).rowcount
+    return count
+
+
+def delete_contacts(
+    conn: sqlite3.Connection,
+    ids_or_predicate: Union[Iterable[int], Callable[[Contact], bool]],
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> int:
+    """
+    Supprime des contacts en masse et retourne le nombre de lignes
+    supprimées.
+
+    ids_or_predicate est soit un itérable d'ids, soit une fonction appelée
+    sur chaque contact (Contact) qui retourne True pour ceux à supprimer.
+    Les ids visés sont d'abord rassemblés par lots dans une table
+    temporaire, puis supprimés par une seule requête ensembliste, le tout
+    dans une seule transaction.
+    """
+    if batch_size < 1:
+        raise ValueError("batch_size doit être strictement positif")
+
+    with transaction(conn):
+        conn.execute(_SQL_CREATE_BULK_IDS)
+        conn.execute("DELETE FROM temp.bulk_ids")
+        if callable(ids_or_predicate):
+            predicate = ids_or_predicate
+            # Les ids sont lus en entier avant d'écrire dans bulk_ids : pas
+            # d'écriture pendant la lecture de contacts.
+            ids: Iterable[int] = [c.id for c in iter_contacts(conn, row_format=ROW_FORMAT_CONTACT) if predicate(c)]
+        else:
+            ids = ids_or_predicate
+        iterator = iter(ids)
+        while True:
+            batch = [(contact_id,) for contact_id in islice(iterator, batch_size)]
+            if not batch:
+                break
+            conn.executemany(_SQL_INSERT_BULK_ID, batch)
+        count = conn.execute(_SQL_DELETE_BULK_IDS).rowcount
+        conn.execute("DELETE FROM temp.bulk_ids")
+    return count
+
+
+def search_contacts(
+    conn: sqlite3.Connection,
+    query_string: str,
+    mode: str = SEARCH_MODE_LIKE,
+    after_id: Optional[int] = None,
+    limit: Optional[int] = None,
+    row_format: str = ROW_FORMAT_DICT,
+) -> List[Any]:
     """
     Recherche de contacts sur les champs name, email et notes.
 
-    VULNÉRABILITÉ SQLi : le terme de recherche est injecté directement dans
-    la requête sans échappement ni paramètres préparés.
-    Exemple d'abus : "' OR 1=1 --"
+    mode="like" (défaut) cherche la sous-chaîne dans chaque champ, triée
+    par id. mode="fts" interroge l'index FTS5 : chaque mot est cherché
+    comme préfixe de mot et les résultats sont triés par pertinence
+    (bm25). Sans index FTS5, mode="fts" se rabat sur LIKE. mode="prefix"
+    cherche les contacts dont name ou email commence par query_string
+    (sans tenir compte de la casse), via les index idx_contacts_name et
+    idx_contacts_email.
+
+    after_id et limit paginent les résultats comme list_contacts ; dans ce
+    cas les résultats FTS sont eux aussi triés par id. row_format choisit
+    le type des contacts retournés (voir list_contacts). Les résultats
+    sont mis en cache.
     """
-    cursor = conn.cursor()
-    query = (
-        "SELECT id, name, email, phone, notes FROM contacts "
-        f"WHERE name LIKE '%{query_string}%' "
-        f"   OR email LIKE '%{query_string}%' "
-        f"   OR notes LIKE '%{query_string}%' "
-        "ORDER BY id ASC"
+    if mode not in SEARCH_MODES:
+        raise ValueError(f"Mode de recherche inconnu : {mode}")
+
+    contacts = _cached(
+        conn,
+        ("search", query_string, mode, after_id, limit, row_format),
+        lambda: tuple(_search_contacts(conn, query_string, mode, after_id, limit, row_format)),
+    )
+    if row_format == ROW_FORMAT_DICT:
+        return [dict(c) for c in contacts]
+    # Tuples et Contact sont immuables : pas de copie à faire.
+    return list(contacts)
+
+
+def _search_contacts(
+    conn: sqlite3.Connection,
+    query_string: str,
+    mode: str,
+    after_id: Optional[int],
+    limit: Optional[int],
+    row_format: str = ROW_FORMAT_DICT,
+) -> List[Any]:
+    """Exécute la recherche de search_contacts, sans cache."""
+    if mode == SEARCH_MODE_FTS:
+        match = _fts_match_expression(query_string)
+        if match and _has_fts(conn):
+            return _search_contacts_fts(conn, match, after_id, limit, row_format)
+    elif mode == SEARCH_MODE_PREFIX:
+        pattern = _like_escape(query_string) + "%"
+        query, params = _keyset_clause(_SQL_SELECT, "id", [_SQL_PREFIX], after_id, limit)
+        return _fetch_contacts(conn, query, [pattern, pattern] + params, row_format)
+
+    query, params = _keyset_clause(_SQL_SELECT, "id", [_SQL_LIKE], after_id, limit)
+    return _fetch_contacts(conn, query, [query_string] * 3 + params, row_format)
+
+
+def _like_escape(value: str) -> str:
+    """Protège les caractères spéciaux de LIKE (échappement par \\)."""
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _fts_match_expression(query_string: str) -> str:
+    """
+    Construit une expression MATCH FTS5 : chaque mot devient une chaîne
+    entre guillemets recherchée comme préfixe ("ali"* AND "par"*).
+    """
+    terms = []
+    for word in query_string.split():
+        terms.append('"' + word.replace('"', '""') + '"*')
+    return " AND ".join(terms)
+
+
+def _search_contacts_fts(
+    conn: sqlite3.Connection,
+    match: str,
+    after_id: Optional[int] = None,
+    limit: Optional[int] = None,
+    row_format: str = ROW_FORMAT_DICT,
+) -> List[Any]:
+    """
+    Recherche via l'index FTS5, résultats triés par bm25 (ou par id en
+    cas de pagination).
+    """
+    select = (
+        "SELECT c.id, c.name, c.email, c.phone, c.notes "
+        "FROM contacts_fts JOIN contacts AS c ON c.id = contacts_fts.rowid"
     )
-    cursor.execute(query)
-    rows = cursor.fetchall()
-    return [dict(r) for r in rows]
+    if after_id is None and limit is None:
+        return _fetch_contacts(
+            conn,
+            select + " WHERE contacts_fts MATCH ? ORDER BY bm25(contacts_fts), c.id",
+            (match,),
+            row_format,
+        )
+    query, params = _keyset_clause(select, "c.id", ["contacts_fts MATCH ?"], after_id, limit)
+    return _fetch_contacts(conn, query, [match] + params, row_format)
+
+
+def delete_all_contacts(conn: sqlite3.Connection) -> int:
+    """Supprime tous les contacts et retourne le nombre de lignes supprimées."""
+    cursor = conn.cursor()
+    cursor.execute("DELETE FROM contacts")
+    _commit(conn)
+    return cursor.rowcount
+
+
+def count_contacts(conn: sqlite3.Connection) -> int:
+    """Nombre de contacts dans la base."""
+    return conn.execute("SELECT COUNT(*) FROM contacts").fetchone()[0]
+
+
+def current_change_seq(conn: sqlite3.Connection) -> int:
+    """Numéro de séquence de la dernière modification (0 si aucune)."""
+    row = conn.execute("SELECT COALESCE(MAX(seq), 0) FROM contact_changes").fetchone()
+    return row[0]
+
+
+def iter_changes(
+    conn: sqlite3.Connection,
+    since_seq: int,
+    deleted: bool = False,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Iterator[Any]:
+    """
+    Itère sur les contacts modifiés après since_seq.
+
+    Avec deleted=False, retourne l'état actuel des contacts créés ou
+    modifiés ; avec deleted=True, les ids des contacts supprimés depuis.
+    """
+    cursor = conn.cursor()
+    if deleted:
+        cursor.execute(
+            "SELECT ch.contact_id FROM contact_changes AS ch "
+            "LEFT JOIN contacts AS c ON c.id = ch.contact_id "
+            "WHERE ch.seq > ? AND c.id IS NULL ORDER BY ch.seq",
+            (since_seq,),
+        )
+    else:
+        cursor.execute(
+            "SELECT c.id, c.name, c.email, c.phone, c.notes FROM contact_changes AS ch "
+            "JOIN contacts AS c ON c.id = ch.contact_id "
+            "WHERE ch.seq > ? ORDER BY ch.seq",
+            (since_seq,),
+        )
+    while True:
+        rows = cursor.fetchmany(chunk_size)
+        if not rows:
+            break
+        for r in rows:
+            yield r[0] if deleted else dict(r)
+
+
+def upsert_contacts(
+    conn: sqlite3.Connection,
+    contacts: Iterable[Mapping[str, Any]],
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    key: str = UPSERT_KEY_ID,
+) -> int:
+    """
+    Insère ou met à jour des contacts sans jamais les dupliquer.
+
+    Avec key="id", un vrai upsert INSERT ... ON CONFLICT(id) conserve
+    l'id d'origine : sert à rejouer une sauvegarde (un contact sans id, ou
+    dont l'id est vide comme une colonne CSV non remplie, reçoit un nouvel
+    id).
+
+    Avec key="email", ce n'est pas un ON CONFLICT : l'email n'étant pas
+    unique, chaque contact est cherché par son email normalisé (casse et
+    espaces ignorés, index non unique idx_contacts_email_key) puis met à
+    jour le plus ancien contact qui le porte, ou est inséré. Une recherche
+    par ligne, donc, mais qui fonctionne même si la base contient déjà
+    des doublons ; les contacts sans email sont simplement insérés.
+
+    Une ligne déjà identique n'est pas réécrite : rejouer deux fois le
+    même import ne modifie rien, pas même le journal des changements.
+    Retourne le nombre de contacts traités.
+    """
+    if batch_size < 1:
+        raise ValueError("batch_size doit être strictement positif")
+    if key == UPSERT_KEY_ID:
+        write: Callable[[sqlite3.Connection, List[tuple]], None] = _upsert_batch_by_id
+        params: Callable[[Any], tuple] = lambda c: (_upsert_id(c.get("id")),) + _contact_params(c)
+    elif key == UPSERT_KEY_EMAIL:
+        write = _upsert_batch_by_email
+        params = _contact_params
+    else:
+        raise ValueError(f"Clé d'upsert inconnue : {key}")
+
+    iterator = iter(contacts)
+    count = 0
+    while True:
+        batch = [params(c) for c in islice(iterator, batch_size)]
+        if not batch:
+            break
+        with transaction(conn):
+            write(conn, batch)
+        count += len(batch)
+    return count
+
+
+def _upsert_id(value: Any) -> Any:
+    """Id à upserter : None (nouvel id) pour un id absent ou vide."""
+    if value is None or (isinstance(value, str) and not value.strip()):
+        return None
+    return value
+
+
+def _upsert_batch_by_id(conn: sqlite3.Connection, batch: List[tuple]) -> None:
+    conn.executemany(_SQL_UPSERT_BY_ID, batch)
+
+
+def _upsert_batch_by_email(conn: sqlite3.Connection, batch: List[tuple]) -> None:
+    """
+    Sans contrainte d'unicité, pas d'ON CONFLICT : chaque contact cherche
+    son email par l'index idx_contacts_email_key. Les lignes insérées plus
+    tôt dans le lot sont visibles (même transaction), un email répété
+    dans le fichier n'est donc inséré qu'une fois.
+    """
+    cursor = conn.cursor()
+    for name, email, phone, notes in batch:
+        row = cursor.execute(_SQL_FIND_BY_EMAIL, (email,)).fetchone() if email else None
+        if row is None:
+            cursor.execute(_SQL_INSERT, (name, email, phone, notes))
+        elif (row[1], row[2], row[3]) != (name, phone, notes):
+            cursor.execute(_SQL_UPDATE_BY_EMAIL, (name, phone, notes, row[0]))
+
+
+def last_backup_seq(conn: sqlite3.Connection) -> Optional[int]:
+    """Séquence couverte par la dernière sauvegarde, None s'il n'y en a pas."""
+    row = conn.execute("SELECT seq FROM backups ORDER BY id DESC LIMIT 1").fetchone()
+    return None if row is None else row[0]
+
+
+def record_backup(conn: sqlite3.Connection, seq: int, kind: str) -> None:
+    """Enregistre qu'une sauvegarde (kind "full" ou "delta") couvre seq."""
+    conn.execute("INSERT INTO backups (seq, kind) VALUES (?, ?)", (seq, kind))
+    _commit(conn)
 
 
 __all__ = [
+    "PROFILES",
+    "Contact",
+    "ContactsConnection",
+    "ConnectionPool",
+    "active_profile",
+    "profile_settings",
     "get_connection",
+    "add_connection_hook",
+    "remove_connection_hook",
+    "connection",
+    "close_pool",
+    "transaction",
     "create_contact",
+    "create_contacts",
     "get_contact",
+    "get_contacts_by_email",
     "list_contacts",
+    "iter_contacts",
     "update_contact",
     "delete_contact",
+    "update_contacts",
+    "delete_contacts",
     "search_contacts",
+    "configure_cache",
+    "cache_stats",
+    "invalidate_cache",
+    "delete_all_contacts",
+    "count_contacts",
+    "current_change_seq",
+    "iter_changes",
+    "upsert_contacts",
+    "schema_version",
+    "migrate",
+    "last_backup_seq",
+    "record_backup",
 ]
 
 
@@ -0,0 +1,347 @@
+"""
+Détection et fusion des contacts en double.
+
+Chaque contact est normalisé (email en minuscules sans alias +etiquette,
+téléphone réduit à ses chiffres au format national, nom sans accents ni
+ponctuation et aux mots triés) puis rangé sous des clés de blocage :
+seuls les contacts qui partagent une clé sont comparés, ce qui évite
+les n² comparaisons.
+
+- même email ou même téléphone normalisé : doublons ;
+- même nom normalisé : doublons si les emails et téléphones de leurs
+  grappes ne se contredisent pas (au plus un email et un téléphone
+  distincts une fois réunies). Un nom
+  porté par plus de max_block_size contacts est trop courant pour
+  conclure : son bloc est ignoré.
+
+Les paires retenues sont regroupées en grappes par union-find.
+merge_duplicates fusionne ensuite chaque grappe dans son contact le plus
+ancien, en une seule transaction ; les emails et téléphones qu'il ne
+peut garder sont recopiés dans ses notes.
+
+Exemple :
+
+    with database.connection() as conn:
+        clusters = dedup.find_duplicates(conn)
+        dedup.merge_duplicates(conn, clusters)
+"""
+
+import re
+import time
+import unicodedata
+from functools import lru_cache
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Sequence, Set, Tuple
+
+from app import database
+
+DEFAULT_MAX_BLOCK_SIZE = 50
+MIN_PHONE_DIGITS = 6
+NOTES_SEPARATOR = " | "
+
+_NON_DIGITS = re.compile(r"\D+")
+_NON_WORDS = re.compile(r"[^\w]+")
+
+
+def normalize_email(email: Optional[str]) -> str:
+    """Email en minuscules, sans espaces ni alias (alice+news@x -> alice@x)."""
+    if not email:
+        return ""
+    email = email.strip().lower()
+    local, at, domain = email.partition("@")
+    if not at:
+        return email
+    return local.split("+", 1)[0] + "@" + domain
+
+
+def normalize_phone(phone: Optional[str]) -> str:
+    """
+    Chiffres du numéro, indicatif français (+33, 0033) ramené au 0
+    national ; chaîne vide si le numéro est trop court pour identifier
+    quelqu'un.
+    """
+    if not phone:
+        return ""
+    digits = _NON_DIGITS.sub("", phone)
+    if digits.startswith("0033"):
+        digits = "0" + digits[4:]
+    elif digits.startswith("33") and len(digits) == 11:
+        digits = "0" + digits[2:]
+    return digits if len(digits) >= MIN_PHONE_DIGITS else ""
+
+
+@lru_cache(maxsize=65536)
+def normalize_name(name: Optional[str]) -> str:
+    """Nom sans accents, casse ni ponctuation, mots triés ("Martin, Léa" -> "lea martin")."""
+    if not name:
+        return ""
+    decomposed = unicodedata.normalize("NFKD", name)
+    ascii_name = "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return " ".join(sorted(_NON_WORDS.sub(" ", ascii_name.lower()).replace("_", " ").split()))
+
+
+class _UnionFind:
+    """Union-find sur des indices 0..n-1 (compression de chemin par moitié)."""
+
+    __slots__ = ("parent",)
+
+    def __init__(self) -> None:
+        self.parent: List[int] = []
+
+    def add(self) -> int:
+        self.parent.append(len(self.parent))
+        return len(self.parent) - 1
+
+    def find(self, i: int) -> int:
+        parent = self.parent
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    def union(self, i: int, j: int) -> None:
+        root_i, root_j = self.find(i), self.find(j)
+        if root_i != root_j:
+            # La racine reste le plus petit indice, donc le plus petit id.
+            if root_i < root_j:
+                self.parent[root_j] = root_i
+            else:
+                self.parent[root_i] = root_j
+
+
+def _scan(conn: Any) -> Tuple[List[int], List[str], List[str], List[str]]:
+    """Un seul parcours de la table (tuples compacts) : ids et clés normalisées."""
+    ids: List[int] = []
+    emails: List[str] = []
+    phones: List[str] = []
+    names: List[str] = []
+    for contact_id, name, email, phone, _notes in database.iter_contacts(
+        conn, row_format=database.ROW_FORMAT_TUPLE
+    ):
+        ids.append(contact_id)
+        emails.append(normalize_email(email))
+        phones.append(normalize_phone(phone))
+        names.append(normalize_name(name))
+    return ids, emails, phones, names
+
+
+def _union_same_key(uf: _UnionFind, keys: Sequence[str]) -> None:
+    """Unit chaque contact au premier qui porte la même clé non vide."""
+    first: Dict[str, int] = {}
+    for i, key in enumerate(keys):
+        if key:
+            j = first.setdefault(key, i)
+            if j != i:
+                uf.union(j, i)
+
+
+def _keys_by_root(uf: _UnionFind, keys: Sequence[str]) -> Dict[int, FrozenSet[str]]:
+    """Clés non vides de chaque grappe, indexées par sa racine."""
+    found: Dict[int, Set[str]] = {}
+    for i, key in enumerate(keys):
+        if key:
+            found.setdefault(uf.find(i), set()).add(key)
+    return {root: frozenset(values) for root, values in found.items()}
+
+
+def _name_blocks(names: Sequence[str]) -> List[List[int]]:
+    """Indices des contacts qui partagent un nom (blocs d'au moins deux)."""
+    blocks: Dict[str, List[int]] = {}
+    for i, name in enumerate(names):
+        if name:
+            blocks.setdefault(name, []).append(i)
+    return [block for block in blocks.values() if len(block) > 1]
+
+
+def _union_same_name(
+    uf: _UnionFind,
+    blocks: Iterable[List[int]],
+    emails: Dict[int, FrozenSet[str]],
+    phones: Dict[int, FrozenSet[str]],
+    max_block_size: int,
+) -> Tuple[int, int]:
+    """
+    Unit les contacts de même nom dont les grappes ne se contredisent pas.
+
+    La compatibilité est vérifiée entre grappes et non entre contacts :
+    un homonyme sans email ni téléphone ne relie pas deux grappes aux
+    emails (ou téléphones) différents. Retourne (paires comparées, blocs
+    ignorés).
+    """
+    empty: FrozenSet[str] = frozenset()
+    pairs = 0
+    skipped = 0
+    for block in blocks:
+        if len(block) > max_block_size:
+            skipped += 1
+            continue
+        for position, i in enumerate(block):
+            for j in block[position + 1:]:
+                pairs += 1
+                root_i, root_j = uf.find(i), uf.find(j)
+                if root_i == root_j:
+                    continue
+                merged_emails = emails.get(root_i, empty) | emails.get(root_j, empty)
+                merged_phones = phones.get(root_i, empty) | phones.get(root_j, empty)
+                if len(merged_emails) > 1 or len(merged_phones) > 1:
+                    continue
+                uf.union(root_i, root_j)
+                root = uf.find(root_i)
+                emails[root] = merged_emails
+                phones[root] = merged_phones
+    return pairs, skipped
+
+
+def _clusters(uf: _UnionFind, ids: Sequence[int]) -> List[List[int]]:
+    """
+    Grappes d'au moins deux ids. La racine d'une grappe est son plus petit
+    indice et les ids sont lus dans l'ordre : chaque grappe est construite
+    déjà triée.
+    """
+    groups: Dict[int, List[int]] = {}
+    for i in range(len(ids)):
+        root = uf.find(i)
+        if root != i:
+            groups.setdefault(root, [ids[root]]).append(ids[i])
+    return sorted(groups.values(), key=lambda group: group[0])
+
+
+def find_duplicates(
+    conn: Any,
+    max_block_size: int = DEFAULT_MAX_BLOCK_SIZE,
+    stats: Optional[Dict[str, float]] = None,
+) -> List[List[int]]:
+    """
+    Retourne les grappes de contacts en double : listes d'ids triées (au
+    moins deux), dans l'ordre de leur plus petit id.
+
+    Après un seul parcours de la table, les contacts sont unis par email
+    puis par téléphone, enfin par nom si leurs grappes n'ont pas d'emails
+    ni de téléphones contradictoires. Seuls les blocs de noms d'au plus
+    max_block_size contacts sont comparés deux à deux : le coût reste
+    linéaire en nombre de contacts.
+
+    stats, si fourni, reçoit les compteurs (contacts, grappes, doublons,
+    paires comparées, blocs ignorés) et la durée en secondes.
+    """
+    if max_block_size < 2:
+        raise ValueError("max_block_size doit valoir au moins 2")
+    start = time.perf_counter()
+
+    ids, emails, phones, names = _scan(conn)
+    uf = _UnionFind()
+    for _ in ids:
+        uf.add()
+    _union_same_key(uf, emails)
+    _union_same_key(uf, phones)
+    pairs, skipped = _union_same_name(
+        uf, _name_blocks(names), _keys_by_root(uf, emails), _keys_by_root(uf, phones), max_block_size
+    )
+    clusters = _clusters(uf, ids)
+
+    if stats is not None:
+        stats.update({
+            "contacts": len(ids),
+            "clusters": len(clusters),
+            "duplicates": sum(len(c) - 1 for c in clusters),
+            "candidate_pairs": pairs,
+            "skipped_blocks": skipped,
+            "seconds": time.perf_counter() - start,
+        })
+    return clusters
+
+
+def _merged_notes(contacts: Sequence[Dict[str, Any]]) -> List[str]:
+    """Notes distinctes des contacts, dans l'ordre, sans doublon."""
+    notes: List[str] = []
+    for contact in contacts:
+        for note in (contact["notes"] or "").split(NOTES_SEPARATOR):
+            if note and note not in notes:
+                notes.append(note)
+    return notes
+
+
+def _dropped_values(kept: Dict[str, Any], others: Sequence[Dict[str, Any]]) -> List[str]:
+    """
+    Emails et téléphones des autres qui diffèrent de ceux conservés (deux
+    emails reliés par le même téléphone, par exemple), sous forme de notes.
+    """
+    dropped: List[str] = []
+    for field, label, normalize in (
+        ("email", "email", normalize_email),
+        ("phone", "téléphone", normalize_phone),
+    ):
+        kept_key = normalize(kept[field])
+        for contact in others:
+            value = contact[field]
+            if value and normalize(value) != kept_key:
+                dropped.append(f"{label} : {value}")
+    return dropped
+
+
+def _merged_fields(survivor: Dict[str, Any], others: Sequence[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Champs à écrire dans survivor : ses champs vides reprennent la
+    première valeur non vide des autres, les notes distinctes sont mises
+    bout à bout. Un email ou un téléphone des autres qui diffère de celui
+    conservé est gardé dans les notes plutôt que perdu.
+    """
+    changes: Dict[str, Any] = {}
+    for field in ("name", "email", "phone"):
+        if not survivor[field]:
+            value = next((c[field] for c in others if c[field]), None)
+            if value:
+                changes[field] = value
+    notes = _merged_notes((survivor,) + tuple(others))
+    for note in _dropped_values({**survivor, **changes}, others):
+        if note not in notes:
+            notes.append(note)
+    merged_notes = NOTES_SEPARATOR.join(notes)
+    if merged_notes != (survivor["notes"] or ""):
+        changes["notes"] = merged_notes
+    return changes
+
+
+def merge_duplicates(
+    conn: Any,
+    clusters: Iterable[Sequence[int]],
+    stats: Optional[Dict[str, float]] = None,
+) -> int:
+    """
+    Fusionne chaque grappe dans son contact de plus petit id et retourne
+    le nombre de contacts supprimés.
+
+    Le contact conservé complète ses champs vides avec ceux des autres
+    et réunit leurs notes. Toutes les grappes sont fusionnées dans une
+    seule transaction (suppressions puis mises à jour en masse, voir
+    delete_contacts et update_contacts) : une erreur n'en fusionne
+    aucune. Les ids déjà supprimés sont ignorés.
+    """
+    start = time.perf_counter()
+    changes: List[Dict[str, Any]] = []
+    doomed: List[int] = []
+    with database.transaction(conn):
+        for cluster in clusters:
+            contacts = [database.get_contact(conn, contact_id) for contact_id in sorted(cluster)]
+            contacts = [c for c in contacts if c is not None]
+            if len(contacts) < 2:
+                continue
+            survivor, others = contacts[0], contacts[1:]
+            merged = _merged_fields(survivor, others)
+            if merged:
+                merged["id"] = survivor["id"]
+                changes.append(merged)
+            doomed.extend(c["id"] for c in others)
+        deleted = database.delete_contacts(conn, doomed)
+        updated = database.update_contacts(conn, changes)
+    if stats is not None:
+        stats.update({"deleted": deleted, "updated": updated, "seconds": time.perf_counter() - start})
+    return deleted
+
+
+__all__ = [
+    "normalize_email",
+    "normalize_phone",
+    "normalize_name",
+    "find_duplicates",
+    "merge_duplicates",
+]
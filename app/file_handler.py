@@ -1,22 +1,460 @@
 """
 Module de gestion des fichiers pour l'export/import de contacts.
 
+Tous les fichiers sont lus et écrits en flux ; ils sont compressés ou
+décompressés à la volée si leur nom se termine par .gz, .bz2 ou .xz (voir
+open_contacts_file).
+
 Ce module est volontairement vulnérable au Path Traversal
 (validation insuffisante des chemins de fichiers).
 """
 
+import bz2
 import csv
+import gzip
+import io
 import json
+import lzma
 import os
-from typing import Any, Dict, List
+import re
+import shutil
+import sqlite3
+import tempfile
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from itertools import chain
+from typing import IO, Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, TextIO, Tuple
 
-from app.database import get_connection, list_contacts, create_contact
+from app import database
+from app.database import DEFAULT_BATCH_SIZE, ROW_FORMAT_DICT, ROW_FORMAT_TUPLE, connection
 
 
 DEFAULT_EXPORT_DIR = "data/exports"
+JSON_READ_CHUNK_SIZE = 64 * 1024
+PARALLEL_RANGE_SIZE = 4 * 1024 * 1024
+CSV_FIELDNAMES = ['id', 'name', 'email', 'phone', 'notes']
+
+BACKUP_FORMAT_JSON = 'json'
+BACKUP_FORMAT_SQLITE = 'sqlite'
+SQLITE_BACKUP_EXTENSIONS = ('.db', '.sqlite', '.sqlite3')
+SQLITE_BACKUP_PAGES_PER_STEP = 1024
+SQLITE_HEADER = b'SQLite format 3\x00'
+
+BackupProgress = Callable[[int, int, int], None]
+
+# Compression choisie d'après l'extension du fichier.
+COMPRESSION_OPENERS: Dict[str, Callable[..., IO[Any]]] = {
+    '.gz': gzip.open,
+    '.bz2': bz2.open,
+    '.xz': lzma.open,
+}
+
+
+def _compression_suffix(path: str) -> Optional[str]:
+    """Extension de compression de path, None pour un fichier en clair."""
+    suffix = os.path.splitext(path)[1].lower()
+    return suffix if suffix in COMPRESSION_OPENERS else None
+
+
+def open_contacts_file(
+    path: str,
+    mode: str = 'r',
+    compresslevel: Optional[int] = None,
+    newline: Optional[str] = None,
+) -> IO[Any]:
+    """
+    Ouvre path en flux, compressé ou décompressé à la volée selon son
+    extension (.gz, .bz2, .xz) ; les autres fichiers sont ouverts tels
+    quels. En mode texte l'encodage est UTF-8.
+
+    compresslevel (ou preset pour .xz) ne sert qu'en écriture ; None garde
+    le niveau par défaut du format.
+    """
+    suffix = _compression_suffix(path)
+    binary = 'b' in mode
+    if suffix is None:
+        if binary:
+            return open(path, mode)
+        return open(path, mode, encoding='utf-8', newline=newline)
+
+    opener = COMPRESSION_OPENERS[suffix]
+    options: Dict[str, Any] = {}
+    if compresslevel is not None and 'r' not in mode:
+        options['preset' if suffix == '.xz' else 'compresslevel'] = compresslevel
+    if binary:
+        return opener(path, mode, **options)
+    return opener(path, mode.replace('t', '') + 't', encoding='utf-8', newline=newline, **options)
+
+
+_JSON_WHITESPACE = re.compile(r'[ \t\n\r]*')
+
+
+class _JsonStream:
+    """
+    Lecteur JSON incrémental : décode les valeurs une à une en ne gardant
+    en mémoire que la portion du fichier en cours d'analyse.
+    """
+
+    def __init__(self, f: TextIO, chunk_size: int) -> None:
+        self._f = f
+        self._chunk_size = chunk_size
+        self._decoder = json.JSONDecoder()
+        self._buf = ''
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self) -> bool:
+        """Lit le bloc suivant ; retourne False en fin de fichier."""
+        data = self._f.read(self._chunk_size)
+        if not data:
+            self._eof = True
+            return False
+        self._buf = self._buf[self._pos:] + data
+        self._pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Retourne le prochain caractère significatif ('' en fin de fichier)."""
+        while True:
+            self._pos = _JSON_WHITESPACE.match(self._buf, self._pos).end()
+            if self._pos < len(self._buf):
+                return self._buf[self._pos]
+            if not self._fill():
+                return ''
+
+    def accept(self, char: str) -> bool:
+        """Consomme char s'il est le prochain caractère significatif."""
+        if self.peek() == char:
+            self._pos += 1
+            return True
+        return False
+
+    def expect(self, char: str) -> None:
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"JSON invalide : '{char}' attendu, '{found}' trouvé")
+        self._pos += 1
+
+    def value(self) -> Any:
+        """Décode la valeur JSON suivante."""
+        self.peek()
+        while True:
+            try:
+                obj, end = self._decoder.raw_decode(self._buf, self._pos)
+            except json.JSONDecodeError:
+                if self._fill():
+                    continue
+                raise
+            # Un nombre en fin de tampon peut être tronqué : relire d'abord.
+            if end == len(self._buf) and not self._eof and self._fill():
+                continue
+            self._pos = end
+            return obj
+
+    def array_items(self) -> Iterator[Any]:
+        """Itère sur les éléments du tableau JSON qui commence ici."""
+        self.expect('[')
+        if self.accept(']'):
+            return
+        while True:
+            yield self.value()
+            if not self.accept(','):
+                self.expect(']')
+                return
+
+
+def _iter_json_contacts(f: TextIO, header: Optional[Dict[str, Any]] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Itère sur les contacts d'un fichier JSON sans le charger en entier.
+
+    Accepte un tableau de contacts ou l'enveloppe de sauvegarde
+    {"version": ..., "contacts": [...]}. Si header est fourni, il reçoit
+    les autres clés de l'enveloppe au fur et à mesure de la lecture.
+    """
+    stream = _JsonStream(f, JSON_READ_CHUNK_SIZE)
+    if stream.peek() == '[':
+        yield from stream.array_items()
+        return
+
+    stream.expect('{')
+    if stream.accept('}'):
+        return
+    while True:
+        key = stream.value()
+        stream.expect(':')
+        if key == 'contacts':
+            yield from stream.array_items()
+        elif header is not None:
+            header[key] = stream.value()
+        else:
+            stream.value()
+        if not stream.accept(','):
+            stream.expect('}')
+            return
+
+
+def _json_array_chunks(contacts: Iterable[Dict[str, Any]]) -> Iterator[str]:
+    """Produit un tableau JSON morceau par morceau, un contact par ligne."""
+    separator = '[\n  '
+    for contact in contacts:
+        yield separator
+        yield json.dumps(contact, ensure_ascii=False)
+        separator = ',\n  '
+    yield '[]\n' if separator == '[\n  ' else '\n]\n'
 
 
-def export_contacts_json(output_path: str) -> str:
+def _backup_chunks(contacts: Iterable[Dict[str, Any]], header: Dict[str, Any]) -> Iterator[str]:
+    """
+    Produit l'enveloppe de sauvegarde JSON morceau par morceau ; les clés
+    de header sont écrites avant la liste des contacts.
+    """
+    yield '{"version": "1.0", '
+    for key, value in header.items():
+        yield f'{json.dumps(key)}: {json.dumps(value)}, '
+    yield '"contacts": '
+    yield from _json_array_chunks(contacts)
+    yield '}\n'
+
+
+def _read_backup(f: TextIO) -> Tuple[Dict[str, Any], Iterator[Dict[str, Any]]]:
+    """
+    Ouvre une sauvegarde JSON en flux et retourne (en-tête, contacts).
+
+    Le premier contact est lu d'avance pour que l'en-tête, écrit avant la
+    liste des contacts, soit complet au retour.
+    """
+    header: Dict[str, Any] = {}
+    contacts = _iter_json_contacts(f, header)
+    first = next(contacts, None)
+    if first is not None:
+        contacts = chain([first], contacts)
+    return header, contacts
+
+
+def _csv_chunks(rows: Iterable[Sequence[Any]], rows_per_chunk: int = 1000) -> Iterator[str]:
+    """
+    Produit un CSV (en-tête compris) par paquets de rows_per_chunk lignes, à
+    partir de contacts au format "tuple" (champs dans l'ordre de
+    CSV_FIELDNAMES).
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(CSV_FIELDNAMES)
+    pending = 0
+    for row in rows:
+        writer.writerow(row)
+        pending += 1
+        if pending == rows_per_chunk:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+            pending = 0
+    yield buffer.getvalue()
+
+
+def _jsonl_chunks(contacts: Iterable[Dict[str, Any]], lines_per_chunk: int = 1000) -> Iterator[str]:
+    """Produit un fichier JSON Lines (un contact par ligne) par paquets."""
+    lines = []
+    for contact in contacts:
+        lines.append(json.dumps(contact, ensure_ascii=False))
+        if len(lines) == lines_per_chunk:
+            lines.append('')
+            yield '\n'.join(lines)
+            lines = []
+    if lines:
+        lines.append('')
+        yield '\n'.join(lines)
+
+
+# Un contact importé en parallèle circule sous forme de tuple compact
+# (id, name, email, phone, notes) entre les processus d'analyse et
+# l'unique connexion qui écrit.
+ContactRow = Tuple[Any, Any, Any, Any, Any]
+
+
+def _jsonl_row(line: bytes) -> ContactRow:
+    """Convertit une ligne JSON Lines en ContactRow."""
+    contact = json.loads(line)
+    if not isinstance(contact, dict):
+        raise ValueError(f"Ligne JSONL invalide (objet attendu) : {line[:80]!r}")
+    return (
+        contact.get('id'),
+        contact.get('name', ''),
+        contact.get('email', ''),
+        contact.get('phone', ''),
+        contact.get('notes', ''),
+    )
+
+
+def _parse_jsonl_range(path: str, start: int, end: int) -> List[ContactRow]:
+    """Analyse les lignes de path comprises entre les octets start et end."""
+    with open(path, 'rb') as f:
+        f.seek(start)
+        data = f.read(end - start)
+    return [_jsonl_row(line) for line in data.splitlines() if line.strip()]
+
+
+def _line_ranges(path: str, range_size: int = PARALLEL_RANGE_SIZE) -> List[Tuple[int, int]]:
+    """
+    Découpe path en plages d'octets [début, fin) d'environ range_size
+    octets, dont chacune commence en début de ligne.
+    """
+    size = os.path.getsize(path)
+    boundaries = [0]
+    with open(path, 'rb') as f:
+        while boundaries[-1] < size:
+            f.seek(boundaries[-1] + range_size - 1)
+            f.readline()
+            boundaries.append(min(f.tell(), size))
+    return list(zip(boundaries, boundaries[1:]))
+
+
+def _csv_record_end(f: IO[bytes], parity: int = 0) -> int:
+    """
+    Avance f jusqu'à la prochaine fin de ligne située hors guillemets et
+    retourne la position atteinte.
+
+    parity est la parité du nombre de guillemets déjà lus depuis le début
+    de l'enregistrement : un saut de ligne ne termine l'enregistrement que
+    si ce nombre est pair (sinon il est à l'intérieur d'un champ cité).
+    """
+    while True:
+        line = f.readline()
+        if not line:
+            break
+        parity ^= line.count(b'"') & 1
+        if not parity:
+            break
+    return f.tell()
+
+
+def _csv_record_ranges(path: str, range_size: int = PARALLEL_RANGE_SIZE) -> Tuple[List[str], List[Tuple[int, int]]]:
+    """
+    Lit l'en-tête de path et découpe la suite en plages d'octets d'environ
+    range_size octets qui commencent toutes au début d'un enregistrement,
+    y compris quand des champs cités contiennent des sauts de ligne.
+
+    Le fichier est parcouru une fois en comptant les guillemets, sans
+    analyse CSV.
+    """
+    size = os.path.getsize(path)
+    with open(path, 'rb') as f:
+        header_end = _csv_record_end(f)
+        f.seek(0)
+        header = f.read(header_end).decode('utf-8')
+        fieldnames = next(csv.reader(io.StringIO(header, newline='')), [])
+
+        boundaries = [header_end]
+        while boundaries[-1] < size:
+            block = f.read(range_size)
+            boundaries.append(min(_csv_record_end(f, block.count(b'"') & 1), size))
+    return fieldnames, list(zip(boundaries, boundaries[1:]))
+
+
+def _parse_csv_range(path: str, start: int, end: int, fieldnames: List[str]) -> List[ContactRow]:
+    """
+    Analyse les enregistrements CSV de path compris entre les octets start
+    et end et les valide : chaque ligne doit avoir autant de champs que
+    l'en-tête. Les colonnes absentes valent '' (None pour l'id).
+    """
+    with open(path, 'rb') as f:
+        f.seek(start)
+        text = f.read(end - start).decode('utf-8')
+    positions = [fieldnames.index(name) if name in fieldnames else None for name in CSV_FIELDNAMES]
+    width = len(fieldnames)
+    rows = []
+    reader = csv.reader(io.StringIO(text, newline=''))
+    for record in reader:
+        if not record:
+            continue
+        if len(record) != width:
+            raise ValueError(
+                f"Enregistrement CSV invalide après l'octet {start} (ligne {reader.line_num} de la plage) : "
+                f"{len(record)} champs au lieu de {width}"
+            )
+        rows.append(tuple(
+            (None if i == 0 else '') if pos is None else record[pos]
+            for i, pos in enumerate(positions)
+        ))
+    return rows
+
+
+def _parallel_map(
+    func: Callable[..., List[ContactRow]],
+    tasks: Iterable[Tuple[Any, ...]],
+    workers: int,
+) -> Iterator[List[ContactRow]]:
+    """
+    Exécute func(*task) pour chaque tâche dans un pool de workers
+    processus et produit les résultats dans l'ordre des tâches.
+
+    Au plus deux tâches par worker sont en cours à la fois : la mémoire
+    reste bornée même si l'écriture est plus lente que l'analyse.
+    """
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending: deque = deque()
+        for task in tasks:
+            pending.append(executor.submit(func, *task))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def _rows_to_contacts(rows: Iterable[ContactRow], upsert_key: Optional[str]) -> Iterator[Any]:
+    """Adapte des ContactRow à create_contacts ou upsert_contacts."""
+    if upsert_key == database.UPSERT_KEY_ID:
+        return (dict(zip(CSV_FIELDNAMES, row)) for row in rows)
+    return (row[1:] for row in rows)
+
+
+def _worker_count(workers: Optional[int]) -> int:
+    """Nombre de processus d'analyse : workers, ou un par cœur par défaut."""
+    if workers is None:
+        return os.cpu_count() or 1
+    if workers < 1:
+        raise ValueError("workers doit être strictement positif")
+    return workers
+
+
+def _insert_contacts(
+    contacts: Iterable[Dict[str, Any]],
+    batch_size: int,
+    stats: Optional[Dict[str, float]],
+    upsert_key: Optional[str] = None,
+) -> int:
+    """
+    Insère les contacts par lots et mesure le débit obtenu.
+
+    Avec upsert_key ("id" ou "email"), les contacts déjà présents sont mis
+    à jour au lieu d'être dupliqués (voir database.upsert_contacts).
+    Si stats est fourni, il est complété avec count, seconds et
+    contacts_per_second.
+    """
+    if upsert_key is None:
+        return _run_import(lambda conn: database.create_contacts(conn, contacts, batch_size=batch_size), stats)
+    return _run_import(
+        lambda conn: database.upsert_contacts(conn, contacts, batch_size=batch_size, key=upsert_key), stats
+    )
+
+
+def _run_import(load: Callable[[sqlite3.Connection], int], stats: Optional[Dict[str, float]]) -> int:
+    """Exécute load sur une connexion du pool et mesure son débit."""
+    start = time.perf_counter()
+    with connection() as conn:
+        count = load(conn)
+    elapsed = time.perf_counter() - start
+
+    if stats is not None:
+        stats['count'] = count
+        stats['seconds'] = elapsed
+        stats['contacts_per_second'] = count / elapsed if elapsed > 0 else 0.0
+    return count
+
+
+def export_contacts_json(output_path: str, compresslevel: Optional[int] = None) -> str:
     """
     Exporte tous les contacts au format JSON.
 
@@ -24,53 +462,89 @@ def export_contacts_json(output_path: str) -> str:
     permet d'écrire n'importe où sur le système.
     Exemple d'abus : "../../../etc/passwd"
     """
-    conn = get_connection()
-    contacts = list_contacts(conn)
-    conn.close()
-
    
     full_path = output_path
 
     os.makedirs(os.path.dirname(full_path), exist_ok=True)
 
-    with open(full_path, 'w', encoding='utf-8') as f:
-        json.dump(contacts, f, indent=2, ensure_ascii=False)
+    with connection() as conn, open_contacts_file(full_path, 'w', compresslevel) as f:
+        f.writelines(_json_array_chunks(database.iter_contacts(conn)))
 
     return full_path
 
 
-def export_contacts_csv(output_path: str) -> str:
+def export_contacts_csv(output_path: str, compresslevel: Optional[int] = None) -> str:
     """
     Exporte tous les contacts au format CSV.
 
     VULNÉRABILITÉ Path Traversal : le chemin n'est pas validé.
     """
-    conn = get_connection()
-    contacts = list_contacts(conn)
-    conn.close()
+    full_path = output_path
+
+    os.makedirs(os.path.dirname(full_path), exist_ok=True)
+
+    with connection() as conn, open_contacts_file(full_path, 'w', compresslevel, newline='') as f:
+        f.writelines(_csv_chunks(database.iter_contacts(conn, row_format=ROW_FORMAT_TUPLE)))
+
+    return full_path
+
+
+def export_contacts_jsonl(output_path: str, compresslevel: Optional[int] = None) -> str:
+    """
+    Exporte tous les contacts au format JSON Lines, un contact par ligne.
 
+    VULNÉRABILITÉ Path Traversal : le chemin n'est pas validé.
+    """
     full_path = output_path
 
     os.makedirs(os.path.dirname(full_path), exist_ok=True)
 
-    if contacts:
-        fieldnames = ['id', 'name', 'email', 'phone', 'notes']
-        with open(full_path, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-            writer.writeheader()
-            writer.writerows(contacts)
-    else:
-        with open(full_path, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.writer(f)
-            writer.writerow(['id', 'name', 'email', 'phone', 'notes'])
+    with connection() as conn, open_contacts_file(full_path, 'w', compresslevel) as f:
+        f.writelines(_jsonl_chunks(database.iter_contacts(conn)))
 
     return full_path
 
 
-def import_contacts_json(input_path: str) -> int:
+# Format d'export -> (producteur de morceaux, format des lignes qu'il lit).
+_EXPORT_CHUNKS: Dict[str, Tuple[Callable[[Iterable[Any]], Iterator[str]], str]] = {
+    'json': (_json_array_chunks, ROW_FORMAT_DICT),
+    'csv': (_csv_chunks, ROW_FORMAT_TUPLE),
+    'jsonl': (_jsonl_chunks, ROW_FORMAT_DICT),
+}
+EXPORT_FORMATS = tuple(_EXPORT_CHUNKS)
+
+
+def iter_export(export_format: str) -> Iterator[str]:
+    """
+    Produit l'export de tous les contacts au format export_format ('json',
+    'csv' ou 'jsonl') morceau par morceau, sans fichier intermédiaire :
+    sert par exemple à répondre en flux à une requête HTTP.
+
+    Une connexion du pool est empruntée jusqu'à la fin de l'itération.
+    """
+    if export_format not in _EXPORT_CHUNKS:
+        raise ValueError(f"Format d'export inconnu : {export_format}")
+    chunks, row_format = _EXPORT_CHUNKS[export_format]
+
+    def generate() -> Iterator[str]:
+        with connection() as conn:
+            yield from chunks(database.iter_contacts(conn, row_format=row_format))
+
+    return generate()
+
+
+def import_contacts_json(
+    input_path: str,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    stats: Optional[Dict[str, float]] = None,
+    upsert_key: Optional[str] = None,
+) -> int:
     """
     Importe des contacts depuis un fichier JSON.
 
+    Avec upsert_key ("id" ou "email"), réimporter le même fichier ne crée
+    aucun doublon.
+
     VULNÉRABILITÉ Path Traversal : le chemin n'est pas validé,
     permet de lire n'importe quel fichier du système.
     Exemple d'abus : "../../../etc/passwd"
@@ -78,106 +552,343 @@ def import_contacts_json(input_path: str) -> int:
     
     full_path = input_path
 
-    with open(full_path, 'r', encoding='utf-8') as f:
-        contacts = json.load(f)
-
-    conn = get_connection()
-    count = 0
-    for contact in contacts:
-        name = contact.get('name', '')
-        email = contact.get('email', '')
-        phone = contact.get('phone', '')
-        notes = contact.get('notes', '')
-        create_contact(conn, name, email, phone, notes)
-        count += 1
-    conn.close()
-
-    return count
+    with open_contacts_file(full_path) as f:
+        return _insert_contacts(_iter_json_contacts(f), batch_size, stats, upsert_key)
 
 
-def import_contacts_csv(input_path: str) -> int:
+def import_contacts_csv(
+    input_path: str,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    stats: Optional[Dict[str, float]] = None,
+    upsert_key: Optional[str] = None,
+    workers: Optional[int] = 1,
+) -> int:
     """
     Importe des contacts depuis un fichier CSV.
 
+    Avec upsert_key ("id" ou "email"), réimporter le même fichier ne crée
+    aucun doublon.
+
+    Avec workers > 1 (None : un par cœur), le fichier est découpé sur des
+    fins d'enregistrement (les sauts de ligne à l'intérieur de champs cités
+    sont respectés) et les morceaux sont analysés et validés en parallèle ;
+    une seule connexion insère les contacts par lots, dans l'ordre du
+    fichier. Un fichier compressé est toujours lu en flux.
+
     VULNÉRABILITÉ Path Traversal : le chemin n'est pas validé.
     """
     full_path = input_path
+    workers = _worker_count(workers)
+
+    if workers == 1 or _compression_suffix(full_path) is not None:
+        with open_contacts_file(full_path, newline='') as f:
+            reader = csv.DictReader(f)
+            return _insert_contacts(reader, batch_size, stats, upsert_key)
+
+    fieldnames, ranges = _csv_record_ranges(full_path, PARALLEL_RANGE_SIZE)
+    tasks = ((full_path, start, end, fieldnames) for start, end in ranges)
+    rows = chain.from_iterable(_parallel_map(_parse_csv_range, tasks, workers))
+    return _insert_contacts(_rows_to_contacts(rows, upsert_key), batch_size, stats, upsert_key)
+
+
+def import_contacts_jsonl(
+    input_path: str,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    stats: Optional[Dict[str, float]] = None,
+    upsert_key: Optional[str] = None,
+    workers: Optional[int] = 1,
+) -> int:
+    """
+    Importe des contacts depuis un fichier JSON Lines.
 
-    conn = get_connection()
-    count = 0
-
-    with open(full_path, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            name = row.get('name', '')
-            email = row.get('email', '')
-            phone = row.get('phone', '')
-            notes = row.get('notes', '')
-            create_contact(conn, name, email, phone, notes)
-            count += 1
-    conn.close()
-
-    return count
-
+    Par défaut le fichier est lu en flux dans le processus courant. Avec
+    workers > 1 (None : un par cœur), il est découpé en plages d'octets
+    alignées sur les fins de ligne, analysées en parallèle par workers
+    processus ; une seule connexion insère les contacts par lots, dans
+    l'ordre du fichier. Un fichier compressé est toujours lu en flux.
 
-def save_backup(backup_path: str) -> str:
+    VULNÉRABILITÉ Path Traversal : le chemin n'est pas validé.
+    """
+    full_path = input_path
+    workers = _worker_count(workers)
+
+    if workers == 1 or _compression_suffix(full_path) is not None:
+        with open_contacts_file(full_path, 'rb') as f:
+            rows = (_jsonl_row(line) for line in f if line.strip())
+            return _insert_contacts(_rows_to_contacts(rows, upsert_key), batch_size, stats, upsert_key)
+
+    tasks = ((full_path, start, end) for start, end in _line_ranges(full_path, PARALLEL_RANGE_SIZE))
+    rows = chain.from_iterable(_parallel_map(_parse_jsonl_range, tasks, workers))
+    return _insert_contacts(_rows_to_contacts(rows, upsert_key), batch_size, stats, upsert_key)
+
+
+def save_backup(
+    backup_path: str,
+    incremental: bool = False,
+    backup_format: Optional[str] = None,
+    pages_per_step: int = SQLITE_BACKUP_PAGES_PER_STEP,
+    progress: Optional[BackupProgress] = None,
+    compresslevel: Optional[int] = None,
+) -> str:
     """
     Sauvegarde la base de données complète dans un fichier JSON.
 
+    Avec incremental=True, seuls les contacts créés, modifiés ou supprimés
+    depuis la sauvegarde précédente (complète ou incrémentale) sont
+    écrits. La sauvegarde est lue dans un instantané cohérent de la base.
+
+    backup_format="sqlite" (par défaut pour les extensions .db, .sqlite et
+    .sqlite3) copie directement les pages de la base avec l'API de
+    sauvegarde en ligne de SQLite, pages_per_step pages à la fois ;
+    progress(status, remaining, total) est appelé après chaque étape.
+
     VULNÉRABILITÉ Path Traversal : permet d'écrire n'importe où.
     """
-    conn = get_connection()
-    contacts = list_contacts(conn)
-    conn.close()
-
     full_path = backup_path
 
     os.makedirs(os.path.dirname(full_path), exist_ok=True)
 
-    backup_data = {
-        'version': '1.0',
-        'contacts': contacts
-    }
+    if backup_format is None:
+        backup_format = _backup_format_for(full_path)
+    if backup_format == BACKUP_FORMAT_SQLITE:
+        if incremental:
+            raise ValueError("Les sauvegardes incrémentales sont au format JSON.")
+        return _save_sqlite_backup(full_path, pages_per_step, progress, compresslevel)
+    if backup_format != BACKUP_FORMAT_JSON:
+        raise ValueError(f"Format de sauvegarde inconnu : {backup_format}")
+
+    with connection() as conn, database.transaction(conn):
+        seq = database.current_change_seq(conn)
+        if incremental:
+            base_seq = database.last_backup_seq(conn)
+            if base_seq is None:
+                raise ValueError("Aucune sauvegarde précédente : faire d'abord une sauvegarde complète.")
+            header = {
+                'type': 'delta',
+                'base_seq': base_seq,
+                'seq': seq,
+                'deleted': list(database.iter_changes(conn, base_seq, deleted=True)),
+            }
+            contacts = database.iter_changes(conn, base_seq)
+        else:
+            header = {'type': 'full', 'seq': seq}
+            contacts = database.iter_contacts(conn)
+
+        with open_contacts_file(full_path, 'w', compresslevel) as f:
+            f.writelines(_backup_chunks(contacts, header))
+        database.record_backup(conn, seq, header['type'])
+
+    return full_path
+
+
+def _backup_format_for(path: str) -> str:
+    """Format de sauvegarde déduit de l'extension du fichier."""
+    if _compression_suffix(path):
+        path = os.path.splitext(path)[0]
+    if path.lower().endswith(SQLITE_BACKUP_EXTENSIONS):
+        return BACKUP_FORMAT_SQLITE
+    return BACKUP_FORMAT_JSON
+
+
+def _is_sqlite_file(path: str) -> bool:
+    """Indique si le fichier commence par l'en-tête d'une base SQLite."""
+    with open_contacts_file(path, 'rb') as f:
+        return f.read(len(SQLITE_HEADER)) == SQLITE_HEADER
 
-    with open(full_path, 'w', encoding='utf-8') as f:
-        json.dump(backup_data, f, indent=2, ensure_ascii=False)
 
+@contextmanager
+def _plain_sqlite_file(path: str) -> Iterator[str]:
+    """
+    Chemin d'une base SQLite lisible directement : path lui-même, ou une
+    copie décompressée temporaire si path est compressé.
+    """
+    if _compression_suffix(path) is None:
+        yield path
+        return
+    fd, plain_path = tempfile.mkstemp(suffix='.db', dir=os.path.dirname(path) or None)
+    try:
+        with open_contacts_file(path, 'rb') as src, os.fdopen(fd, 'wb') as dst:
+            shutil.copyfileobj(src, dst)
+        yield plain_path
+    finally:
+        os.remove(plain_path)
+
+
+def _copy_sqlite_file(source_path: str, conn: sqlite3.Connection, pages_per_step: int,
+                      progress: Optional[BackupProgress] = None) -> None:
+    """
+    Remplace la base de conn par celle de source_path, page par page, puis
+    applique les migrations manquantes à une copie plus ancienne.
+    """
+    with _plain_sqlite_file(source_path) as plain_path:
+        source = sqlite3.connect(plain_path)
+        try:
+            source.backup(conn, pages=pages_per_step, progress=progress)
+        finally:
+            source.close()
+    database.invalidate_cache()
+    database.migrate(conn)
+
+
+def _save_sqlite_backup(
+    full_path: str,
+    pages_per_step: int,
+    progress: Optional[BackupProgress],
+    compresslevel: Optional[int],
+) -> str:
+    """
+    Copie la base page par page dans full_path.
+
+    Le verrou de lecture n'est tenu que pendant chaque étape : les autres
+    connexions continuent de lire (et d'écrire) entre deux étapes. Si
+    full_path est compressé, la copie passe par un fichier temporaire
+    compressé ensuite en flux.
+    """
+    compressed = _compression_suffix(full_path) is not None
+    if compressed:
+        fd, target_path = tempfile.mkstemp(suffix='.db', dir=os.path.dirname(full_path) or None)
+        os.close(fd)
+    else:
+        target_path = full_path
+    try:
+        with connection() as conn:
+            target = sqlite3.connect(target_path)
+            try:
+                conn.backup(target, pages=pages_per_step, progress=progress)
+                seq = database.current_change_seq(target)
+            finally:
+                target.close()
+            if compressed:
+                with open(target_path, 'rb') as src, open_contacts_file(full_path, 'wb', compresslevel) as dst:
+                    shutil.copyfileobj(src, dst)
+            database.record_backup(conn, seq, 'full')
+    finally:
+        if compressed:
+            os.remove(target_path)
     return full_path
 
 
-def restore_backup(backup_path: str) -> int:
+def _restore_sqlite_backup(
+    full_path: str,
+    pages_per_step: int,
+    progress: Optional[BackupProgress],
+    stats: Optional[Dict[str, float]],
+) -> int:
+    """Remplace la base courante par la copie full_path, page par page."""
+    def load(conn: sqlite3.Connection) -> int:
+        _copy_sqlite_file(full_path, conn, pages_per_step, progress)
+        return database.count_contacts(conn)
+
+    return _run_import(load, stats)
+
+
+def _apply_delta(
+    conn: sqlite3.Connection,
+    header: Dict[str, Any],
+    contacts: Iterator[Dict[str, Any]],
+    batch_size: int,
+) -> int:
+    """
+    Rejoue une sauvegarde incrémentale : contacts réinsérés ou mis à jour
+    avec leur id d'origine, puis suppressions.
+    """
+    count = database.upsert_contacts(conn, contacts, batch_size=batch_size)
+    database.delete_contacts(conn, header.get('deleted', []), batch_size=batch_size)
+    return count + len(header.get('deleted', []))
+
+
+def restore_backup(
+    backup_path: str,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    stats: Optional[Dict[str, float]] = None,
+    pages_per_step: int = SQLITE_BACKUP_PAGES_PER_STEP,
+    progress: Optional[BackupProgress] = None,
+    upsert_key: Optional[str] = None,
+) -> int:
     """
     Restaure la base de données depuis un fichier de sauvegarde.
 
+    Une sauvegarde complète ajoute ses contacts à la base, ou les fusionne
+    sur leur id ou leur email avec upsert_key : restaurer deux fois la même
+    sauvegarde laisse alors la table inchangée. Une sauvegarde
+    incrémentale est rejouée sur les ids existants (voir aussi
+    restore_backup_chain). Une sauvegarde au format SQLite, reconnue à son
+    en-tête, remplace la base entière par copie de pages.
+
     VULNÉRABILITÉ Path Traversal : permet de lire n'importe quel fichier.
     """
     full_path = backup_path
 
-    with open(full_path, 'r', encoding='utf-8') as f:
-        backup_data = json.load(f)
+    if _is_sqlite_file(full_path):
+        return _restore_sqlite_backup(full_path, pages_per_step, progress, stats)
 
-    contacts = backup_data.get('contacts', [])
+    with open_contacts_file(full_path) as f:
+        header, contacts = _read_backup(f)
+        if header.get('type') == 'delta':
+            return _run_import(lambda conn: _apply_delta(conn, header, contacts, batch_size), stats)
+        return _insert_contacts(contacts, batch_size, stats, upsert_key)
 
-    conn = get_connection()
-    count = 0
-    for contact in contacts:
-        name = contact.get('name', '')
-        email = contact.get('email', '')
-        phone = contact.get('phone', '')
-        notes = contact.get('notes', '')
-        create_contact(conn, name, email, phone, notes)
-        count += 1
-    conn.close()
 
-    return count
+def restore_backup_chain(
+    base_path: str,
+    delta_paths: List[str],
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    stats: Optional[Dict[str, float]] = None,
+) -> int:
+    """
+    Reconstruit la base à partir d'une sauvegarde complète suivie de ses
+    sauvegardes incrémentales, dans l'ordre.
+
+    Le contenu actuel de la table est remplacé ; les ids d'origine sont
+    conservés. Tout se fait dans une seule transaction : si un maillon
+    manque ou est dans le désordre, rien n'est modifié.
+
+    Une base au format SQLite est d'abord recopiée page par page, hors de
+    la transaction ; seules les sauvegardes incrémentales sont alors
+    rejouées de façon atomique.
+
+    VULNÉRABILITÉ Path Traversal : permet de lire n'importe quel fichier.
+    """
+    def load(conn: sqlite3.Connection) -> int:
+        if _is_sqlite_file(base_path):
+            _copy_sqlite_file(base_path, conn, SQLITE_BACKUP_PAGES_PER_STEP)
+            seq = database.current_change_seq(conn)
+            count = database.count_contacts(conn)
+        with database.transaction(conn):
+            if not _is_sqlite_file(base_path):
+                database.delete_all_contacts(conn)
+                with open_contacts_file(base_path) as f:
+                    header, contacts = _read_backup(f)
+                    if header.get('type', 'full') != 'full' or 'seq' not in header:
+                        raise ValueError(f"{base_path} n'est pas une sauvegarde complète chaînable.")
+                    count = database.upsert_contacts(conn, contacts, batch_size=batch_size)
+                seq = header['seq']
+
+            for delta_path in delta_paths:
+                with open_contacts_file(delta_path) as f:
+                    header, contacts = _read_backup(f)
+                    if header.get('type') != 'delta' or header.get('base_seq') != seq:
+                        raise ValueError(
+                            f"{delta_path} ne fait pas suite à la sauvegarde de séquence {seq}."
+                        )
+                    count += _apply_delta(conn, header, contacts, batch_size)
+                seq = header['seq']
+        return count
+
+    return _run_import(load, stats)
 
 
 __all__ = [
+    "open_contacts_file",
     "export_contacts_json",
     "export_contacts_csv",
+    "export_contacts_jsonl",
+    "iter_export",
     "import_contacts_json",
     "import_contacts_csv",
+    "import_contacts_jsonl",
     "save_backup",
     "restore_backup",
+    "restore_backup_chain",
 ]
 
@@ -0,0 +1,307 @@
+"""
+Instrumentation des modules database et file_handler.
+
+enable() remplace chaque fonction publique de ces modules par une version
+chronométrée (nombre d'appels et histogramme des durées, temps inclusifs)
+et installe un traceur SQL (set_trace_callback) sur chaque nouvelle
+connexion. disable() rétablit les fonctions d'origine.
+
+La durée d'une requête SQL est mesurée de son début jusqu'au début de la
+requête suivante du même thread, ou jusqu'à la fin de l'opération
+instrumentée qui l'a lancée : elle inclut donc la lecture des résultats.
+
+Exemple :
+
+    from app import profiling
+    profiling.enable()
+    ...
+    print(profiling.summary())
+"""
+
+import functools
+import inspect
+import re
+import threading
+import time
+from types import ModuleType
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from app import database, file_handler
+
+# Bornes supérieures (ms) des classes de l'histogramme ; la dernière
+# classe reçoit tout le reste.
+HISTOGRAM_BOUNDS_MS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+SQL_TEXT_LIMIT = 120
+
+# Gestionnaires de contexte et fonctions de configuration : leur durée
+# n'a pas de sens.
+_NOT_TIMED = {
+    "connection",
+    "transaction",
+    "close_pool",
+    "add_connection_hook",
+    "remove_connection_hook",
+    "configure_cache",
+    "cache_stats",
+}
+
+_SQL_LITERAL = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_SQL_SPACES = re.compile(r"\s+")
+
+
+class Histogram:
+    """Nombre d'appels, durées totale/min/max et répartition par classe."""
+
+    __slots__ = ("count", "total", "min", "max", "buckets")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.min = float("inf")
+        self.max = 0.0
+        self.buckets = [0] * (len(HISTOGRAM_BOUNDS_MS) + 1)
+
+    def add(self, seconds: float) -> None:
+        ms = seconds * 1000.0
+        self.count += 1
+        self.total += ms
+        self.min = min(self.min, ms)
+        self.max = max(self.max, ms)
+        for i, bound in enumerate(HISTOGRAM_BOUNDS_MS):
+            if ms <= bound:
+                self.buckets[i] += 1
+                return
+        self.buckets[-1] += 1
+
+    def percentile(self, q: float) -> float:
+        """Borne supérieure (ms) de la classe contenant le quantile q."""
+        rank = q * self.count
+        seen = 0
+        for i, count in enumerate(self.buckets[:-1]):
+            seen += count
+            if count and seen >= rank:
+                return min(HISTOGRAM_BOUNDS_MS[i], self.max)
+        return self.max
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "total_ms": self.total,
+            "mean_ms": self.total / self.count if self.count else 0.0,
+            "min_ms": self.min if self.count else 0.0,
+            "max_ms": self.max,
+            "p50_ms": self.percentile(0.50),
+            "p95_ms": self.percentile(0.95),
+            "p99_ms": self.percentile(0.99),
+            "buckets": dict(zip([str(b) for b in HISTOGRAM_BOUNDS_MS] + ["inf"], self.buckets)),
+        }
+
+
+class Recorder:
+    """Mesures accumulées par opération et par requête SQL (thread-safe)."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.operations: Dict[str, Histogram] = {}
+        self.statements: Dict[str, Histogram] = {}
+
+    def _add(self, table: Dict[str, Histogram], key: str, seconds: float) -> None:
+        with self._lock:
+            histogram = table.get(key)
+            if histogram is None:
+                histogram = table[key] = Histogram()
+            histogram.add(seconds)
+
+    def record_call(self, name: str, seconds: float) -> None:
+        self._add(self.operations, name, seconds)
+
+    def record_sql(self, statement: str, seconds: float) -> None:
+        self._add(self.statements, statement, seconds)
+
+    def reset(self) -> None:
+        with self._lock:
+            self.operations.clear()
+            self.statements.clear()
+
+    def snapshot(self) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        with self._lock:
+            return {
+                "operations": {name: h.as_dict() for name, h in self.operations.items()},
+                "sql": {sql: h.as_dict() for sql, h in self.statements.items()},
+            }
+
+
+_recorder = Recorder()
+_local = threading.local()
+_originals: Dict[Tuple[ModuleType, str], Callable[..., Any]] = {}
+
+
+def _normalize_sql(statement: str) -> str:
+    """Remplace les valeurs littérales par ? pour regrouper les requêtes."""
+    text = _SQL_SPACES.sub(" ", _SQL_LITERAL.sub("?", statement)).strip()
+    if len(text) > SQL_TEXT_LIMIT:
+        text = text[:SQL_TEXT_LIMIT - 3] + "..."
+    return text
+
+
+def _flush_sql(now: float) -> None:
+    """Clôt la requête SQL en cours dans ce thread."""
+    pending = getattr(_local, "sql", None)
+    if pending is not None:
+        _local.sql = None
+        _recorder.record_sql(_normalize_sql(pending[0]), now - pending[1])
+
+
+def _trace(statement: str) -> None:
+    """Traceur SQL : appelé par sqlite3 au début de chaque requête."""
+    # Chaque trigger déclenché est signalé avec le texte de la requête
+    # parente (ou "-- TRIGGER ...") : son temps reste attribué à celle-ci.
+    pending = getattr(_local, "sql", None)
+    if statement.startswith("--") or (pending is not None and pending[0] == statement):
+        return
+    now = time.perf_counter()
+    _flush_sql(now)
+    _local.sql = (statement, now)
+
+
+def _install_tracer(conn: Any) -> None:
+    conn.set_trace_callback(_trace)
+
+
+def _timed_iteration(name: str, generator: Iterator[Any], elapsed: float = 0.0) -> Iterator[Any]:
+    """
+    Parcourt generator en ne comptant que le temps passé à produire ses
+    éléments, pas celui du code qui les consomme ; la mesure est
+    enregistrée sous name à la fin de l'itération.
+    """
+    try:
+        while True:
+            start = time.perf_counter()
+            try:
+                item = next(generator)
+            except StopIteration:
+                elapsed += time.perf_counter() - start
+                return
+            elapsed += time.perf_counter() - start
+            yield item
+    finally:
+        generator.close()
+        _recorder.record_call(name, elapsed)
+
+
+def _timed(name: str, func: Callable[..., Any]) -> Callable[..., Any]:
+    """Version chronométrée de func, enregistrée sous name."""
+    if inspect.isgeneratorfunction(func):
+        @functools.wraps(func)
+        def generator_wrapper(*args: Any, **kwargs: Any) -> Iterator[Any]:
+            return _timed_iteration(name, func(*args, **kwargs))
+        return generator_wrapper
+
+    @functools.wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        depth = getattr(_local, "depth", 0)
+        _local.depth = depth + 1
+        start = time.perf_counter()
+        result = None
+        try:
+            result = func(*args, **kwargs)
+        finally:
+            end = time.perf_counter()
+            _local.depth = depth
+            if depth == 0:
+                _flush_sql(end)
+            if not inspect.isgenerator(result):
+                _recorder.record_call(name, end - start)
+        # Une fonction qui retourne un générateur (iter_export) travaille
+        # surtout pendant l'itération : elle est chronométrée jusqu'au bout.
+        if inspect.isgenerator(result):
+            return _timed_iteration(name, result, end - start)
+        return result
+    return wrapper
+
+
+def _instrumented_names(module: ModuleType) -> List[str]:
+    return [
+        name for name in module.__all__
+        if name not in _NOT_TIMED and inspect.isfunction(getattr(module, name))
+    ]
+
+
+def is_enabled() -> bool:
+    return bool(_originals)
+
+
+def enable(modules: Optional[List[ModuleType]] = None, sql: bool = True) -> None:
+    """
+    Instrumente les fonctions publiques de modules (database et
+    file_handler par défaut) et, si sql, trace les requêtes des connexions
+    ouvertes à partir de maintenant (le pool est vidé pour cela).
+    """
+    if is_enabled():
+        return
+    for module in modules or [database, file_handler]:
+        prefix = module.__name__.rsplit(".", 1)[-1]
+        for name in _instrumented_names(module):
+            func = getattr(module, name)
+            _originals[(module, name)] = func
+            setattr(module, name, _timed(f"{prefix}.{name}", func))
+    if sql:
+        database.close_pool()
+        database.add_connection_hook(_install_tracer)
+
+
+def disable() -> None:
+    """Rétablit les fonctions d'origine et arrête le traçage SQL."""
+    for (module, name), func in _originals.items():
+        setattr(module, name, func)
+    _originals.clear()
+    database.remove_connection_hook(_install_tracer)
+    database.close_pool()
+
+
+def reset() -> None:
+    """Efface les mesures accumulées."""
+    _recorder.reset()
+
+
+def stats() -> Dict[str, Dict[str, Dict[str, Any]]]:
+    """Mesures par opération ("operations") et par requête SQL ("sql")."""
+    return _recorder.snapshot()
+
+
+def summary(top: int = 15) -> str:
+    """Tableaux des opérations et des top requêtes SQL, par temps total."""
+    snapshot = stats()
+    lines = []
+    header = f"{'appels':>8}{'total (ms)':>12}{'moy. (ms)':>11}{'p50':>9}{'p95':>9}{'max (ms)':>10}"
+
+    def row(label: str, h: Dict[str, Any]) -> str:
+        return (
+            f"{h['count']:>8}{h['total_ms']:>12.1f}{h['mean_ms']:>11.3f}"
+            f"{h['p50_ms']:>9.2f}{h['p95_ms']:>9.2f}{h['max_ms']:>10.2f}  {label}"
+        )
+
+    def by_total(table: Dict[str, Dict[str, Any]]) -> List[Tuple[str, Dict[str, Any]]]:
+        return sorted(table.items(), key=lambda item: item[1]["total_ms"], reverse=True)
+
+    lines.append("=== Opérations (temps inclusifs) ===")
+    lines.append(header + "  opération")
+    lines.extend(row(name, h) for name, h in by_total(snapshot["operations"]))
+    if snapshot["sql"]:
+        lines.append("")
+        lines.append(f"=== Requêtes SQL ({min(top, len(snapshot['sql']))} plus coûteuses) ===")
+        lines.append(header + "  requête")
+        lines.extend(row(sql, h) for sql, h in by_total(snapshot["sql"])[:top])
+    return "\n".join(lines)
+
+
+__all__ = [
+    "Histogram",
+    "Recorder",
+    "enable",
+    "disable",
+    "is_enabled",
+    "reset",
+    "stats",
+    "summary",
+]
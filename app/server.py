@@ -0,0 +1,246 @@
+"""
+Serveur HTTP (Flask) exposant la gestion de contacts.
+
+Routes :
+    GET    /contacts?after_id=&limit=            liste paginée
+    POST   /contacts                             création (JSON)
+    GET    /contacts/<id>                        lecture
+    PATCH  /contacts/<id>                        mise à jour partielle (JSON)
+    DELETE /contacts/<id>                        suppression
+    GET    /contacts/search?q=&mode=&after_id=&limit=
+    GET    /export/<json|csv|jsonl>              export envoyé en flux
+    GET    /stats/cache                          statistiques du cache de résultats
+
+Les requêtes sont servies par un nombre fixe de threads (threads=) et
+chaque thread garde sa connexion du pool (database.connection()) d'une
+requête à l'autre. Les exports sont produits morceau par morceau dans la
+réponse, sans Content-Length ni fichier temporaire. Le serveur intégré
+répond en HTTP/1.0 : la fin de l'export est signalée par la fermeture de
+la connexion (pas d'envoi chunked), et aucune connexion persistante
+inactive n'occupe l'un des threads.
+
+Usage :
+    python -m app.server --host 127.0.0.1 --port 5000
+"""
+
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from flask import Flask, Response, jsonify, request
+from werkzeug.serving import BaseWSGIServer
+
+from app import database, file_handler
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 5000
+DEFAULT_THREADS = database.DEFAULT_POOL_SIZE
+MAX_PAGE_SIZE = 1000
+
+EXPORT_MIMETYPES = {
+    "json": "application/json",
+    "csv": "text/csv",
+    "jsonl": "application/x-ndjson",
+}
+CONTACT_FIELDS = ("name", "email", "phone", "notes")
+
+
+class BadRequest(ValueError):
+    """Paramètre ou corps de requête invalide (réponse 400)."""
+
+
+def _int_arg(name: str, default: Optional[int] = None) -> Optional[int]:
+    value = request.args.get(name)
+    if value is None or value == "":
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        raise BadRequest(f"{name} doit être un entier")
+
+
+def _page_args() -> Tuple[Optional[int], int]:
+    """Lit after_id et limit (bornée à MAX_PAGE_SIZE) de la requête."""
+    limit = _int_arg("limit", MAX_PAGE_SIZE)
+    if limit < 1 or limit > MAX_PAGE_SIZE:
+        raise BadRequest(f"limit doit être compris entre 1 et {MAX_PAGE_SIZE}")
+    return _int_arg("after_id"), limit
+
+
+def _page(contacts: List[Dict[str, Any]], limit: int) -> Response:
+    """Page de résultats et after_id de la page suivante (None en fin de liste)."""
+    next_after_id = contacts[-1]["id"] if len(contacts) == limit else None
+    return jsonify(contacts=contacts, next_after_id=next_after_id)
+
+
+def _json_body() -> Dict[str, Any]:
+    body = request.get_json(silent=True)
+    if not isinstance(body, dict):
+        raise BadRequest("corps JSON (objet) attendu")
+    unknown = set(body) - set(CONTACT_FIELDS)
+    if unknown:
+        raise BadRequest(f"champs inconnus : {', '.join(sorted(unknown))}")
+    return body
+
+
+def _bad_request(exc: BadRequest) -> Tuple[Response, int]:
+    return jsonify(error=str(exc)), 400
+
+
+def _list_contacts() -> Response:
+    after_id, limit = _page_args()
+    with database.connection() as conn:
+        contacts = database.list_contacts(conn, after_id=after_id, limit=limit)
+    return _page(contacts, limit)
+
+
+def _create_contact() -> Tuple[Response, int]:
+    body = _json_body()
+    if not body.get("name") or not body.get("email"):
+        raise BadRequest("name et email sont obligatoires")
+    with database.connection() as conn:
+        contact_id = database.create_contact(
+            conn, body["name"], body["email"], body.get("phone", ""), body.get("notes", "")
+        )
+        contact = database.get_contact(conn, contact_id)
+    return jsonify(contact), 201
+
+
+def _search_contacts() -> Response:
+    query = request.args.get("q", "")
+    mode = request.args.get("mode", database.SEARCH_MODE_LIKE)
+    if mode not in database.SEARCH_MODES:
+        raise BadRequest(f"mode doit valoir {' ou '.join(database.SEARCH_MODES)}")
+    after_id, limit = _page_args()
+    with database.connection() as conn:
+        contacts = database.search_contacts(conn, query, mode=mode, after_id=after_id, limit=limit)
+    return _page(contacts, limit)
+
+
+def _get_contact(contact_id: int) -> Any:
+    with database.connection() as conn:
+        contact = database.get_contact(conn, contact_id)
+    if contact is None:
+        return jsonify(error="contact introuvable"), 404
+    return jsonify(contact)
+
+
+def _update_contact(contact_id: int) -> Any:
+    body = _json_body()
+    with database.connection() as conn:
+        database.update_contact(conn, contact_id, **body)
+        contact = database.get_contact(conn, contact_id)
+    if contact is None:
+        return jsonify(error="contact introuvable"), 404
+    return jsonify(contact)
+
+
+def _delete_contact(contact_id: int) -> Tuple[str, int]:
+    with database.connection() as conn:
+        database.delete_contact(conn, contact_id)
+    return "", 204
+
+
+def _export(export_format: str) -> Response:
+    if export_format not in EXPORT_MIMETYPES:
+        raise BadRequest(f"format d'export inconnu : {export_format}")
+    return Response(
+        file_handler.iter_export(export_format),
+        mimetype=EXPORT_MIMETYPES[export_format],
+        headers={"Content-Disposition": f"attachment; filename=contacts.{export_format}"},
+    )
+
+
+def _cache_stats() -> Response:
+    return jsonify(database.cache_stats())
+
+
+# (règle, méthode, vue) : les vues sont enregistrées par create_app.
+_ROUTES: List[Tuple[str, str, Callable[..., Any]]] = [
+    ("/contacts", "GET", _list_contacts),
+    ("/contacts", "POST", _create_contact),
+    ("/contacts/search", "GET", _search_contacts),
+    ("/contacts/<int:contact_id>", "GET", _get_contact),
+    ("/contacts/<int:contact_id>", "PATCH", _update_contact),
+    ("/contacts/<int:contact_id>", "DELETE", _delete_contact),
+    ("/export/<export_format>", "GET", _export),
+    ("/stats/cache", "GET", _cache_stats),
+]
+
+
+def create_app() -> Flask:
+    """Construit l'application Flask."""
+    app = Flask(__name__)
+    app.register_error_handler(BadRequest, _bad_request)
+    for rule, method, view in _ROUTES:
+        app.add_url_rule(rule, view.__name__.lstrip("_"), view, methods=[method])
+    return app
+
+
+class PooledWSGIServer(BaseWSGIServer):
+    """
+    Serveur WSGI dont les requêtes sont traitées par un nombre fixe de
+    threads, au lieu d'un thread neuf par requête : les connexions SQLite
+    du pool, propres à chaque thread, sont ainsi réutilisées.
+    """
+
+    multithread = True
+
+    def __init__(self, host: str, port: int, app: Any, threads: int = DEFAULT_THREADS) -> None:
+        super().__init__(host, port, app)
+        self._executor = ThreadPoolExecutor(max_workers=threads, thread_name_prefix="contacts-http")
+
+    def process_request(self, request: Any, client_address: Any) -> None:
+        self._executor.submit(self._process_request, request, client_address)
+
+    def _process_request(self, request: Any, client_address: Any) -> None:
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+    def server_close(self) -> None:
+        super().server_close()
+        self._executor.shutdown(wait=True)
+
+
+def make_server(host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, threads: int = DEFAULT_THREADS) -> PooledWSGIServer:
+    """Crée le serveur sans le démarrer (port=0 : port libre, voir server.port)."""
+    return PooledWSGIServer(host, port, create_app(), threads)
+
+
+def serve(host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, threads: int = DEFAULT_THREADS) -> None:
+    """Lance le serveur jusqu'à interruption."""
+    server = make_server(host, port, threads)
+    print(f"Serveur en écoute sur http://{host}:{server.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        database.close_pool()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Point d'entrée de python -m app.server."""
+    parser = argparse.ArgumentParser(description="Serveur HTTP de gestion de contacts.")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--threads", type=int, default=DEFAULT_THREADS, help="threads de traitement des requêtes")
+    args = parser.parse_args(argv)
+    serve(args.host, args.port, args.threads)
+
+
+__all__ = [
+    "create_app",
+    "make_server",
+    "serve",
+    "PooledWSGIServer",
+]
+
+
+if __name__ == "__main__":
+    main()
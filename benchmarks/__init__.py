@@ -0,0 +1,6 @@
+"""
+Benchmarks de performance pour l'application de gestion de contacts.
+
+Chaque script se lance depuis la racine du projet, par exemple :
+    python -m benchmarks.bench_search
+"""
@@ -0,0 +1,75 @@
+"""
+Compare niveau de compression, taille et débit des exports JSON et CSV.
+
+Pour chaque format de compression (aucun, .gz, .bz2, .xz) et chaque
+niveau, l'export est chronométré puis relu par l'import correspondant ;
+le ratio est calculé par rapport à l'export en clair.
+
+Usage :
+    python -m benchmarks.bench_compression --sizes 100k --repeat 3
+"""
+
+import argparse
+import os
+import tempfile
+from typing import List, Optional, Tuple
+
+from app import database, file_handler
+from benchmarks.common import median_ms, parse_sizes, temporary_database, time_calls
+
+# (extension, niveaux testés) ; None = niveau par défaut du format.
+CODECS: List[Tuple[str, List[Optional[int]]]] = [
+    ("", [None]),
+    (".gz", [1, 6, 9]),
+    (".bz2", [1, 9]),
+    (".xz", [0, 6]),
+]
+EXPORTERS = {
+    "json": (file_handler.export_contacts_json, file_handler.import_contacts_json),
+    "csv": (file_handler.export_contacts_csv, file_handler.import_contacts_csv),
+}
+
+
+def run(size: int, repeat: int) -> None:
+    with temporary_database(size) as db_path, tempfile.TemporaryDirectory(prefix="contacts-bench-") as directory:
+        print(f"\n{size} contacts")
+        print(
+            f"{'fichier':<18}{'niveau':>8}{'taille (Mo)':>13}{'ratio':>8}"
+            f"{'export (ms)':>13}{'Mo/s':>8}{'import (ms)':>13}"
+        )
+        for kind, (export, import_) in EXPORTERS.items():
+            plain_size = None
+            for suffix, levels in CODECS:
+                for level in levels:
+                    path = os.path.join(directory, f"contacts.{kind}{suffix}")
+                    export_ms = median_ms(time_calls(lambda: export(path, compresslevel=level), repeat))
+                    file_size = os.path.getsize(path)
+                    if plain_size is None:
+                        plain_size = file_size
+
+                    scratch = os.path.join(directory, "import.db")
+                    os.environ["CONTACTS_DB_PATH"] = scratch
+                    import_ms = median_ms(time_calls(lambda: import_(path), 1))
+                    database.close_pool()
+                    os.remove(scratch)
+                    os.environ["CONTACTS_DB_PATH"] = db_path
+
+                    print(
+                        f"{f'{kind}{suffix}':<18}{'défaut' if level is None else level:>8}"
+                        f"{file_size / 1e6:>13.2f}{plain_size / file_size:>8.1f}"
+                        f"{export_ms:>13.1f}{plain_size / 1e3 / export_ms:>8.1f}{import_ms:>13.1f}"
+                    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", default="100k", help="tailles de table, ex. 100k,1M")
+    parser.add_argument("--repeat", type=int, default=3, help="répétitions par export")
+    args = parser.parse_args()
+
+    for size in parse_sizes(args.sizes):
+        run(size, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
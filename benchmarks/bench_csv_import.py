@@ -0,0 +1,81 @@
+"""
+Mesure l'accélération de import_contacts_csv selon le nombre de workers.
+
+Pour chaque nombre de workers, le benchmark chronomètre l'analyse seule
+(découpage et analyse en parallèle, sans écriture) puis l'import complet
+dans une base vide ; l'accélération est rapportée à workers=1.
+
+Usage :
+    python -m benchmarks.bench_csv_import --sizes 1M --workers 1,2,4,8
+"""
+
+import argparse
+import csv
+import os
+import tempfile
+from itertools import chain
+from typing import List
+
+from app import database, file_handler
+from benchmarks.common import median_ms, parse_sizes, temporary_database, time_calls
+
+
+def _parse_only(path: str, workers: int) -> int:
+    """Analyse le CSV comme l'import parallèle, sans rien écrire."""
+    if workers == 1:
+        with file_handler.open_contacts_file(path, newline='') as f:
+            return sum(1 for _ in csv.DictReader(f))
+    fieldnames, ranges = file_handler._csv_record_ranges(path)
+    tasks = ((path, start, end, fieldnames) for start, end in ranges)
+    return sum(1 for _ in chain.from_iterable(file_handler._parallel_map(file_handler._parse_csv_range, tasks, workers)))
+
+
+def run(size: int, worker_counts: List[int], repeat: int) -> None:
+    with temporary_database(size) as db_path, tempfile.TemporaryDirectory(prefix="contacts-bench-") as directory:
+        path = file_handler.export_contacts_csv(os.path.join(directory, "contacts.csv"))
+        print(f"\n{size} contacts ({os.path.getsize(path) / 1e6:.1f} Mo, {os.cpu_count()} cœurs)")
+        print(f"{'workers':>8}{'analyse (ms)':>15}{'accél.':>9}{'import (ms)':>14}{'accél.':>9}")
+
+        base_parse = base_import = None
+        for workers in worker_counts:
+            parse_ms = median_ms(time_calls(lambda: _parse_only(path, workers), repeat))
+
+            scratch = os.path.join(directory, "import.db")
+            os.environ["CONTACTS_DB_PATH"] = scratch
+            import_ms = median_ms(time_calls(lambda: file_handler.import_contacts_csv(path, workers=workers), 1))
+            database.close_pool()
+            os.remove(scratch)
+            os.environ["CONTACTS_DB_PATH"] = db_path
+
+            base_parse = base_parse or parse_ms
+            base_import = base_import or import_ms
+            print(
+                f"{workers:>8}{parse_ms:>15.1f}{base_parse / parse_ms:>9.2f}"
+                f"{import_ms:>14.1f}{base_import / import_ms:>9.2f}"
+            )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", default="1M", help="tailles de table, ex. 100k,1M")
+    parser.add_argument(
+        "--workers",
+        default=None,
+        help="nombres de workers, ex. 1,2,4 (par défaut : puissances de 2 jusqu'au nombre de cœurs)",
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="répétitions de l'analyse")
+    args = parser.parse_args()
+
+    if args.workers:
+        worker_counts = [int(w) for w in args.workers.split(",")]
+    else:
+        cores = os.cpu_count() or 1
+        worker_counts = [1]
+        while worker_counts[-1] * 2 <= cores:
+            worker_counts.append(worker_counts[-1] * 2)
+    for size in parse_sizes(args.sizes):
+        run(size, worker_counts, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
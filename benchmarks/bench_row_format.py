@@ -0,0 +1,86 @@
+"""
+Mémoire et temps de list_contacts selon row_format ("dict", "tuple",
+"contact").
+
+Chaque format est mesuré dans un processus neuf, qui charge toute la
+table en une liste : le pic de RSS (ru_maxrss) et la mémoire encore
+occupée une fois la liste construite sont comparés à ceux du processus
+avant l'appel.
+
+Usage :
+    python -m benchmarks.bench_row_format --sizes 100k,1M
+"""
+
+import argparse
+import multiprocessing
+import resource
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Optional
+
+from app import database
+from benchmarks.common import parse_sizes, temporary_database
+
+
+def _rss_kb() -> Optional[int]:
+    """Mémoire résidente actuelle du processus en Kio (Linux uniquement)."""
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+    except OSError:
+        return None
+    return pages * resource.getpagesize() // 1024
+
+
+def _peak_rss_kb() -> int:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def measure(db_path: str, row_format: str) -> Dict[str, Optional[float]]:
+    """Charge tous les contacts au format row_format (dans le processus fils)."""
+    conn = database.get_connection(db_path)
+    peak_before = _peak_rss_kb()
+    rss_before = _rss_kb()
+    start = time.perf_counter()
+    contacts = database.list_contacts(conn, row_format=row_format)
+    elapsed = time.perf_counter() - start
+    rss_after = _rss_kb()
+    result = {
+        "rows": len(contacts),
+        "seconds": elapsed,
+        "peak_kb": _peak_rss_kb() - peak_before,
+        "retained_kb": None if rss_before is None else rss_after - rss_before,
+    }
+    conn.close()
+    return result
+
+
+def run(size: int) -> None:
+    with temporary_database(size) as db_path:
+        print(f"\n{size} contacts")
+        print(f"{'format':<10}{'temps (s)':>11}{'pic RSS (Mio)':>15}{'retenu (Mio)':>14}{'octets/contact':>16}")
+        context = multiprocessing.get_context("spawn")
+        for row_format in database.ROW_FORMATS:
+            with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+                result = executor.submit(measure, db_path, row_format).result()
+            retained = result["retained_kb"]
+            per_row = "-" if retained is None or not size else f"{retained * 1024 / size:.0f}"
+            print(
+                f"{row_format:<10}{result['seconds']:>11.2f}{result['peak_kb'] / 1024:>15.1f}"
+                f"{'-' if retained is None else f'{retained / 1024:.1f}':>14}{per_row:>16}"
+            )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", default="100k,1M", help="tailles de table, ex. 100k,1M")
+    args = parser.parse_args()
+
+    for size in parse_sizes(args.sizes):
+        run(size)
+
+
+if __name__ == "__main__":
+    main()
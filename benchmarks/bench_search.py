@@ -0,0 +1,49 @@
+"""
+Compare la recherche LIKE et la recherche FTS5 de search_contacts.
+
+Usage :
+    python -m benchmarks.bench_search --sizes 100k,1M --repeat 5
+"""
+
+import argparse
+
+from app import database
+from benchmarks.common import median_ms, parse_sizes, temporary_database, time_calls
+
+QUERIES = ["Paris", "alice", "mar", "client Lyon", "zzz"]
+
+
+def run(size: int, repeat: int) -> None:
+    with temporary_database(size) as db_path:
+        conn = database.get_connection(db_path)
+        if not database._has_fts(conn):
+            print("FTS5 indisponible : les deux modes utilisent LIKE.")
+
+        print(f"\n{size} contacts")
+        print(f"{'requête':<14}{'like (ms)':>12}{'fts (ms)':>12}{'résultats like/fts':>22}")
+        for query in QUERIES:
+            like_ms = median_ms(time_calls(lambda: database.search_contacts(conn, query), repeat))
+            fts_ms = median_ms(time_calls(lambda: database.search_contacts(conn, query, mode="fts"), repeat))
+            like_count = len(database.search_contacts(conn, query))
+            fts_count = len(database.search_contacts(conn, query, mode="fts"))
+            print(f"{query:<14}{like_ms:>12.2f}{fts_ms:>12.2f}{f'{like_count}/{fts_count}':>22}")
+        conn.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", default="100k,1M", help="tailles de table, ex. 100k,1M")
+    parser.add_argument("--repeat", type=int, default=5, help="répétitions par requête")
+    args = parser.parse_args()
+
+    # Sans cache de résultats, chaque appel mesure la requête SQL elle-même.
+    database.configure_cache(max_size=0)
+    try:
+        for size in parse_sizes(args.sizes):
+            run(size, args.repeat)
+    finally:
+        database.configure_cache()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Mesure le coût par appel de get_contact et create_contact : requêtes
+construites par f-strings (ancienne implémentation) contre requêtes
+paramétrées servies par le cache de requêtes de sqlite3.
+
+Usage :
+    python -m benchmarks.bench_statements --calls 20000
+"""
+
+import argparse
+import sqlite3
+import time
+
+from app import database
+from benchmarks.common import temporary_database
+
+
+def legacy_get_contact(conn: sqlite3.Connection, contact_id: int) -> None:
+    """get_contact d'origine : un texte SQL différent à chaque id."""
+    cursor = conn.cursor()
+    cursor.execute(f"SELECT id, name, email, phone, notes FROM contacts WHERE id = {contact_id}")
+    cursor.fetchone()
+
+
+def legacy_create_contact(conn: sqlite3.Connection, name: str, email: str, phone: str, notes: str) -> None:
+    """create_contact d'origine : valeurs interpolées dans le SQL."""
+    cursor = conn.cursor()
+    cursor.execute(
+        "INSERT INTO contacts (name, email, phone, notes) "
+        f"VALUES ('{name}', '{email}', '{phone}', '{notes}')"
+    )
+    conn.commit()
+
+
+def per_call_us(func, calls: int) -> float:
+    start = time.perf_counter()
+    for i in range(calls):
+        func(i)
+    return (time.perf_counter() - start) / calls * 1e6
+
+
+def run(calls: int) -> None:
+    with temporary_database(calls) as db_path:
+        print(f"{calls} appels par mesure (synchronous=OFF pour isoler l'analyse SQL)")
+        print(f"{'variante':<34}{'get (µs)':>12}{'create (µs)':>14}")
+        variants = [
+            ("f-strings (ancien code)", 0, legacy_get_contact, legacy_create_contact),
+            ("paramétrée, cache désactivé", 0, database.get_contact, database.create_contact),
+            ("paramétrée, cache par défaut", database.DEFAULT_CACHED_STATEMENTS,
+             database.get_contact, database.create_contact),
+        ]
+        for label, cache_size, get_func, create_func in variants:
+            conn = database.get_connection(db_path, cached_statements=cache_size)
+            conn.execute("PRAGMA synchronous = OFF")
+            get_us = per_call_us(lambda i: get_func(conn, i % calls + 1), calls)
+            create_us = per_call_us(
+                lambda i: create_func(conn, f"Nom {i}", f"n{i}@example.com", "0600000000", "note"), calls
+            )
+            conn.close()
+            print(f"{label:<34}{get_us:>12.1f}{create_us:>14.1f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--calls", type=int, default=20000, help="nombre d'appels par boucle")
+    args = parser.parse_args()
+    # Sans cache de résultats, get_contact relit vraiment la ligne.
+    database.configure_cache(max_size=0)
+    try:
+        run(args.calls)
+    finally:
+        database.configure_cache()
+
+
+if __name__ == "__main__":
+    main()
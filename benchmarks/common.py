@@ -0,0 +1,96 @@
+"""
+Outils partagés par les benchmarks : génération de contacts synthétiques,
+bases temporaires et mesure du temps.
+"""
+
+import os
+import random
+import shutil
+import statistics
+import tempfile
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterator, List, Tuple
+
+from app import database
+
+FIRST_NAMES = [
+    "Alice", "Bob", "Chloé", "David", "Emma", "Farid", "Gabriel", "Hugo",
+    "Inès", "Jules", "Karim", "Léa", "Manon", "Nathan", "Océane", "Paul",
+]
+LAST_NAMES = [
+    "Martin", "Bernard", "Dubois", "Thomas", "Robert", "Richard", "Petit",
+    "Durand", "Leroy", "Moreau", "Simon", "Laurent", "Lefebvre", "Michel",
+]
+CITIES = [
+    "Paris", "Lyon", "Marseille", "Toulouse", "Nice", "Nantes", "Strasbourg",
+    "Montpellier", "Bordeaux", "Lille", "Rennes", "Reims", "Grenoble",
+]
+WORDS = ["ami", "collègue", "client", "fournisseur", "voisin", "famille", "sport", "projet"]
+
+
+def synthetic_contacts(count: int, seed: int = 42) -> Iterator[Tuple[str, str, str, str]]:
+    """Génère count contacts (name, email, phone, notes) reproductibles."""
+    rng = random.Random(seed)
+    for i in range(count):
+        first = rng.choice(FIRST_NAMES)
+        last = rng.choice(LAST_NAMES)
+        name = f"{first} {last}"
+        email = f"{first.lower()}.{last.lower()}{i}@example.com"
+        phone = f"0{rng.randint(100000000, 999999999)}"
+        notes = f"{rng.choice(WORDS)} {rng.choice(CITIES)} {rng.choice(WORDS)}"
+        yield (name, email, phone, notes)
+
+
+@contextmanager
+def temporary_database(count: int = 0) -> Iterator[str]:
+    """
+    Crée une base temporaire contenant count contacts synthétiques et
+    la désigne via CONTACTS_DB_PATH le temps du bloc with.
+    """
+    directory = tempfile.mkdtemp(prefix="contacts-bench-")
+    db_path = os.path.join(directory, "bench.db")
+    old_db = os.environ.get("CONTACTS_DB_PATH")
+    os.environ["CONTACTS_DB_PATH"] = db_path
+    try:
+        if count:
+            conn = database.get_connection(db_path)
+            database.create_contacts(conn, synthetic_contacts(count))
+            conn.close()
+        yield db_path
+    finally:
+        database.close_pool()
+        if old_db is None:
+            os.environ.pop("CONTACTS_DB_PATH", None)
+        else:
+            os.environ["CONTACTS_DB_PATH"] = old_db
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+def time_calls(func: Callable[[], object], repeat: int) -> List[float]:
+    """Appelle func repeat fois et retourne les durées en secondes."""
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        durations.append(time.perf_counter() - start)
+    return durations
+
+
+def median_ms(durations: List[float]) -> float:
+    """Médiane d'une liste de durées, en millisecondes."""
+    return statistics.median(durations) * 1000.0
+
+
+def parse_sizes(value: str) -> List[int]:
+    """Convertit "100k,1M" en [100000, 1000000]."""
+    sizes = []
+    for part in value.split(","):
+        part = part.strip().lower()
+        factor = 1
+        if part.endswith("k"):
+            factor, part = 1000, part[:-1]
+        elif part.endswith("m"):
+            factor, part = 1000000, part[:-1]
+        sizes.append(int(float(part) * factor))
+    return sizes
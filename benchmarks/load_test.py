@@ -0,0 +1,145 @@
+"""
+Test de charge du serveur HTTP (app/server.py).
+
+Sans --url, un serveur local est démarré sur un port libre, sur une base
+temporaire de --size contacts. --concurrency clients envoient ensuite
+des requêtes pendant --duration secondes (lecture par id, recherche,
+page de liste, et un export complet par client) ; le débit et les
+latences p50/p99 sont affichés par route.
+
+Usage :
+    python -m benchmarks.load_test --size 100k --concurrency 16 --duration 10
+    python -m benchmarks.load_test --url http://127.0.0.1:5000 --size 100k
+"""
+
+import argparse
+import http.client
+import logging
+import random
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+from urllib.parse import quote, urlsplit
+
+from benchmarks.common import parse_sizes, temporary_database
+
+SEARCH_QUERIES = ["Paris", "alice", "mar", "client", "zzz"]
+
+
+@contextmanager
+def local_server(size: int, threads: int) -> Iterator[str]:
+    """Démarre app.server sur une base temporaire et retourne son URL."""
+    from app import server
+
+    # Le journal de chaque requête fausserait la mesure.
+    logging.getLogger("werkzeug").setLevel(logging.WARNING)
+    with temporary_database(size):
+        httpd = server.make_server("127.0.0.1", 0, threads)
+        thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+        thread.start()
+        try:
+            yield f"http://127.0.0.1:{httpd.port}"
+        finally:
+            httpd.shutdown()
+            httpd.server_close()
+
+
+def _request(host: str, port: int, path: str) -> int:
+    """Envoie GET path, lit toute la réponse et retourne le code HTTP."""
+    conn = http.client.HTTPConnection(host, port, timeout=60)
+    try:
+        conn.request("GET", path)
+        response = conn.getresponse()
+        response.read()
+        return response.status
+    finally:
+        conn.close()
+
+
+def _client(
+    url: str,
+    size: int,
+    deadline: float,
+    seed: int,
+    latencies: Dict[str, List[float]],
+    errors: Dict[str, int],
+    lock: threading.Lock,
+) -> None:
+    parts = urlsplit(url)
+    rng = random.Random(seed)
+    routes = [
+        ("GET /contacts/<id>", lambda: f"/contacts/{rng.randint(1, max(size, 1))}"),
+        ("GET /contacts/search", lambda: f"/contacts/search?q={quote(rng.choice(SEARCH_QUERIES))}&mode=fts&limit=50"),
+        ("GET /contacts", lambda: f"/contacts?after_id={rng.randint(0, max(size - 100, 0))}&limit=100"),
+    ]
+    local: Dict[str, List[float]] = defaultdict(list)
+    failed: Dict[str, int] = defaultdict(int)
+
+    def timed(route: str, path: str) -> None:
+        start = time.perf_counter()
+        try:
+            status = _request(parts.hostname, parts.port, path)
+        except OSError:
+            status = None
+        local[route].append(time.perf_counter() - start)
+        if status is None or status >= 400 and status != 404:
+            failed[route] += 1
+
+    timed("GET /export/jsonl", "/export/jsonl")
+    while time.perf_counter() < deadline:
+        route, make_path = rng.choice(routes)
+        timed(route, make_path())
+
+    with lock:
+        for route, values in local.items():
+            latencies[route].extend(values)
+        for route, count in failed.items():
+            errors[route] += count
+
+
+def run(url: str, size: int, concurrency: int, duration: float) -> None:
+    latencies: Dict[str, List[float]] = defaultdict(list)
+    errors: Dict[str, int] = defaultdict(int)
+    lock = threading.Lock()
+    start = time.perf_counter()
+    clients = [
+        threading.Thread(target=_client, args=(url, size, start + duration, i, latencies, errors, lock))
+        for i in range(concurrency)
+    ]
+    for client in clients:
+        client.start()
+    for client in clients:
+        client.join()
+    elapsed = time.perf_counter() - start
+
+    total = sum(len(values) for values in latencies.values())
+    print(f"\n{url} — {size} contacts, {concurrency} clients, {elapsed:.1f} s : {total / elapsed:.0f} requêtes/s")
+    print(f"{'route':<24}{'requêtes':>10}{'erreurs':>9}{'p50 (ms)':>11}{'p99 (ms)':>11}")
+    for route in sorted(latencies):
+        ordered = sorted(latencies[route])
+        p50 = ordered[len(ordered) // 2] * 1000.0
+        p99 = ordered[min(len(ordered) - 1, int(0.99 * len(ordered)))] * 1000.0
+        print(f"{route:<24}{len(ordered):>10}{errors[route]:>9}{p50:>11.2f}{p99:>11.2f}")
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--url", help="serveur déjà lancé (par défaut : serveur local temporaire)")
+    parser.add_argument("--size", default="10k", help="nombre de contacts de la base, ex. 100k")
+    parser.add_argument("--concurrency", type=int, default=16, help="clients simultanés")
+    parser.add_argument("--duration", type=float, default=10.0, help="durée du test en secondes")
+    parser.add_argument("--threads", type=int, default=8, help="threads du serveur local")
+    args = parser.parse_args(argv)
+
+    size = parse_sizes(args.size)[0]
+    if args.url:
+        run(args.url, size, args.concurrency, args.duration)
+    else:
+        with local_server(size, args.threads) as url:
+            run(url, size, args.concurrency, args.duration)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,306 @@
+"""
+Suite de benchmarks de la couche base de données et des imports/exports.
+
+Pour chaque taille de table, une base modèle est remplie de contacts
+synthétiques ; chaque scénario s'exécute ensuite dans un processus neuf
+sur une copie de cette base, afin que le pic de RSS mesuré lui soit propre.
+Les résultats (débit, latences p50/p99, pic de RSS) sont écrits en JSON
+pour pouvoir comparer les exécutions dans le temps.
+
+Usage :
+    python -m benchmarks.suite --sizes 10k,100k,1M --output bench_results.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from app import cli, database, file_handler
+from benchmarks.common import parse_sizes, synthetic_contacts
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+DEFAULT_SIZES = "10k,100k,1M"
+DEFAULT_OPS = 1000
+SEARCH_QUERIES = ["Paris", "alice", "mar", "client", "zzz"]
+GET_HOT_IDS = 100
+
+# Un scénario reçoit (chemin de la base, taille, nombre d'opérations,
+# répertoire de travail) et retourne (durées en secondes, lignes traitées).
+Scenario = Callable[[str, int, int, str], Tuple[List[float], int]]
+SCENARIOS: Dict[str, Scenario] = {}
+
+
+def scenario(name: str) -> Callable[[Scenario], Scenario]:
+    """Enregistre une fonction de scénario sous name."""
+    def register(func: Scenario) -> Scenario:
+        SCENARIOS[name] = func
+        return func
+    return register
+
+
+def _timed_loop(ops: int, func: Callable[[int], Any]) -> List[float]:
+    durations = []
+    for i in range(ops):
+        start = time.perf_counter()
+        func(i)
+        durations.append(time.perf_counter() - start)
+    return durations
+
+
+def _timed_once(func: Callable[[], Any]) -> List[float]:
+    start = time.perf_counter()
+    func()
+    return [time.perf_counter() - start]
+
+
+@scenario("database.create_contact")
+def _bench_create(db_path: str, size: int, ops: int, workdir: str) -> Tuple[List[float], int]:
+    with database.connection() as conn:
+        durations = _timed_loop(
+            ops, lambda i: database.create_contact(conn, f"Nouveau {i}", f"new{i}@example.com", "0600000000", "")
+        )
+    return durations, ops
+
+
+def _bench_get(cached: bool = False) -> Scenario:
+    def run(db_path: str, size: int, ops: int, workdir: str) -> Tuple[List[float], int]:
+        # Sans cache, chaque appel relit la ligne ; avec, les appels tirent
+        # parmi GET_HOT_IDS ids et mesurent le chemin des hits.
+        database.configure_cache(max_size=database.DEFAULT_CACHE_SIZE if cached else 0)
+        rng = random.Random(1)
+        highest = min(size, GET_HOT_IDS) if cached else size
+        try:
+            with database.connection() as conn:
+                durations = _timed_loop(ops, lambda i: database.get_contact(conn, rng.randint(1, highest)))
+        finally:
+            database.configure_cache()
+        return durations, ops
+    return run
+
+
+scenario("database.get_contact")(_bench_get())
+scenario("database.get_contact[cached]")(_bench_get(cached=True))
+
+
+@scenario("database.update_contact")
+def _bench_update(db_path: str, size: int, ops: int, workdir: str) -> Tuple[List[float], int]:
+    rng = random.Random(2)
+    with database.connection() as conn:
+        durations = _timed_loop(
+            ops, lambda i: database.update_contact(conn, rng.randint(1, size), notes=f"maj {i}")
+        )
+    return durations, ops
+
+
+@scenario("database.delete_contact")
+def _bench_delete(db_path: str, size: int, ops: int, workdir: str) -> Tuple[List[float], int]:
+    ids = random.Random(3).sample(range(1, size + 1), min(ops, size))
+    with database.connection() as conn:
+        durations = _timed_loop(len(ids), lambda i: database.delete_contact(conn, ids[i]))
+    return durations, len(ids)
+
+
+def _bench_search(mode: str, cached: bool = False) -> Scenario:
+    def run(db_path: str, size: int, ops: int, workdir: str) -> Tuple[List[float], int]:
+        # Sans cache, chaque appel mesure la requête SQL elle-même.
+        database.configure_cache(max_size=database.DEFAULT_CACHE_SIZE if cached else 0)
+        count = ops if cached else min(ops, 50)
+        try:
+            with database.connection() as conn:
+                durations = _timed_loop(
+                    count,
+                    lambda i: database.search_contacts(conn, SEARCH_QUERIES[i % len(SEARCH_QUERIES)], mode=mode),
+                )
+        finally:
+            database.configure_cache()
+        return durations, count
+    return run
+
+
+scenario("database.search_contacts[like]")(_bench_search(database.SEARCH_MODE_LIKE))
+scenario("database.search_contacts[fts]")(_bench_search(database.SEARCH_MODE_FTS))
+scenario("database.search_contacts[prefix]")(_bench_search(database.SEARCH_MODE_PREFIX))
+scenario("database.search_contacts[fts,cached]")(_bench_search(database.SEARCH_MODE_FTS, cached=True))
+
+
+def _bench_export(func: Callable[[str], str], filename: str) -> Scenario:
+    def run(db_path: str, size: int, ops: int, workdir: str) -> Tuple[List[float], int]:
+        return _timed_once(lambda: func(os.path.join(workdir, filename))), size
+    return run
+
+
+scenario("file_handler.export_contacts_json")(_bench_export(file_handler.export_contacts_json, "export.json"))
+scenario("file_handler.export_contacts_csv")(_bench_export(file_handler.export_contacts_csv, "export.csv"))
+scenario("file_handler.export_contacts_jsonl")(_bench_export(file_handler.export_contacts_jsonl, "export.jsonl"))
+scenario("file_handler.save_backup")(_bench_export(file_handler.save_backup, "backup.json"))
+scenario("cli.export_contacts_html")(_bench_export(cli.export_contacts_html, "export.html"))
+
+
+def _bench_import(export: Callable[[str], str], load: Callable[[str], int], filename: str) -> Scenario:
+    def run(db_path: str, size: int, ops: int, workdir: str) -> Tuple[List[float], int]:
+        source = export(os.path.join(workdir, filename))
+        database.close_pool()
+        os.remove(db_path)
+        result = {}
+        durations = _timed_once(lambda: result.setdefault("rows", load(source)))
+        return durations, result["rows"]
+    return run
+
+
+scenario("file_handler.import_contacts_json")(
+    _bench_import(file_handler.export_contacts_json, file_handler.import_contacts_json, "import.json")
+)
+scenario("file_handler.import_contacts_csv")(
+    _bench_import(file_handler.export_contacts_csv, file_handler.import_contacts_csv, "import.csv")
+)
+scenario("file_handler.import_contacts_jsonl")(
+    _bench_import(file_handler.export_contacts_jsonl, file_handler.import_contacts_jsonl, "import.jsonl")
+)
+scenario("file_handler.restore_backup")(
+    _bench_import(file_handler.save_backup, file_handler.restore_backup, "restore.json")
+)
+
+
+def _peak_rss_kb() -> Optional[int]:
+    """Pic de mémoire résidente du processus, en Kio."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def _percentile(sorted_values: List[float], q: float) -> float:
+    index = min(len(sorted_values) - 1, int(round(q * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def run_scenario(name: str, template_path: str, size: int, ops: int) -> Dict[str, Any]:
+    """
+    Exécute un scénario sur une copie de la base modèle et retourne ses
+    mesures.
+    """
+    workdir = tempfile.mkdtemp(prefix="contacts-bench-")
+    db_path = os.path.join(workdir, "bench.db")
+    shutil.copyfile(template_path, db_path)
+    old_db = os.environ.get("CONTACTS_DB_PATH")
+    os.environ["CONTACTS_DB_PATH"] = db_path
+    try:
+        durations, rows = SCENARIOS[name](db_path, size, ops, workdir)
+    finally:
+        database.close_pool()
+        if old_db is None:
+            os.environ.pop("CONTACTS_DB_PATH", None)
+        else:
+            os.environ["CONTACTS_DB_PATH"] = old_db
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    total = sum(durations)
+    ordered = sorted(durations)
+    return {
+        "scenario": name,
+        "size": size,
+        "calls": len(durations),
+        "rows": rows,
+        "seconds": total,
+        "rows_per_second": rows / total if total > 0 else None,
+        "p50_ms": _percentile(ordered, 0.50) * 1000.0,
+        "p99_ms": _percentile(ordered, 0.99) * 1000.0,
+        "peak_rss_kb": _peak_rss_kb(),
+    }
+
+
+def build_template(size: int, directory: str) -> str:
+    """Crée la base modèle contenant size contacts synthétiques."""
+    template_path = os.path.join(directory, f"template-{size}.db")
+    conn = database.get_connection(template_path)
+    database.create_contacts(conn, synthetic_contacts(size))
+    conn.close()
+    return template_path
+
+
+def run_suite(
+    sizes: List[int],
+    ops: int = DEFAULT_OPS,
+    names: Optional[List[str]] = None,
+    isolate: bool = True,
+) -> Dict[str, Any]:
+    """
+    Exécute les scénarios demandés pour chaque taille.
+
+    Avec isolate=True, chaque scénario tourne dans un processus neuf
+    (pic de RSS propre au scénario).
+    """
+    names = names or list(SCENARIOS)
+    unknown = [n for n in names if n not in SCENARIOS]
+    if unknown:
+        raise ValueError(f"Scénarios inconnus : {', '.join(unknown)}")
+
+    results = []
+    directory = tempfile.mkdtemp(prefix="contacts-bench-templates-")
+    try:
+        for size in sizes:
+            template_path = build_template(size, directory)
+            for name in names:
+                if isolate:
+                    with ProcessPoolExecutor(max_workers=1, mp_context=get_context("spawn")) as executor:
+                        result = executor.submit(run_scenario, name, template_path, size, ops).result()
+                else:
+                    result = run_scenario(name, template_path, size, ops)
+                results.append(result)
+                print(
+                    f"{size:>9} {name:<40} {result['seconds']:>9.3f} s "
+                    f"p50 {result['p50_ms']:>9.3f} ms  p99 {result['p99_ms']:>9.3f} ms  "
+                    f"rss {result['peak_rss_kb']} Kio",
+                    file=sys.stderr,
+                )
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+    return {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "platform": platform.platform(),
+            "profile": database.active_profile(),
+            "ops": ops,
+        },
+        "results": results,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help="tailles de table, ex. 10k,100k,1M")
+    parser.add_argument("--ops", type=int, default=DEFAULT_OPS, help="opérations par scénario unitaire")
+    parser.add_argument("--scenario", action="append", dest="scenarios", help="scénario à exécuter (répétable)")
+    parser.add_argument("--output", default="bench_results.json", help="fichier JSON de résultats")
+    parser.add_argument("--list", action="store_true", help="affiche les scénarios disponibles")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        print("\n".join(SCENARIOS))
+        return
+
+    report = run_suite(parse_sizes(args.sizes), args.ops, args.scenarios)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"Résultats écrits dans {args.output}")
+
+
+if __name__ == "__main__":
+    main()
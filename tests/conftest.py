@@ -0,0 +1,15 @@
+import pytest
+
+from app import database
+
+
+@pytest.fixture
+def contacts_db(tmp_path, monkeypatch):
+    """
+    Fixture qui pointe CONTACTS_DB_PATH vers une base temporaire et ferme
+    les connexions du pool à la fin du test.
+    """
+    db_path = tmp_path / "contacts.db"
+    monkeypatch.setenv("CONTACTS_DB_PATH", str(db_path))
+    yield db_path
+    database.close_pool()
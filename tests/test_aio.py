@@ -0,0 +1,46 @@
+import asyncio
+import os
+
+import pytest
+
+from app import aio
+
+
+@pytest.fixture(autouse=True)
+def async_db(contacts_db, tmp_path):
+    """Fixture qui arrête l'exécuteur à la fin du test (base temporaire)."""
+    yield tmp_path
+    aio.shutdown()
+
+
+def test_async_crud_and_concurrent_calls():
+    async def scenario():
+        ids = await asyncio.gather(
+            *(aio.create_contact(f"Contact {i}", f"c{i}@example.com") for i in range(20))
+        )
+        assert sorted(ids) == list(range(1, 21))
+
+        await aio.update_contact(ids[0], notes="modifié")
+        assert (await aio.get_contact(ids[0]))["notes"] == "modifié"
+        await aio.delete_contact(ids[1])
+
+        contacts, matches = await asyncio.gather(aio.list_contacts(), aio.search_contacts("c1"))
+        assert len(contacts) == 19
+        assert {c["email"] for c in matches} >= {"c10@example.com", "c19@example.com"}
+
+    asyncio.run(scenario())
+
+
+def test_async_iterators_and_file_io(async_db):
+    async def scenario():
+        await aio.create_contacts(("Contact %d" % i, f"c{i}@example.com", "", "") for i in range(25))
+        names = [c["name"] async for c in aio.iter_contacts(chunk_size=10)]
+        assert names == ["Contact %d" % i for i in range(25)]
+        matches = [c async for c in aio.iter_search_contacts("Contact 1", chunk_size=4)]
+        assert len(matches) == 11
+
+        path = await aio.export_contacts_jsonl(os.path.join(str(async_db), "out", "contacts.jsonl"))
+        assert await aio.import_contacts_jsonl(path, workers=1) == 25
+        assert len(await aio.list_contacts()) == 50
+
+    asyncio.run(scenario())
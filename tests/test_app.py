@@ -8,8 +8,12 @@ fonctions utilitaires sans interaction utilisateur directe.
 import os
 import tempfile
 
+import pytest
+
 from app import database
 from app import cli
+from app import file_handler
+from app import profiling
 
 
 def test_export_contacts_html_cree_fichier_et_contenu():
@@ -44,8 +48,11 @@ def test_export_contacts_html_cree_fichier_et_contenu():
         result_path = cli.export_contacts_html(html_path)
 
         assert os.path.exists(result_path)
+        page_path = cli._html_page_path(result_path, 1)
 
         with open(result_path, "r", encoding="utf-8") as f:
+            assert os.path.basename(page_path) in f.read()
+        with open(page_path, "r", encoding="utf-8") as f:
             content = f.read()
 
         # Le nom et les notes du contact doivent apparaître dans le HTML
@@ -61,8 +68,35 @@ def test_export_contacts_html_cree_fichier_et_contenu():
         if os.path.exists(db_path):
             os.remove(db_path)
 
-        if os.path.exists(html_path):
-            os.remove(html_path)
+        for path in (html_path, cli._html_page_path(html_path, 1)):
+            if os.path.exists(path):
+                os.remove(path)
+
+
+def test_export_contacts_html_pagine(tmp_path, contacts_db):
+    """L'export HTML est découpé en pages reliées entre elles et à l'index."""
+    with database.connection() as conn:
+        database.create_contacts(conn, [(f"Contact {i}", f"c{i}@example.com", "", "") for i in range(5)])
+
+    index_path = str(tmp_path / "export" / "contacts.html")
+    os.makedirs(os.path.dirname(index_path))
+    assert cli.main(["export", "html", index_path, "--page-size", "2"]) == 0
+
+    pages = sorted(os.listdir(os.path.dirname(index_path)))
+    assert pages == ["contacts-0001.html", "contacts-0002.html", "contacts-0003.html", "contacts.html"]
+    index = (tmp_path / "export" / "contacts.html").read_text(encoding="utf-8")
+    assert "ids 5 à 5" in index and "contacts-0003.html" in index
+
+    middle = (tmp_path / "export" / "contacts-0002.html").read_text(encoding="utf-8")
+    assert middle.count("<td>Contact") == 2
+    assert "contacts-0001.html" in middle and "contacts-0003.html" in middle
+    last = (tmp_path / "export" / "contacts-0003.html").read_text(encoding="utf-8")
+    assert "contacts-0004.html" not in last and "Contact 4" in last
+
+    # Un nouvel export plus court ne laisse pas de pages périmées.
+    assert cli.main(["export", "html", index_path, "--page-size", "4"]) == 0
+    pages = sorted(os.listdir(os.path.dirname(index_path)))
+    assert pages == ["contacts-0001.html", "contacts-0002.html", "contacts.html"]
 
 
 def test_handle_list_contacts_ne_crashe_pas_sans_contact(capsys):
@@ -91,3 +125,134 @@ def test_handle_list_contacts_ne_crashe_pas_sans_contact(capsys):
             os.remove(db_path)
 
 
+def test_handle_list_contacts_pagine(capsys, monkeypatch):
+    """Vérifie la navigation page suivante / précédente de la liste."""
+    fd, db_path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    if os.path.exists(db_path):
+        os.remove(db_path)
+
+    old_db = os.environ.get("CONTACTS_DB_PATH")
+    os.environ["CONTACTS_DB_PATH"] = db_path
+
+    try:
+        conn = database.get_connection()
+        for i in range(5):
+            database.create_contact(conn, f"Contact{i}", f"c{i}@example.com")
+        conn.close()
+
+        monkeypatch.setattr(cli, "PAGE_SIZE", 2)
+        commands = iter(["n", "n", "p", "q"])
+        monkeypatch.setattr("builtins.input", lambda prompt="": next(commands))
+
+        cli.handle_list_contacts()
+        out = capsys.readouterr().out
+
+        # Pages affichées : 1, 2, 3 puis retour à la 2
+        assert out.count("Contact0") == 1
+        assert out.count("Contact2") == 2
+        assert out.count("Contact4") == 1
+        assert "-- Page 3 --" in out
+    finally:
+        if old_db:
+            os.environ["CONTACTS_DB_PATH"] = old_db
+        elif "CONTACTS_DB_PATH" in os.environ:
+            del os.environ["CONTACTS_DB_PATH"]
+
+        if os.path.exists(db_path):
+            os.remove(db_path)
+
+
+def test_main_commandes_non_interactives(capsys, contacts_db):
+    """Vérifie les sous-commandes add / list du mode non interactif."""
+    assert cli.main(["add", "--name", "Alice", "--email", "alice@example.com"]) == 0
+    assert cli.main(["list", "--json"]) == 0
+
+    out = capsys.readouterr().out.splitlines()
+    assert out[0] == "1"
+    assert '"name": "Alice"' in out[1]
+    assert cli.main(["delete", "pas-un-id"]) == 1
+
+
+def test_main_batch_une_seule_transaction(capsys, monkeypatch, tmp_path, contacts_db):
+    """Un lot en erreur est entièrement annulé, un lot valide est appliqué."""
+    import io
+
+    monkeypatch.setattr("sys.stdin", io.StringIO(
+        "add --name Alice --email alice@example.com\n"
+        "add --name 'Bob B' --email bob@example.com\n"
+        "update 1 --notes Paris\n"
+    ))
+    assert cli.main(["batch"]) == 0
+
+    batch_path = tmp_path / "ops.txt"
+    batch_path.write_text("# lot invalide\ndelete 1\ncommande-inconnue\n", encoding="utf-8")
+    assert cli.main(["batch", str(batch_path)]) == 1
+
+    with database.connection() as conn:
+        contacts = database.list_contacts(conn)
+    assert [c["name"] for c in contacts] == ["Alice", "Bob B"]
+    assert contacts[0]["notes"] == "Paris"
+    assert "ligne 3" in capsys.readouterr().err
+
+    changes_path = tmp_path / "changes.jsonl"
+    changes_path.write_text('{"id": 1, "phone": "01"}\n{"id": 2, "phone": "02"}\n', encoding="utf-8")
+    batch_path.write_text(f"update-many {changes_path}\ndelete 1 3\n", encoding="utf-8")
+    assert cli.main(["batch", str(batch_path)]) == 0
+    assert capsys.readouterr().out.splitlines() == ["2", "1"]
+    with database.connection() as conn:
+        assert [(c["id"], c["phone"]) for c in database.list_contacts(conn)] == [(2, "02")]
+
+
+@pytest.mark.parametrize("line, message", [
+    ("restore sauvegarde.db", "ligne 2 : restore n'est pas disponible dans un lot"),
+    ("backup sauvegarde.db", "ligne 2 : backup n'est pas disponible dans un lot"),
+    ("add --help", "ligne 2 : option sans commande à exécuter"),
+])
+def test_main_batch_refuse_commandes(capsys, monkeypatch, contacts_db, line, message):
+    """backup, restore et --help sont signalés avec leur numéro de ligne."""
+    import io
+
+    monkeypatch.setattr("sys.stdin", io.StringIO(f"add --name Alice --email alice@example.com\n{line}\n"))
+    assert cli.main(["batch"]) == 1
+    assert message in capsys.readouterr().err
+    with database.connection() as conn:
+        assert database.list_contacts(conn) == []
+
+
+def test_main_profile(capsys, tmp_path, contacts_db):
+    """--profile affiche les durées par opération et par requête SQL."""
+    import pstats
+
+    pstats_path = tmp_path / "cli.pstats"
+
+    assert cli.main(["--profile", "add", "--name", "Alice", "--email", "alice@example.com",
+                     "--cprofile", str(pstats_path)]) == 0
+
+    err = capsys.readouterr().err
+    assert "database.create_contact" in err
+    assert "INSERT INTO contacts (name, email, phone, notes) VALUES (?, ?, ?, ?)" in err
+    assert pstats.Stats(str(pstats_path)).total_calls > 0
+    assert not profiling.is_enabled()
+    assert database.create_contact.__name__ == "create_contact"
+    assert not hasattr(database.create_contact, "__wrapped__")
+
+
+def test_profiling_covers_file_handler(tmp_path, contacts_db):
+    """Imports et exports passent par les fonctions instrumentées de database."""
+    csv_path = tmp_path / "contacts.csv"
+    csv_path.write_text("name,email,phone,notes\nAlice,alice@example.com,,\n", encoding="utf-8")
+
+    profiling.enable()
+    try:
+        profiling.reset()
+        file_handler.import_contacts_csv(str(csv_path))
+        chunks = file_handler.iter_export("csv")
+        assert "file_handler.iter_export" not in profiling.stats()["operations"]
+        assert "alice@example.com" in "".join(chunks)
+        operations = profiling.stats()["operations"]
+    finally:
+        profiling.disable()
+    assert operations["database.create_contacts"]["count"] == 1
+    assert operations["database.iter_contacts"]["count"] == 1
+    assert operations["file_handler.iter_export"]["count"] == 1
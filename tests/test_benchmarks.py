@@ -0,0 +1,16 @@
+"""
+Test de fumée de la suite de benchmarks, à très petite taille.
+"""
+
+from benchmarks import suite
+
+
+def test_run_suite_produit_des_mesures():
+    report = suite.run_suite([50], ops=5, isolate=False)
+
+    assert report["meta"]["profile"] == "durable"
+    assert {r["scenario"] for r in report["results"]} == set(suite.SCENARIOS)
+    for result in report["results"]:
+        assert result["size"] == 50
+        assert result["calls"] >= 1
+        assert result["p50_ms"] <= result["p99_ms"]
@@ -85,4 +85,351 @@ def test_search_contacts_basic(clean_test_db: sqlite3.Connection):
     assert results[0]["name"] == "Alice"
 
 
+def test_pool_reuses_connection_per_thread():
+    with database.connection(TEST_DB_PATH) as first:
+        with database.connection(TEST_DB_PATH) as nested:
+            assert nested is first
+    with database.connection(TEST_DB_PATH) as again:
+        assert again is first
+    database.close_pool()
 
+
+def test_pool_reopens_replaced_database_file():
+    with database.connection(TEST_DB_PATH) as conn:
+        database.create_contact(conn, "Alice", "alice@example.com")
+
+    os.remove(TEST_DB_PATH)
+
+    with database.connection(TEST_DB_PATH) as conn:
+        assert database.list_contacts(conn) == []
+    database.close_pool()
+
+
+def test_create_contacts_inserts_in_batches(clean_test_db: sqlite3.Connection):
+    conn = clean_test_db
+    rows = (
+        {"name": f"Contact {i}", "email": f"c{i}@example.com"} if i % 2 else
+        (f"Contact {i}", f"c{i}@example.com", "", "")
+        for i in range(25)
+    )
+
+    count = database.create_contacts(conn, rows, batch_size=10)
+
+    assert count == 25
+    assert len(database.list_contacts(conn)) == 25
+
+
+def test_iter_contacts_reads_in_chunks(clean_test_db: sqlite3.Connection):
+    conn = clean_test_db
+    database.create_contacts(conn, ((f"C{i}", f"c{i}@example.com", "", "") for i in range(7)))
+
+    contacts = list(database.iter_contacts(conn, chunk_size=3))
+
+    assert [c["name"] for c in contacts] == [f"C{i}" for i in range(7)]
+    assert contacts == database.list_contacts(conn)
+
+
+def test_search_contacts_fts_prefix(clean_test_db: sqlite3.Connection):
+    conn = clean_test_db
+    database.create_contact(conn, "Alice Martin", "alice@example.com", notes="Paris")
+    bob_id = database.create_contact(conn, "Bob", "bob@example.com", notes="Lyon")
+    database.update_contact(conn, bob_id, notes="Parisien")
+
+    results = database.search_contacts(conn, "pari", mode="fts")
+    assert {c["name"] for c in results} == {"Alice Martin", "Bob"}
+
+    results = database.search_contacts(conn, "ali pari", mode="fts")
+    assert [c["name"] for c in results] == ["Alice Martin"]
+
+
+def test_search_contacts_fts_falls_back_to_like(clean_test_db: sqlite3.Connection, monkeypatch):
+    conn = clean_test_db
+    database.create_contact(conn, "Alice", "alice@example.com", notes="Paris")
+    monkeypatch.setattr(database, "_has_fts", lambda conn: False)
+
+    results = database.search_contacts(conn, "lic", mode="fts")
+    assert [c["name"] for c in results] == ["Alice"]
+
+
+def test_list_and_search_keyset_pagination(clean_test_db: sqlite3.Connection):
+    conn = clean_test_db
+    ids = [database.create_contact(conn, f"Paul {i}", f"p{i}@example.com") for i in range(5)]
+
+    first = database.list_contacts(conn, limit=2)
+    second = database.list_contacts(conn, after_id=first[-1]["id"], limit=2)
+    assert [c["id"] for c in first + second] == ids[:4]
+
+    for mode in ("like", "fts"):
+        page = database.search_contacts(conn, "Paul", mode=mode, after_id=ids[2], limit=10)
+        assert [c["id"] for c in page] == ids[3:]
+
+
+def test_queries_are_parameterized(clean_test_db: sqlite3.Connection):
+    conn = clean_test_db
+    contact_id = database.create_contact(conn, "O'Brien", "ob@example.com", notes="Paris")
+    database.create_contact(conn, "Bob", "bob@example.com", notes="Lyon")
+
+    assert database.search_contacts(conn, "' OR 1=1 --") == []
+    database.update_contact(conn, contact_id, notes="l'été")
+    contact = database.get_contact(conn, contact_id)
+    assert contact["name"] == "O'Brien"
+    assert contact["notes"] == "l'été"
+
+
+def test_migrations_upgrade_legacy_database(tmp_path):
+    db_path = str(tmp_path / "legacy.db")
+    legacy = sqlite3.connect(db_path)
+    legacy.execute(
+        "CREATE TABLE contacts (id INTEGER PRIMARY KEY AUTOINCREMENT, "
+        "name TEXT NOT NULL, email TEXT NOT NULL, phone TEXT, notes TEXT)"
+    )
+    legacy.execute("INSERT INTO contacts (name, email) VALUES ('Alice', 'Alice@Example.com')")
+    legacy.commit()
+    legacy.close()
+
+    conn = database.get_connection(db_path)
+    assert database.schema_version(conn) == database.SCHEMA_VERSION
+    assert database.migrate(conn) == 0
+    indexes = {r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+    assert {"idx_contacts_name", "idx_contacts_email"} <= indexes
+    assert [c["name"] for c in database.get_contacts_by_email(conn, "alice@example.com")] == ["Alice"]
+    conn.close()
+
+
+def test_write_functions_accept_plain_connection(tmp_path):
+    db_path = str(tmp_path / "plain.db")
+    database.get_connection(db_path).close()
+    conn = sqlite3.connect(db_path)
+    conn.row_factory = sqlite3.Row
+
+    contact_id = database.create_contact(conn, "Alice", "alice@example.com")
+    with database.transaction(conn):
+        with database.transaction(conn):
+            database.create_contacts(conn, [("Bob", "bob@example.com", "", "")])
+        database.update_contact(conn, contact_id, name="Alice M.")
+    with pytest.raises(RuntimeError):
+        with database.transaction(conn):
+            database.delete_contact(conn, contact_id)
+            raise RuntimeError("annulation")
+    assert [c["name"] for c in database.list_contacts(conn)] == ["Alice M.", "Bob"]
+    assert database.get_contact(conn, contact_id)["name"] == "Alice M."
+    assert [c["name"] for c in database.search_contacts(conn, "bob")] == ["Bob"]
+    conn.close()
+
+
+def test_email_upsert_tolerates_duplicate_emails(tmp_path):
+    db_path = str(tmp_path / "dupes.db")
+    conn = database.get_connection(db_path)
+    # Index unique laissé par une version précédente : la migration le remplace.
+    conn.execute("DROP INDEX idx_contacts_email_key")
+    conn.execute(
+        "CREATE UNIQUE INDEX idx_contacts_email_key ON contacts (lower(trim(email))) "
+        "WHERE email IS NOT NULL AND trim(email) <> ''"
+    )
+    conn.execute("PRAGMA user_version = 4")
+    conn.commit()
+    assert database.migrate(conn) == 1
+
+    first = database.create_contact(conn, "Alice", "alice@example.com")
+    database.create_contact(conn, "Alice bis", "ALICE@example.com")
+    assert database.upsert_contacts(
+        conn, [("Alice M.", " Alice@Example.com", "0102", ""), ("Bob", "bob@example.com", "", "")], key="email"
+    ) == 2
+    database.create_contact(conn, "Bob bis", "bob@example.com")
+    assert database.get_contact(conn, first)["name"] == "Alice M."
+    assert len(database.get_contacts_by_email(conn, "alice@example.com")) == 2
+    assert len(database.get_contacts_by_email(conn, "bob@example.com")) == 2
+    conn.close()
+
+
+def test_prefix_search_uses_indexes(clean_test_db: sqlite3.Connection):
+    conn = clean_test_db
+    database.create_contacts(conn, [
+        ("Alice", "alice@example.com", "", ""),
+        ("Bob", "bob@alice.org", "", ""),
+        ("alfred_x", "a_x@example.com", "", ""),
+        ("Malik", "ALBERT@example.com", "", ""),
+    ])
+    names = [c["name"] for c in database.search_contacts(conn, "al", mode="prefix")]
+    assert names == ["Alice", "alfred_x", "Malik"]
+    assert [c["name"] for c in database.search_contacts(conn, "alfred_", mode="prefix")] == ["alfred_x"]
+    assert database.search_contacts(conn, "a%", mode="prefix") == []
+
+    plan = " ".join(
+        r[3] for r in conn.execute(
+            "EXPLAIN QUERY PLAN " + database._SQL_SELECT + " WHERE " + database._SQL_PREFIX, ("al%", "al%")
+        )
+    )
+    assert "idx_contacts_name" in plan and "idx_contacts_email" in plan
+
+
+def test_compact_row_formats(clean_test_db: sqlite3.Connection):
+    conn = clean_test_db
+    database.create_contacts(conn, [("Alice", "alice@example.com", "0102", "amie"), ("Bob", "bob@example.com", "", "")])
+
+    rows = database.list_contacts(conn, row_format="tuple")
+    assert rows[0] == (1, "Alice", "alice@example.com", "0102", "amie")
+    assert rows[1][database.CONTACT_FIELDS.index("email")] == "bob@example.com"
+
+    contact = database.list_contacts(conn, limit=1, row_format="contact")[0]
+    assert isinstance(contact, database.Contact)
+    assert (contact.id, contact.email) == (1, "alice@example.com")
+    assert contact._asdict() == database.list_contacts(conn, limit=1)[0]
+    assert not hasattr(contact, "__dict__")
+
+    assert [c.name for c in database.iter_contacts(conn, chunk_size=1, row_format="contact")] == ["Alice", "Bob"]
+    assert database.search_contacts(conn, "bob", row_format="tuple") == [(2, "Bob", "bob@example.com", "", "")]
+    assert database.search_contacts(conn, "bob")[0]["name"] == "Bob"
+    with pytest.raises(ValueError):
+        database.list_contacts(conn, row_format="xml")
+
+
+def test_bulk_update_and_delete(clean_test_db: sqlite3.Connection):
+    conn = clean_test_db
+    database.create_contacts(conn, [(f"Contact {i}", f"c{i}@old.example", "", "") for i in range(10)])
+
+    changes = [
+        {"id": 1, "notes": "vip"},
+        {"id": 2, "email": "c1@new.example", "phone": "01"},
+        {"id": 3},
+        {"id": 99, "name": "X"},
+    ]
+    assert database.update_contacts(conn, changes, batch_size=2) == 2
+    assert database.get_contact(conn, 1)["notes"] == "vip"
+    assert database.get_contact(conn, 2)["email"] == "c1@new.example"
+    assert database.get_contact(conn, 3)["email"] == "c2@old.example"
+
+    assert database.delete_contacts(conn, iter([4, 5, 5, 99]), batch_size=1) == 2
+    assert database.delete_contacts(conn, lambda c: c.email.endswith("@new.example") or c.notes == "vip") == 2
+    assert [c["id"] for c in database.list_contacts(conn)] == [3, 6, 7, 8, 9, 10]
+    assert database.get_contact(conn, 1) is None
+
+    with pytest.raises(ValueError):
+        database.update_contacts(conn, [{"id": 3, "notes": "a"}, {"notes": "sans id"}], batch_size=1)
+    assert database.get_contact(conn, 3)["notes"] == ""
+
+
+def test_connection_profiles(tmp_path, monkeypatch):
+    db_path = str(tmp_path / "profile.db")
+
+    monkeypatch.setenv("CONTACTS_DB_PROFILE", "bulk")
+    conn = database.get_connection(db_path)
+    settings = database.profile_settings(conn)
+    assert database.active_profile(conn) == "bulk"
+    assert settings["journal_mode"] == "wal"
+    assert settings["temp_store"] == 2
+    conn.close()
+
+    monkeypatch.setenv("CONTACTS_DB_PROFILE", "turbo")
+    with pytest.raises(ValueError):
+        database.get_connection(db_path)
+
+
+def test_default_profile_keeps_wal_database_usable(tmp_path, monkeypatch):
+    db_path = str(tmp_path / "wal.db")
+    monkeypatch.setenv("CONTACTS_DB_PROFILE", "balanced")
+    server_conn = database.get_connection(db_path)
+    database.create_contact(server_conn, "Alice", "alice@example.com")
+
+    monkeypatch.delenv("CONTACTS_DB_PROFILE")
+    conn = database.get_connection(db_path)
+    assert database.profile_settings(conn)["journal_mode"] == "wal"
+    database.create_contact(conn, "Bob", "bob@example.com")
+    assert len(database.list_contacts(server_conn)) == 2
+    conn.close()
+    server_conn.close()
+
+
+def test_transaction_defers_commits_and_rolls_back(clean_test_db: sqlite3.Connection):
+    conn = clean_test_db
+    with pytest.raises(RuntimeError):
+        with database.transaction(conn):
+            database.create_contact(conn, "Alice", "alice@example.com")
+            database.create_contacts(conn, [("Bob", "bob@example.com", "", "")])
+            raise RuntimeError("annulation")
+
+    assert database.list_contacts(conn) == []
+
+
+def test_result_cache_invalidated_by_writes(clean_test_db: sqlite3.Connection):
+    conn = clean_test_db
+    contact_id = database.create_contact(conn, "Alice", "alice@example.com")
+    database.configure_cache(max_size=2, ttl=60)
+    try:
+        assert database.get_contact(conn, contact_id)["name"] == "Alice"
+        database.get_contact(conn, contact_id)["name"] = "modifié par l'appelant"
+        assert database.get_contact(conn, contact_id)["name"] == "Alice"
+        assert database.search_contacts(conn, "ali") == database.search_contacts(conn, "ali")
+        stats = database.cache_stats()
+        assert (stats["hits"], stats["misses"]) == (3, 2)
+
+        database.update_contact(conn, contact_id, name="Alicia")
+        assert database.get_contact(conn, contact_id)["name"] == "Alicia"
+        with database.transaction(conn):
+            database.create_contacts(conn, [("Bob", "bob@example.com", "", "")])
+            assert [c["name"] for c in database.search_contacts(conn, "bob")] == ["Bob"]
+        assert [c["name"] for c in database.search_contacts(conn, "bob")] == ["Bob"]
+
+        database.search_contacts(conn, "a")
+        database.search_contacts(conn, "b")
+        assert database.cache_stats()["evictions"] >= 1
+    finally:
+        database.configure_cache()
+
+
+def test_result_cache_sees_writes_from_other_connections(tmp_path):
+    db_path = str(tmp_path / "shared.db")
+    conn = database.get_connection(db_path)
+    contact_id = database.create_contact(conn, "Alice", "alice@example.com")
+    database.configure_cache(max_size=10, ttl=0)
+    try:
+        assert database.get_contact(conn, contact_id)["name"] == "Alice"
+        # Écriture SQL directe, comme depuis un autre processus.
+        other = sqlite3.connect(db_path)
+        other.execute("UPDATE contacts SET name = 'Alicia' WHERE id = ?", (contact_id,))
+        other.commit()
+        other.close()
+        assert database.get_contact(conn, contact_id)["name"] == "Alicia"
+    finally:
+        database.configure_cache()
+        conn.close()
+
+
+def test_result_cache_reads_data_version_once_per_borrow(contacts_db):
+    database.configure_cache(max_size=10, ttl=0)
+    try:
+        with database.connection() as conn:
+            contact_id = database.create_contact(conn, "Alice", "alice@example.com")
+        with database.connection() as conn:
+            statements = []
+            conn.set_trace_callback(statements.append)
+            for _ in range(5):
+                assert database.get_contact(conn, contact_id)["name"] == "Alice"
+            conn.set_trace_callback(None)
+        assert sum("data_version" in sql for sql in statements) == 1
+
+        other = sqlite3.connect(str(contacts_db))
+        other.execute("UPDATE contacts SET name = 'Alicia' WHERE id = ?", (contact_id,))
+        other.commit()
+        other.close()
+        with database.connection() as conn:
+            assert database.get_contact(conn, contact_id)["name"] == "Alicia"
+    finally:
+        database.configure_cache()
+
+
+def test_result_cache_ttl():
+    from app.cache import MISSING, ResultCache
+
+    now = [0.0]
+    cache = ResultCache(max_size=10, ttl=5, clock=lambda: now[0])
+    cache.put("k", 1, cache.generation)
+    assert cache.get("k") == 1
+    now[0] = 6.0
+    assert cache.get("k") is MISSING
+
+    generation = cache.generation
+    cache.invalidate()
+    cache.put("k", "périmé", generation)
+    assert cache.get("k") is MISSING
+    assert cache.stats()["expirations"] == 1
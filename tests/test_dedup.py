@@ -0,0 +1,72 @@
+import pytest
+
+from app import database, dedup
+
+
+pytestmark = pytest.mark.usefixtures("contacts_db")
+
+
+def test_normalization():
+    assert dedup.normalize_email("  Alice+News@Example.COM ") == "alice@example.com"
+    assert dedup.normalize_phone("+33 6 12 34 56 78") == "0612345678"
+    assert dedup.normalize_phone("06.12.34.56.78") == "0612345678"
+    assert dedup.normalize_phone("12") == ""
+    assert dedup.normalize_name("Martin,  Léa") == dedup.normalize_name("léa MARTIN") == "lea martin"
+
+
+def test_find_and_merge_duplicates():
+    with database.connection() as conn:
+        database.create_contacts(conn, [
+            ("Léa Martin", "lea@example.com", "", "cliente"),           # 1
+            ("Bob Petit", "bob@example.com", "01 02 03 04 05", ""),     # 2
+            ("lea martin", "LEA+pro@example.com", "0611223344", "Lyon"),  # 3 : même email que 1
+            ("Robert Petit", "", "+33 1 02 03 04 05", ""),             # 4 : même téléphone que 2
+            ("Martin Léa", "", "", "salon"),                           # 5 : même nom que 1 et 3
+            ("Bob Petit", "autre@example.com", "", ""),                # 6 : email différent de 2
+            ("Zoé Durand", "zoe@example.com", "", ""),                 # 7
+        ])
+
+        stats = {}
+        clusters = dedup.find_duplicates(conn, stats=stats)
+        assert clusters == [[1, 3, 5], [2, 4]]
+        assert stats["duplicates"] == 3
+
+        assert dedup.merge_duplicates(conn, clusters) == 3
+        contacts = database.list_contacts(conn)
+        assert [c["id"] for c in contacts] == [1, 2, 6, 7]
+        assert contacts[0]["phone"] == "0611223344"
+        assert contacts[0]["notes"] == "cliente | Lyon | salon"
+        assert dedup.find_duplicates(conn) == []
+
+
+def test_name_match_does_not_bridge_conflicting_contacts():
+    with database.connection() as conn:
+        database.create_contacts(conn, [
+            ("Jean Dupont", "jd@a.com", "0102030405", ""),
+            ("Jean Dupont", "", "", ""),
+            ("Jean Dupont", "jd@b.com", "0708091011", ""),
+        ])
+        assert dedup.find_duplicates(conn) == [[1, 2]]
+
+
+def test_merge_keeps_conflicting_values_in_notes():
+    with database.connection() as conn:
+        database.create_contacts(conn, [
+            ("Jean Dupont", "jd@a.com", "0102030405", "client"),
+            ("J. Dupont", "jd@b.com", "01 02 03 04 05", ""),
+        ])
+        clusters = dedup.find_duplicates(conn)
+        assert clusters == [[1, 2]]
+        dedup.merge_duplicates(conn, clusters)
+        contact = database.get_contact(conn, 1)
+        assert contact["email"] == "jd@a.com"
+        assert contact["notes"] == "client | email : jd@b.com"
+
+
+def test_large_name_blocks_are_skipped():
+    with database.connection() as conn:
+        database.create_contacts(conn, [("Alice Martin", "", "", "")] * 5)
+        stats = {}
+        assert dedup.find_duplicates(conn, max_block_size=4, stats=stats) == []
+        assert stats["skipped_blocks"] == 1
+        assert dedup.find_duplicates(conn, max_block_size=5) == [[1, 2, 3, 4, 5]]
@@ -10,6 +10,7 @@ import tempfile
 import pytest
 
 from app.database import get_connection, create_contact, list_contacts, delete_contact
+from app.database import update_contact, current_change_seq
 from app.file_handler import (
     export_contacts_json,
     export_contacts_csv,
@@ -17,7 +18,12 @@ from app.file_handler import (
     import_contacts_csv,
     save_backup,
     restore_backup,
+    restore_backup_chain,
+    open_contacts_file,
+    export_contacts_jsonl,
+    import_contacts_jsonl,
 )
+from app import file_handler
 
 
 @pytest.fixture(autouse=True)
@@ -167,6 +173,26 @@ def test_import_contacts_csv(temp_db, temp_dir):
             os.remove(new_db)
 
 
+def test_import_contacts_csv_batches_and_stats(temp_db, temp_dir):
+    """Test l'import CSV par petits lots et les statistiques de débit."""
+    export_path = os.path.join(temp_dir, "export.csv")
+    export_contacts_csv(export_path)
+    os.environ['CONTACTS_DB_PATH'] = os.path.join(temp_dir, "batches.db")
+
+    try:
+        stats = {}
+        count = import_contacts_csv(export_path, batch_size=1, stats=stats)
+
+        assert count == 2
+        assert stats['count'] == 2
+        assert stats['contacts_per_second'] > 0
+        conn = get_connection()
+        assert len(list_contacts(conn)) == 2
+        conn.close()
+    finally:
+        os.environ['CONTACTS_DB_PATH'] = temp_db
+
+
 def test_save_backup(temp_db, temp_dir):
     """Test la sauvegarde de la base de données."""
     backup_path = os.path.join(temp_dir, "backup.json")
@@ -277,3 +303,237 @@ def test_export_empty_contacts(temp_dir):
         if os.path.exists(empty_db):
             os.remove(empty_db)
 
+
+def test_import_json_streams_backup_envelope(temp_dir, monkeypatch):
+    """L'import JSON lit aussi l'enveloppe de sauvegarde, par petits blocs."""
+    import app.file_handler as file_handler
+    monkeypatch.setattr(file_handler, 'JSON_READ_CHUNK_SIZE', 7)
+
+    input_path = os.path.join(temp_dir, "backup.json")
+    with open(input_path, 'w', encoding='utf-8') as f:
+        json.dump({
+            'version': '1.0',
+            'contacts': [
+                {'name': 'Al [x]', 'email': 'a@example.com', 'phone': '12345', 'notes': '{"}'},
+                {'name': 'Bé', 'email': 'b@example.com', 'phone': '', 'notes': ''},
+            ],
+            'extra': {'ignored': [1, 2, 3]},
+        }, f, ensure_ascii=False)
+
+    db_path = os.path.join(temp_dir, "streamed.db")
+    os.environ['CONTACTS_DB_PATH'] = db_path
+
+    count = import_contacts_json(input_path)
+
+    conn = get_connection()
+    contacts = list_contacts(conn)
+    conn.close()
+    assert count == 2
+    assert [c['name'] for c in contacts] == ['Al [x]', 'Bé']
+    assert contacts[0]['notes'] == '{"}'
+
+
+def test_incremental_backup_chain(temp_db, temp_dir):
+    """Test la restauration d'une sauvegarde complète suivie de deltas."""
+    base_path = os.path.join(temp_dir, "base.json")
+    delta1_path = os.path.join(temp_dir, "delta1.json")
+    delta2_path = os.path.join(temp_dir, "delta2.json")
+
+    save_backup(base_path)
+
+    conn = get_connection()
+    carol_id = create_contact(conn, "Carol", "carol@example.com")
+    update_contact(conn, 1, notes="Best friend")
+    delete_contact(conn, 2)
+    conn.close()
+    save_backup(delta1_path, incremental=True)
+
+    conn = get_connection()
+    update_contact(conn, carol_id, phone="555")
+    expected = list_contacts(conn)
+    conn.close()
+    save_backup(delta2_path, incremental=True)
+
+    with open(delta1_path, 'r') as f:
+        delta1 = json.load(f)
+    assert delta1['type'] == 'delta'
+    assert delta1['deleted'] == [2]
+    assert {c['name'] for c in delta1['contacts']} == {"Alice", "Carol"}
+
+    new_db = os.path.join(temp_dir, "rebuilt.db")
+    os.environ['CONTACTS_DB_PATH'] = new_db
+
+    with pytest.raises(ValueError):
+        restore_backup_chain(base_path, [delta2_path])
+
+    restore_backup_chain(base_path, [delta1_path, delta2_path])
+
+    conn = get_connection()
+    assert list_contacts(conn) == expected
+    conn.close()
+    os.environ['CONTACTS_DB_PATH'] = temp_db
+
+
+def test_sqlite_backup_roundtrip(temp_db, temp_dir):
+    """Test la sauvegarde par copie de pages SQLite et sa restauration."""
+    backup_path = os.path.join(temp_dir, "backup.db")
+    steps = []
+
+    save_backup(backup_path, pages_per_step=1, progress=lambda status, remaining, total: steps.append(remaining))
+    with open(backup_path, 'rb') as f:
+        assert f.read(16) == b'SQLite format 3\x00'
+    assert steps and steps[-1] == 0
+
+    conn = get_connection()
+    expected = list_contacts(conn)
+    create_contact(conn, "Carol", "carol@example.com")
+    conn.close()
+    delta_path = os.path.join(temp_dir, "delta.json")
+    save_backup(delta_path, incremental=True)
+
+    new_db = os.path.join(temp_dir, "restored.db")
+    os.environ['CONTACTS_DB_PATH'] = new_db
+    assert restore_backup(backup_path) == len(expected)
+    conn = get_connection()
+    assert list_contacts(conn) == expected
+    conn.close()
+
+    restore_backup_chain(backup_path, [delta_path])
+    conn = get_connection()
+    assert [c['name'] for c in list_contacts(conn)][-1] == "Carol"
+    conn.close()
+    os.environ['CONTACTS_DB_PATH'] = temp_db
+
+
+def test_upsert_restore_is_idempotent(temp_db, temp_dir):
+    """Test qu'une restauration ou un import rejoué ne duplique rien."""
+    backup_path = os.path.join(temp_dir, "backup.json")
+    save_backup(backup_path)
+
+    conn = get_connection()
+    expected = list_contacts(conn)
+    conn.close()
+
+    conn = get_connection()
+    seq = current_change_seq(conn)
+    conn.close()
+    restore_backup(backup_path, upsert_key="id")
+    restore_backup(backup_path, upsert_key="id")
+    conn = get_connection()
+    assert list_contacts(conn) == expected
+    assert current_change_seq(conn) == seq
+    conn.close()
+
+    csv_path = os.path.join(temp_dir, "emails.csv")
+    with open(csv_path, 'w', encoding='utf-8') as f:
+        f.write("name,email,phone,notes\n")
+        f.write("Alice B.,  ALICE@example.com ,,\n")
+        f.write("Dave,dave@example.com,,\n")
+
+    import_contacts_csv(csv_path, upsert_key="email")
+    import_contacts_csv(csv_path, upsert_key="email")
+    conn = get_connection()
+    contacts = list_contacts(conn)
+    conn.close()
+    assert len(contacts) == len(expected) + 1
+    assert contacts[0]['name'] == "Alice B."
+
+
+def test_upsert_by_id_inserts_rows_without_id(temp_db, temp_dir):
+    """Test qu'une colonne id vide dans un CSV crée un nouveau contact."""
+    csv_path = os.path.join(temp_dir, "ids.csv")
+    with open(csv_path, 'w', encoding='utf-8') as f:
+        f.write("id,name,email,phone,notes\n")
+        f.write("1,Alice M.,alice@example.com,,\n")
+        f.write(",Carol,carol@example.com,,\n")
+
+    assert import_contacts_csv(csv_path, upsert_key="id") == 2
+    conn = get_connection()
+    contacts = list_contacts(conn)
+    conn.close()
+    assert [(c['id'], c['name']) for c in contacts] == [(1, "Alice M."), (2, "Bob"), (3, "Carol")]
+
+
+@pytest.mark.parametrize("suffix", [".gz", ".bz2", ".xz"])
+def test_compressed_export_import_and_backup(temp_db, temp_dir, suffix):
+    """Test la compression choisie d'après l'extension du fichier."""
+    conn = get_connection()
+    expected = list_contacts(conn)
+    conn.close()
+
+    json_path = export_contacts_json(os.path.join(temp_dir, "contacts.json" + suffix), compresslevel=1)
+    csv_path = export_contacts_csv(os.path.join(temp_dir, "contacts.csv" + suffix))
+    with open_contacts_file(json_path) as f:
+        assert [c['name'] for c in json.load(f)] == [c['name'] for c in expected]
+
+    json_backup = save_backup(os.path.join(temp_dir, "backup.json" + suffix))
+    sqlite_backup = save_backup(os.path.join(temp_dir, "backup.db" + suffix))
+    with open(sqlite_backup, 'rb') as f:
+        assert not f.read(16).startswith(b'SQLite')
+
+    os.environ['CONTACTS_DB_PATH'] = os.path.join(temp_dir, "restored.db")
+    assert restore_backup(sqlite_backup) == len(expected)
+    conn = get_connection()
+    assert list_contacts(conn) == expected
+    conn.close()
+    assert restore_backup(json_backup, upsert_key="id") == len(expected)
+    assert import_contacts_json(json_path) == len(expected)
+    assert import_contacts_csv(csv_path) == len(expected)
+    conn = get_connection()
+    assert len(list_contacts(conn)) == 3 * len(expected)
+    conn.close()
+    os.environ['CONTACTS_DB_PATH'] = temp_db
+
+
+def test_jsonl_parallel_import(temp_db, temp_dir, monkeypatch):
+    """Test l'export JSON Lines et son import découpé en plages d'octets."""
+    monkeypatch.setattr(file_handler, 'PARALLEL_RANGE_SIZE', 16)
+    conn = get_connection()
+    for i in range(20):
+        create_contact(conn, f"Contact {i}", f"c{i}@example.com", notes="é\nligne")
+    expected = [c['name'] for c in list_contacts(conn)]
+    conn.close()
+
+    path = export_contacts_jsonl(os.path.join(temp_dir, "contacts.jsonl"))
+    with open(path, 'r', encoding='utf-8') as f:
+        assert len(f.readlines()) == len(expected)
+    assert len(file_handler._line_ranges(path, 16)) > 2
+
+    os.environ['CONTACTS_DB_PATH'] = os.path.join(temp_dir, "imported.db")
+    stats = {}
+    assert import_contacts_jsonl(path, workers=2, stats=stats) == len(expected)
+    assert stats['count'] == len(expected)
+    assert import_contacts_jsonl(path, workers=1, upsert_key="id") == len(expected)
+    conn = get_connection()
+    assert [c['name'] for c in list_contacts(conn)] == expected
+    conn.close()
+    os.environ['CONTACTS_DB_PATH'] = temp_db
+
+
+def test_csv_parallel_import_quoted_newlines(temp_db, temp_dir, monkeypatch):
+    """Test l'import CSV parallèle avec des sauts de ligne dans des champs cités."""
+    monkeypatch.setattr(file_handler, 'PARALLEL_RANGE_SIZE', 10)
+    path = os.path.join(temp_dir, "partners.csv")
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        f.write('email,name,notes\n')
+        for i in range(30):
+            f.write(f'p{i}@example.com,"Partenaire ""{i}""","note\nsur ""deux""\nlignes {i}"\n')
+
+    fieldnames, ranges = file_handler._csv_record_ranges(path, 10)
+    assert fieldnames == ['email', 'name', 'notes']
+    assert len(ranges) > 2
+
+    os.environ['CONTACTS_DB_PATH'] = os.path.join(temp_dir, "imported.db")
+    assert import_contacts_csv(path, workers=3) == 30
+    conn = get_connection()
+    contacts = list_contacts(conn)
+    conn.close()
+    assert contacts[7]['name'] == 'Partenaire "7"'
+    assert contacts[7]['notes'] == 'note\nsur "deux"\nlignes 7'
+    assert contacts[7]['phone'] == ''
+
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write('bad@example.com,Trop,de,champs\n')
+    with pytest.raises(ValueError):
+        import_contacts_csv(path, workers=2)
+    os.environ['CONTACTS_DB_PATH'] = temp_db
@@ -0,0 +1,60 @@
+import pytest
+
+pytest.importorskip("flask")
+
+from app.server import create_app  # noqa: E402
+
+
+@pytest.fixture
+def client(contacts_db):
+    """
+    Fixture qui fournit un client de test Flask sur une base temporaire.
+    """
+    app = create_app()
+    app.testing = True
+    return app.test_client()
+
+
+def test_crud_and_search(client):
+    response = client.post("/contacts", json={"name": "Alice", "email": "alice@example.com"})
+    assert response.status_code == 201
+    contact_id = response.get_json()["id"]
+    client.post("/contacts", json={"name": "Bob", "email": "bob@example.com"})
+
+    assert client.get(f"/contacts/{contact_id}").get_json()["name"] == "Alice"
+    response = client.patch(f"/contacts/{contact_id}", json={"notes": "Paris"})
+    assert response.get_json()["notes"] == "Paris"
+
+    page = client.get("/contacts?limit=1").get_json()
+    assert [c["name"] for c in page["contacts"]] == ["Alice"]
+    page = client.get(f"/contacts?limit=1&after_id={page['next_after_id']}").get_json()
+    assert [c["name"] for c in page["contacts"]] == ["Bob"]
+
+    found = client.get("/contacts/search?q=paris&mode=fts").get_json()
+    assert [c["name"] for c in found["contacts"]] == ["Alice"]
+
+    assert client.get("/stats/cache").get_json()["misses"] >= 1
+
+    assert client.delete(f"/contacts/{contact_id}").status_code == 204
+    assert client.get(f"/contacts/{contact_id}").status_code == 404
+
+
+def test_invalid_requests(client):
+    assert client.post("/contacts", json={"name": "Sans email"}).status_code == 400
+    assert client.post("/contacts", json={"name": "A", "email": "a@x", "id": 3}).status_code == 400
+    assert client.get("/contacts?limit=abc").status_code == 400
+    assert client.get("/contacts/search?q=a&mode=regex").status_code == 400
+    assert client.get("/export/xml").status_code == 400
+
+
+def test_streamed_exports(client):
+    for i in range(3):
+        client.post("/contacts", json={"name": f"Contact {i}", "email": f"c{i}@example.com"})
+
+    response = client.get("/export/json")
+    assert response.is_streamed
+    assert [c["name"] for c in response.get_json()] == ["Contact 0", "Contact 1", "Contact 2"]
+
+    lines = client.get("/export/csv").get_data(as_text=True).splitlines()
+    assert lines[0] == "id,name,email,phone,notes" and len(lines) == 4
+    assert len(client.get("/export/jsonl").get_data(as_text=True).splitlines()) == 3